@@ -1,14 +1,15 @@
-import requests
-from bs4 import BeautifulSoup
-import csv
 import os
 from datetime import datetime
-from typing import List, Set
+from typing import Callable, Dict, List, Set, Union
+
+import csv_partitions
+from pipeline_context import fetch, parse_html
 
 BASE_URL = "https://www.thebell.co.kr/free/content/article.asp"
 LINKS_CSV = "lp_news_links.csv"
 SUMMARIES_CSV = "lp_news_summaries.csv"
 MASTER_CSV = "lp_news_master_log.csv"
+BACKFILL_CSV = "lp_news_backfill_links.csv"  # backfill_crawler.py가 쌓는 과거 기사 링크 (링크 CSV와 같은 컬럼)
 KEYWORDS = ["LP Radar", "펀드 결성",
     "조합 결성",
     "펀드 결성 나선다",
@@ -17,54 +18,109 @@ KEYWORDS = ["LP Radar", "펀드 결성",
     "2차 클로징",
     "멀티클로징"]  # 필요하면 ["LP Radar", "LP", "출자"] 이런 식으로 늘려도 됨
 
-def get_newstopkorea_fund_urls() -> List[str]:
+# 링크 CSV 컬럼: 목록 페이지에서 본 제목/요약문도 같이 저장 (title_triage가 본문 없이 1차 분류)
+LINK_FIELDNAMES = ["deal_number", "url", "title", "snippet"]
+SNIPPET_CHARS = 300
+
+NEWSTOPKOREA_LIST_URL = "https://www.newstopkorea.com/news/articleList.html"
+NEWSTOPKOREA_PARAMS = {"sc_section_code": "S1N44", "view_type": "sm"}  # VC/PE 섹션
+
+
+def _has_keyword(text: str) -> bool:
+    return any(kw in text for kw in KEYWORDS)
+
+
+def _collect_items(anchors, absolute: Callable[[str], str]) -> List[dict]:
     """
-    뉴스톱코리아 VC/PE 섹션에서 펀드 관련 기사 URL 수집.
-    페이지 구조에 따라 selector는 나중에 조금 손봐줘야 할 수도 있음.
+    목록 anchor들 → 키워드가 들어간 기사 {"url", "title", "snippet"} (URL 기준 중복 제거, 목록 순서 유지).
+    같은 기사로 가는 anchor가 여러 개면(제목 링크 + 요약문 링크) 첫 anchor 텍스트를 제목으로,
+    기사 항목(li/dl) 전체 텍스트에서 제목을 뺀 나머지를 요약문으로 쓴다.
     """
-    urls: Set[str] = set()
+    items: Dict[str, dict] = {}
+    matched: Set[str] = set()
+    for a in anchors:
+        text = (a.get_text() or "").strip()
+        href = a.get("href")
+        if not text or not href:
+            continue
+        full_url = absolute(href)
 
-    list_url = "https://www.newstopkorea.com/news/articleList.html?sc_section_code=S1N44&view_type=sm"
-    print(f"[INFO] 크롤링 중 - newstopkorea: {list_url}")
+        item = items.get(full_url)
+        if item is None:
+            container = a.find_parent(["li", "dl"]) or a.parent
+            snippet = " ".join(container.get_text(" ", strip=True).split()) if container is not None else ""
+            snippet = snippet.replace(text, "", 1).strip()
+            item = items[full_url] = {"url": full_url, "title": text, "snippet": snippet[:SNIPPET_CHARS]}
+        if _has_keyword(text):
+            matched.add(full_url)
+    return [item for url, item in items.items() if url in matched]
+
+
+def _newstopkorea_url(href: str) -> str:
+    if href.startswith("/"):
+        return "https://www.newstopkorea.com" + href
+    if href.startswith("http"):
+        return href
+    return "https://www.newstopkorea.com" + "/" + href.lstrip("./")
 
-    res = requests.get(list_url, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
-    res.raise_for_status()
-    soup = BeautifulSoup(res.text, "html.parser")
 
+def _thebell_url(href: str) -> str:
+    if href.startswith("/"):
+        return "https://www.thebell.co.kr" + href
+    if href.startswith("http"):
+        return href
+    return "https://www.thebell.co.kr/free/content/" + href.lstrip("./")
+
+
+def parse_newstopkorea_list(soup) -> (List[dict], int):
+    """
+    뉴스톱코리아 목록 페이지 1장 → (키워드가 제목에 들어간 기사 {"url", "title", "snippet"}, 페이지의 전체 기사 수).
+    전체 기사 수가 0이면 목록 끝으로 본다 (backfill_crawler.py).
+    """
     # 기사 리스트 구조 예시:
     # <li class="altlist-webzine-item">
     #   <div class="altlist-webzine-content">
     #     <h2 class="altlist-subject">
     #       <a href="...articleView.html?idxno=...">제목...</a>
     #     </h2>
+    #     <p class="altlist-summary">요약문...</p>
     #   </div>
     # </li>
-    # → 제목 a 태그만 선택
-    for a in soup.select("div.altlist-webzine-content h2.altlist-subject a"):
-        text = (a.get_text() or "").strip()
-        if not text:
-            continue
-        if not any(kw in text for kw in KEYWORDS):
-            continue
+    # → 제목 a 태그만 선택 (요약문은 li 텍스트에서)
+    anchors = soup.select("div.altlist-webzine-content h2.altlist-subject a")
+    return _collect_items(anchors, _newstopkorea_url), len(anchors)
 
-        href = a.get("href")
-        if not href:
-            continue
 
-        if href.startswith("/"):
-            full_url = "https://www.newstopkorea.com" + href
-        elif href.startswith("http"):
-            full_url = href
-        else:
-            full_url = "https://www.newstopkorea.com" + "/" + href.lstrip("./")
+def get_newstopkorea_fund_items() -> List[dict]:
+    """
+    뉴스톱코리아 VC/PE 섹션에서 펀드 관련 기사 URL 수집.
+    페이지 구조에 따라 selector는 나중에 조금 손봐줘야 할 수도 있음.
+    """
+    print(f"[INFO] 크롤링 중 - newstopkorea: {NEWSTOPKOREA_LIST_URL} {NEWSTOPKOREA_PARAMS}")
+
+    res = fetch(NEWSTOPKOREA_LIST_URL, params=NEWSTOPKOREA_PARAMS, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
+    res.raise_for_status()
+    soup = parse_html(res.text, res.url)
+    items, _ = parse_newstopkorea_list(soup)
+
+    print(f"[INFO] newstopkorea에서 수집한 URL 개수: {len(items)}")
+    return sorted(items, key=lambda it: it["url"])
+
+
+def get_newstopkorea_fund_urls() -> List[str]:
+    return [it["url"] for it in get_newstopkorea_fund_items()]
+
 
-        urls.add(full_url)
+def parse_thebell_list(soup) -> (List[dict], int):
+    """thebell 목록 페이지 1장 → (키워드가 제목에 들어간 기사 {"url", "title", "snippet"}, 페이지의 전체 기사 링크 수)."""
+    # 기사 상세로 가는 링크 (ArticleView.asp) 중에서 제목에 키워드 포함되는 것만
+    anchors = soup.select("a[href*='ArticleView.asp']")
+    return _collect_items(anchors, _thebell_url), len(anchors)
 
-    print(f"[INFO] newstopkorea에서 수집한 URL 개수: {len(urls)}")
-    return sorted(list(urls))
 
-def get_lp_radar_urls(max_pages: int = 3) -> List[str]:
-    urls: Set[str] = set()
+def get_thebell_fund_items(max_pages: int = 3) -> List[dict]:
+    """thebell 인베스트 섹션 목록에서 키워드가 제목에 들어간 기사 수집."""
+    items: Dict[str, dict] = {}
 
     for page in range(1, max_pages + 1):
         params = {
@@ -73,45 +129,40 @@ def get_lp_radar_urls(max_pages: int = 3) -> List[str]:
         }
         print(f"[INFO] 크롤링 중 - page {page}: {BASE_URL} {params}")
 
-        res = requests.get(BASE_URL, params=params, headers={"User-Agent": "Mozilla/5.0"})
+        res = fetch(BASE_URL, params=params, headers={"User-Agent": "Mozilla/5.0"})
         if res.status_code == 404:
             print(f"[INFO] page {page} 에서 404 → 여기서 중단")
             break
+        if res.status_code >= 400:
+            # 429/503은 fetch가 이미 재시도함 → 그래도 실패면 이번 실행은 여기까지
+            print(f"[WARN] page {page} HTTP {res.status_code} → 여기서 중단")
+            break
+
+        soup = parse_html(res.text, res.url)
+        page_items, _ = parse_thebell_list(soup)
+        for it in page_items:
+            items.setdefault(it["url"], it)
 
-        soup = BeautifulSoup(res.text, "html.parser")
+    return sorted(items.values(), key=lambda it: it["url"])
 
-        # 기사 상세로 가는 링크 (ArticleView.asp) 중에서 제목에 키워드 포함되는 것만
-        for a in soup.select("a[href*='ArticleView.asp']"):
-            text = (a.get_text() or "").strip()
-            if not text:
-                continue
-            if not any(kw in text for kw in KEYWORDS):
-                continue
 
-            href = a.get("href")
-            if not href:
-                continue
+def get_thebell_fund_urls(max_pages: int = 3) -> List[str]:
+    return [it["url"] for it in get_thebell_fund_items(max_pages=max_pages)]
 
-            # 절대경로로 변환
-            if href.startswith("/"):
-                full_url = "https://www.thebell.co.kr" + href
-            elif href.startswith("http"):
-                full_url = href
-            else:
-                full_url = "https://www.thebell.co.kr/free/content/" + href.lstrip("./")
 
-            urls.add(full_url)
+def get_lp_radar_items(max_pages: int = 3) -> List[dict]:
+    # 1) thebell
+    items: Dict[str, dict] = {it["url"]: it for it in get_thebell_fund_items(max_pages=max_pages)}
 
     # 2) newstopkorea 소스 추가
     try:
-        nk_urls = get_newstopkorea_fund_urls()
-        for u in nk_urls:
-            urls.add(u)
+        for it in get_newstopkorea_fund_items():
+            items.setdefault(it["url"], it)
     except Exception as e:
         print(f"[WARN] newstopkorea 크롤링 실패: {e}")
 
     # 정렬해서 반환 (안 해도 되지만 버그 디버깅할 때 눈에 보기 좋음)
-    return sorted(list(urls))
+    return sorted(items.values(), key=lambda it: it["url"])
 
 
 def load_existing_urls_and_max_deal(links_csv_path: str, summaries_csv_path: str, master_csv_path: str):
@@ -127,22 +178,21 @@ def load_existing_urls_and_max_deal(links_csv_path: str, summaries_csv_path: str
 
     def update_from_csv(path: str):
         nonlocal max_deal
-        if not os.path.exists(path):
-            return
-        with open(path, newline="", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                url = row.get("url")
-                if url:
-                    existing_urls.add(url)
-                dn = row.get("Deal ID") or row.get("deal_number") or row.get("deal_id")
-                if dn:
-                    try:
-                        n = int(dn)
-                        if n > max_deal:
-                            max_deal = n
-                    except ValueError:
-                        continue
+        # 파티션 레이아웃이면 최대 Deal ID는 manifest에서, URL은 최근 파티션에서만 읽음
+        if csv_partitions.is_partitioned(path):
+            max_deal = max(max_deal, csv_partitions.max_id(path))
+        for row in csv_partitions.iter_rows(path, recent_months=csv_partitions.DEDUP_MONTHS):
+            url = row.get("url")
+            if url:
+                existing_urls.add(url)
+            dn = row.get("Deal ID") or row.get("deal_number") or row.get("deal_id")
+            if dn:
+                try:
+                    n = int(dn)
+                    if n > max_deal:
+                        max_deal = n
+                except ValueError:
+                    continue
 
     # 큐(링크), 요약, 마스터 로그 파일 순서로 모두 반영
     update_from_csv(links_csv_path)
@@ -152,23 +202,20 @@ def load_existing_urls_and_max_deal(links_csv_path: str, summaries_csv_path: str
     return existing_urls, max_deal
 
 
-def append_links_to_csv(new_urls: List[str], csv_path: str, start_deal_number: int):
+def append_links_to_csv(new_items: List[Union[str, dict]], csv_path: str, start_deal_number: int):
     """
-    새 URL 리스트에 대해 deal_number를 순차 부여해서 CSV에 append.
+    새 기사(URL 문자열 또는 {"url", "title", "snippet"}) 리스트에 대해 deal_number를 순차 부여해서 CSV에 append.
+    기존 CSV가 deal_number,url 두 컬럼이면 헤더에 title,snippet을 붙인다 (기존 행은 빈 값).
     """
-    if not new_urls:
+    if not new_items:
         return
 
-    file_exists = os.path.exists(csv_path)
-    with open(csv_path, "a", newline="", encoding="utf-8-sig") as f:
-        writer = csv.writer(f)
-        if not file_exists:
-            writer.writerow(["deal_number", "url"])
-
-        deal_num = start_deal_number
-        for u in new_urls:
-            writer.writerow([deal_num, u])
-            deal_num += 1
+    rows = []
+    for n, it in enumerate(new_items, start=start_deal_number):
+        it = it if isinstance(it, dict) else {"url": it}
+        rows.append({"deal_number": n, "url": it["url"], "title": it.get("title") or "", "snippet": it.get("snippet") or ""})
+    csv_partitions.ensure_columns(csv_path, LINK_FIELDNAMES)
+    csv_partitions.append_rows(csv_path, rows, LINK_FIELDNAMES)
 
 
 def load_processed_urls() -> set:
@@ -177,13 +224,10 @@ def load_processed_urls() -> set:
     (펀드/비펀드 모두 포함)
     """
     urls = set()
-    if os.path.exists(MASTER_CSV):
-        with open(MASTER_CSV, newline="", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                url = row.get("url")
-                if url:
-                    urls.add(url)
+    for row in csv_partitions.iter_rows(MASTER_CSV, recent_months=csv_partitions.DEDUP_MONTHS):
+        url = row.get("url")
+        if url:
+            urls.add(url)
     return urls
 
 
@@ -196,16 +240,14 @@ def append_master_log(rows: List[dict]):
         "is_fundraising",
         "status",
     ]
-    file_exists = os.path.exists(MASTER_CSV)
-    with open(MASTER_CSV, "a", newline="", encoding="utf-8-sig") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        if not file_exists:
-            writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+    csv_partitions.append_rows(MASTER_CSV, rows, fieldnames)
 
 
-if __name__ == "__main__":
+def run(max_pages: int = 3) -> List[str]:
+    """
+    링크 수집 단계 (run_pipeline.py에서도 호출).
+    새로 큐(lp_news_links.csv)에 추가한 URL 리스트를 반환한다.
+    """
     print("=== Fund news link collector (thebell + newstopkorea) ===")
 
     project_dir = os.path.dirname(os.path.abspath(__file__))
@@ -219,18 +261,24 @@ if __name__ == "__main__":
     )
     print(f"[INFO] 기존 URL 개수: {len(existing_urls)}, 기존 최대 Deal Number: {max_deal}")
 
-    # 2) 웹에서 최신 LP Radar 기사 URL 목록 가져오기
-    urls = get_lp_radar_urls(max_pages=3)
+    # 2) 웹에서 최신 LP Radar 기사 목록(URL + 제목/요약문) 가져오기
+    items = get_lp_radar_items(max_pages=max_pages)
 
-    if not urls:
+    if not items:
         print("[INFO] 수집할 펀드 관련 기사 없음.")
+        return []
+
+    # 3) 기존에 없는 URL만 추림
+    new_items = [it for it in items if it["url"] not in existing_urls]
+    print(f"[INFO] 새로 추가할 URL 개수: {len(new_items)}")
+
+    if not new_items:
+        print("[INFO] 새로 추가할 링크 없음. CSV 수정 안 함.")
     else:
-        # 3) 기존에 없는 URL만 추림
-        new_urls = [u for u in urls if u not in existing_urls]
-        print(f"[INFO] 새로 추가할 URL 개수: {len(new_urls)}")
-
-        if not new_urls:
-            print("[INFO] 새로 추가할 링크 없음. CSV 수정 안 함.")
-        else:
-            append_links_to_csv(new_urls, links_csv_path, start_deal_number=max_deal + 1)
-            print(f"[INFO] 총 {len(new_urls)}개 URL 추가 완료 → {links_csv_path}")
\ No newline at end of file
+        append_links_to_csv(new_items, links_csv_path, start_deal_number=max_deal + 1)
+        print(f"[INFO] 총 {len(new_items)}개 URL 추가 완료 → {links_csv_path}")
+    return [it["url"] for it in new_items]
+
+
+if __name__ == "__main__":
+    run(max_pages=3)
@@ -1,20 +1,30 @@
-import os
-import csv
 import json
+import time
 from typing import List, Dict, Any
-import hashlib
-from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 
-import requests
-from bs4 import BeautifulSoup
-from openai import OpenAI
+import amount_normalizer
+import article_extractor
+import article_metadata
+import csv_partitions
+import deal_query
+import entity_index
+import extraction_pool
+import LP_News_Auto
+import llm_stream
+import model_router
+import prompt_templates
+import search_index
+import stage_scheduler
+import wire_schema
+import title_triage
+from summary_scheduler import BACKFILL_PER_RUN, SummaryBudget, order_backlog
+from pipeline_context import chat_completion, fetch, parse_html
+from url_utils import make_source_id, normalize_url
 
 LINKS_CSV = "lp_news_links.csv"
 SUMMARIES_CSV = "lp_news_summaries.csv"
 MASTER_CSV = "lp_news_master_log.csv"
 
-client = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
-
 SYSTEM_PROMPT = """
 너는 VC/PE 리서치팀에서 일하는 애널리스트 어시스턴트이자 데이터 정제 봇이다.
 
@@ -65,19 +75,10 @@ SYSTEM_PROMPT = """
 반드시 JSON 이외의 텍스트(설명, 주석, 자연어 문장)는 출력하지 마라.
 """
 
-USER_PROMPT_TEMPLATE = """
-다음은 벤처캐피탈/PE와 관련된 한국어 기사 전문이다.
-
-[기사 제목]
-{title}
-
-[기사 본문]
-{body}
-
-위 기사를 분석해서 아래 스키마에 맞는 JSON 객체 한 개만 출력해라.
-
-스키마:
-{{
+# 기존(verbose) 출력 스키마. LLM_WIRE_FORMAT=compact(기본)이면 wire_schema.LP_COMPACT_SCHEMA를 쓴다.
+VERBOSE_SCHEMA = """스키마 (is_fundraising을 반드시 첫 필드로 출력):
+{
+  "is_fundraising": "boolean | 이 기사가 '신규 펀드 결성/자펀드 결성/출자사업(선정, 공고, 클로징 등)'에 대한 기사이면 true, 그 외에는 false",
   "LP": ["string | 출자자(LP) 이름 리스트"],
   "운용사": ["string | VC/PE 운용사(GP) 이름 리스트"],
   "펀드명": "string | 펀드명, 없으면 null",
@@ -85,118 +86,87 @@ USER_PROMPT_TEMPLATE = """
   "펀드유형": ["string | 벤처, 그로스, 세컨더리, 바이아웃, 프로젝트 등, 없으면 빈 리스트"],
   "투자섹터": ["string | Biotech & Healthcare, Interactive Contents & Media, Consumer Internet & Fintech, ICT & Digitalization, Semiconductor & Industrial, ETC 중 해당되는 것들. 애매하면 'ETC'만 넣을 것."],
   "조성상태": "string | 신규결성, 1차 클로징, 멀티클로징, 모집중, 위탁운용사 선정 등, 기사 맥락에 맞는 한 단어. 애매하면 null",
-  "요약": "string | (is_fundraising=true 인 경우에만) 기사 내용 중 펀드레이징/출자사업 관련 핵심을 2~3문장으로 요약",
-  "is_fundraising": "boolean | 이 기사가 '신규 펀드 결성/자펀드 결성/출자사업(선정, 공고, 클로징 등)'에 대한 기사이면 true, 그 외에는 false"
-}}
+  "요약": "string | (is_fundraising=true 인 경우에만) 기사 내용 중 펀드레이징/출자사업 관련 핵심을 2~3문장으로 요약"
+}
 """
 
+# 프롬프트 캐시 배치 (prompt_templates): 지시문 + 스키마는 system에 고정, 기사 제목/본문은 user 맨 뒤.
+# SYSTEM_PROMPT / 스키마 문구를 고치면 PROMPT_VERSION을 올린다.
+PROMPT_VERSION = "2"
+ARTICLE_TEMPLATE = """다음은 벤처캐피탈/PE와 관련된 한국어 기사 전문이다.
 
-# -----------------------------
-# URL de-duplication helpers
-# -----------------------------
-
-def normalize_url(u: str) -> str:
-    """Normalize URLs so the same article isn't re-processed due to minor URL variations.
-
-    - Force https
-    - Remove leading www.
-    - Remove trailing slash
-    - Drop common tracking params
-    - Sort query params
-    """
-    if not u:
-        return ""
-
-    u = u.strip()
-    p = urlparse(u)
-
-    scheme = "https"
-    netloc = (p.netloc or "").lower()
-    if netloc.startswith("www."):
-        netloc = netloc[4:]
-
-    path = (p.path or "").rstrip("/")
-
-    q = parse_qs(p.query or "")
-    drop_keys = {
-        "utm_source",
-        "utm_medium",
-        "utm_campaign",
-        "utm_term",
-        "utm_content",
-        "fbclid",
-        "gclid",
-    }
-    q = {k: v for k, v in q.items() if k not in drop_keys}
-
-    # sort query params for stable equality
-    query = urlencode([(k, q[k][0]) for k in sorted(q.keys())], doseq=False)
-
-    return urlunparse((scheme, netloc, path, "", query, ""))
-
-
-def make_source_id(u: str) -> str:
-    """Create a stable per-article id used for upsert/de-dup.
-
-    Prefer domain-specific IDs when available (e.g., thebell 'key='), otherwise hash the normalized URL.
-    """
-    nu = normalize_url(u)
-    if not nu:
-        return ""
+[기사 제목]
+{title}
 
-    p = urlparse(nu)
+[기사 본문]
+{body}"""
+
+PROMPTS = {
+    fmt: prompt_templates.PromptTemplate(
+        "lp_news",
+        f"{PROMPT_VERSION}-{fmt}",
+        system=SYSTEM_PROMPT + "\n기사를 분석해서 아래 스키마에 맞는 JSON 객체 한 개만 출력해라.\n\n" + schema,
+        user=ARTICLE_TEMPLATE,
+    )
+    for fmt, schema in (("compact", wire_schema.LP_COMPACT_SCHEMA), ("verbose", VERBOSE_SCHEMA))
+}
 
-    # thebell: use key= query param if present
-    if "thebell.co.kr" in (p.netloc or ""):
-        q = parse_qs(p.query or "")
-        if "key" in q and q["key"]:
-            return f"thebell:{q['key'][0]}"
 
-    # fallback: normalized URL hash
-    return "urlhash:" + hashlib.sha1(nu.encode("utf-8")).hexdigest()
+def load_links() -> List[dict]:
+    # 같은 프로세스에서 LP_News_Auto가 방금 append한 행은 csv_partitions 캐시에서 바로 나옴
+    return csv_partitions.read_rows(LINKS_CSV)
 
 
-def load_links() -> List[dict]:
-    if not os.path.exists(LINKS_CSV):
-        return []
-    with open(LINKS_CSV, newline="", encoding="utf-8-sig") as f:
-        return list(csv.DictReader(f))
+def load_backfill_links() -> List[dict]:
+    """backfill_crawler.py가 쌓은 과거 기사 링크 (링크 CSV와 같은 컬럼, 파일 없으면 빈 리스트)."""
+    return csv_partitions.read_rows(LP_News_Auto.BACKFILL_CSV)
 
 
-def load_processed_urls() -> set:
+def load_processed_urls(recent_months=csv_partitions.DEDUP_MONTHS) -> set:
     """
     마스터 로그(있으면)와 요약 CSV에서 이미 처리된 URL들을 읽어온다.
     (펀드/비펀드 모두 포함)
     """
     urls = set()
-    # 마스터 로그 기준
-    if os.path.exists(MASTER_CSV):
-        with open(MASTER_CSV, newline="", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                url = row.get("url")
-                if url:
-                    urls.add(normalize_url(url))
+    # 마스터 로그 기준 (파티션 레이아웃이면 CSV_DEDUP_MONTHS 만큼의 최근 파티션만, recent_months=None이면 전체)
+    for row in csv_partitions.iter_rows(MASTER_CSV, recent_months=recent_months):
+        url = row.get("url")
+        if url:
+            urls.add(normalize_url(url))
     # 과거 버전 호환: 마스터 로그가 없던 시절 요약만 된 URL들도 포함
-    if os.path.exists(SUMMARIES_CSV):
-        with open(SUMMARIES_CSV, newline="", encoding="utf-8-sig") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                url = row.get("url")
-                if url:
-                    urls.add(normalize_url(url))
+    for row in csv_partitions.iter_rows(SUMMARIES_CSV, recent_months=recent_months):
+        url = row.get("url")
+        if url:
+            urls.add(normalize_url(url))
     return urls
 
 
-def extract_article_text(url: str) -> (str, str):
-    """기사 제목 + 본문 텍스트 추출.
+def download_article(url: str):
+    res = fetch(url, timeout=20, headers={"User-Agent": "Mozilla/5.0"})
+    res.raise_for_status()
+    return res
+
+
+def extract_article_text(url: str, prefetcher=None) -> (str, str, dict):
+    """기사 제목 + 본문 텍스트 + 메타데이터(작성일/출처/기자, article_metadata) 추출.
+
+    prefetcher(extraction_pool.ArticlePrefetcher)가 있으면 미리 받아 워커 프로세스에서 파싱해 둔 결과를 쓴다.
+    """
+    if prefetcher is not None:
+        record = prefetcher.get(url)
+    else:
+        record = parse_article(download_article(url).text, url)
+    return record["title"], record["body"], record["meta"]
+
+
+def parse_article(html, url: str) -> dict:
+    """HTML → {"title", "body", "meta", "selector"} (extraction_pool 워커에서도 그대로 호출).
 
     - thebell: div#article-view-content-div, div.article 등
     - newstopkorea: article.atlview-grid-body (기사 본문 영역)
     """
-    res = requests.get(url, timeout=20, headers={"User-Agent": "Mozilla/5.0"})
-    res.raise_for_status()
-    soup = BeautifulSoup(res.text, "html.parser")
+    soup = parse_html(html, url)
+    meta = article_metadata.extract_metadata(soup, url)
 
     # 제목 후보 (공통)
     # - thebell의 경우 상단에 '전체기사' 같은 헤더가 먼저 나오고,
@@ -226,55 +196,54 @@ def extract_article_text(url: str) -> (str, str):
         else:
             title = raw_title
 
-    # 본문 기본값 (thebell 등)
-    candidates = [
-        "div#article-view-content-div",
-        "div.article",
-        "div#content",
-    ]
-
-    # newstopkorea 도메인의 경우 기사 본문 article.atlview-grid-body를 우선 시도
-    if "newstopkorea.com" in url:
-        candidates = [
-            "article.atlview-grid-body",
-            "div#article-view-content-div",
-            "div.article",
-            "div#content",
-        ]
-
-    texts: List[str] = []
-    for sel in candidates:
-        parts = soup.select(sel + " p") or soup.select(sel)
-        for p in parts:
-            t = p.get_text(" ", strip=True)
-            if t:
-                texts.append(t)
-        if texts:
-            break
-
-    if not texts:
+    # 본문: 도메인별로 학습한 셀렉터 우선, 없으면 후보 셀렉터 순서대로 (article_extractor.SITE_RULES)
+    body, selector = article_extractor.extract_main_text(soup, url)
+    if body is None:
         body = soup.get_text(" ", strip=True)
-    else:
-        body = "\n".join(texts)
 
     # 너무 길면 앞부분만
-    return title, body[:8000]
+    return {"title": title, "body": body[:8000], "meta": meta, "selector": selector}
 
 
-def call_openai(title: str, body: str) -> Dict[str, Any]:
-    user_prompt = USER_PROMPT_TEMPLATE.format(title=title, body=body)
-
-    resp = client.chat.completions.create(
-        model="gpt-4.1-mini",
-        messages=[
-            {"role": "system", "content": SYSTEM_PROMPT},
-            {"role": "user", "content": user_prompt},
-        ],
-        response_format={"type": "json_object"},
+def call_openai(title: str, body: str, budget: SummaryBudget = None, key: str = "") -> Dict[str, Any]:
+    """
+    기사 1건 추출 → 기존 키(is_fundraising, LP, 운용사 ...) dict.
+    응답을 끝내 못 읽으면 wire_schema.ExtractionFailed (원문은 llm_failures.jsonl, key는 보통 URL).
+    """
+    # LLM_ROUTING=tiered: 싼 모델이 확실히 아니라고 하면 전체 추출 생략
+    negative = model_router.screen("lp_news", title, body, budget=budget)
+    if negative is not None:
+        return negative
+
+    prompt = PROMPTS[wire_schema.FORMAT]
+    request = dict(
+        model=model_router.EXTRACTION_MODEL,
+        messages=prompt.render(title=title, body=body),
+        # LLM_STRUCTURED_OUTPUT: JSON schema(strict)로 출력 형식 강제
+        response_format=wire_schema.response_format("lp_news") or {"type": "json_object"},
         temperature=0.1,
     )
-    content = resp.choices[0].message.content
-    return json.loads(content)
+    flag = wire_schema.flag_key("lp_news")
+
+    def call() -> str:
+        if llm_stream.ENABLED:
+            # LLM_STREAM: 첫 필드(is_fundraising / compact의 f)가 false로 나오면 나머지 생성은 취소
+            content, aborted = llm_stream.stream_completion(flag, budget=budget, prompt=prompt, **request)
+            return json.dumps({flag: False}) if aborted else content
+        resp = chat_completion(budget=budget, prompt=prompt, **request)
+        wire_schema.observe("lp_news", getattr(resp.usage, "completion_tokens", 0) if resp.usage else 0)
+        return resp.choices[0].message.content
+
+    return wire_schema.with_retry("lp_news", key or title, call)
+
+
+def build_messages(title: str, body: str) -> List[dict]:
+    return PROMPTS[wire_schema.FORMAT].render(title=title, body=body)
+
+
+def parse_response(content: str) -> Dict[str, Any]:
+    """모델 응답(JSON 문자열) → 기존 키(is_fundraising, LP, 운용사 ...) dict (wire_schema 복구/정규화/복원)."""
+    return wire_schema.decode("lp_news", content)
 
 
 def append_summaries(rows: List[dict]):
@@ -293,14 +262,17 @@ def append_summaries(rows: List[dict]):
         "url",
         "Source ID",
         "raw_url",
-    ]
-    file_exists = os.path.exists(SUMMARIES_CSV)
-    with open(SUMMARIES_CSV, "a", newline="", encoding="utf-8-sig") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        if not file_exists:
-            writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+    ] + amount_normalizer.column_names("펀드규모")
+    # 펀드규모 텍스트 → 숫자/통화/원화환산/구분 컬럼 (amount_normalizer)
+    rows = [dict(r, **amount_normalizer.columns(r.get("펀드규모") or "", "펀드규모")) for r in rows]
+    csv_partitions.ensure_columns(SUMMARIES_CSV, fieldnames)
+    csv_partitions.append_rows(SUMMARIES_CSV, rows, fieldnames)
+    # LP/운용사 이름 → Deal ID 역인덱스 (entity_index.json)
+    entity_index.index_rows("lp_news", rows, {"lp": "LP", "gp": "운용사"})
+    # 요약 / 본문 전문 검색 색인 (search_index.db)
+    search_index.index_rows("lp_news", rows)
+    # 섹터/조성상태/날짜/금액/LP/운용사 조회 인덱스 (deal_index.db)
+    deal_query.index_rows("lp_news", rows)
 
 
 def append_master_log(rows: List[dict]):
@@ -314,44 +286,37 @@ def append_master_log(rows: List[dict]):
         "Source ID",
         "raw_url",
     ]
-    file_exists = os.path.exists(MASTER_CSV)
-    with open(MASTER_CSV, "a", newline="", encoding="utf-8-sig") as f:
-        writer = csv.DictWriter(f, fieldnames=fieldnames)
-        if not file_exists:
-            writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+    csv_partitions.append_rows(MASTER_CSV, rows, fieldnames)
 
 
 def get_last_deal_id() -> int:
     """
     SUMMARIES_CSV 기준으로 마지막 Deal ID를 읽어와서 정수로 반환한다.
     파일이 없거나 유효한 Deal ID가 없으면 0을 반환한다.
+    (파티션 레이아웃이면 manifest만 읽는다.)
     """
-    if not os.path.exists(SUMMARIES_CSV):
-        return 0
-
-    last_id = 0
-    with open(SUMMARIES_CSV, newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            raw = row.get("Deal ID") or row.get("deal_number") or row.get("deal_id")
-            if not raw:
-                continue
-            try:
-                num = int(str(raw).strip())
-            except ValueError:
-                # 숫자로 변환 불가한 Deal ID는 무시
-                continue
-            if num > last_id:
-                last_id = num
-    return last_id
+    return csv_partitions.max_id(SUMMARIES_CSV)
 
 
-if __name__ == "__main__":
+def main(links: List[dict] = None, backfill_limit: int = None, backlog: bool = None):
+    """
+    요약 단계 (run_pipeline.py / watch_pipeline.py에서도 호출).
+    links를 넘기지 않으면 lp_news_links.csv 전체를 큐로 보고, 아직 처리 안 된 URL만 요약한다.
+    backfill_limit: backfill 큐(lp_news_backfill_links.csv)에서 이번에 가져올 최대 기사 수
+                    (기본: links를 넘기면 0, 아니면 summary_scheduler.BACKFILL_PER_RUN)
+    backlog: 지난 실행에서 미룬 URL도 이어서 처리할지 (기본: links를 안 넘긴 경우만)
+    시간/토큰 예산(summary_scheduler)을 넘기기 전에 멈추고, 남은 URL은 순서대로 다음 실행으로 미룬다.
+    반환값: (요약 CSV에 추가한 행, 마스터 로그에 추가한 행)
+    """
     print("=== LP News GPT 요약기 ===")
 
-    links = load_links()
+    explicit = links is not None
+    if backfill_limit is None:
+        backfill_limit = 0 if explicit else BACKFILL_PER_RUN
+    if backlog is None:
+        backlog = not explicit
+    if links is None:
+        links = load_links()
     processed_urls = load_processed_urls()
     print(f"[INFO] 링크 CSV 로딩: {len(links)}건, 기존 처리 URL: {len(processed_urls)}건")
 
@@ -363,24 +328,83 @@ if __name__ == "__main__":
     new_summary_rows: List[dict] = []  # 새로 요약할 펀드레이징 기사
     master_rows: List[dict] = []       # 마스터 로그용 처리 이력
 
-    for row in links:
-        raw_url = row.get("url")
-        if not raw_url:
-            continue
+    def url_of(r: dict) -> str:
+        return normalize_url(r.get("url") or "")
 
-        url = normalize_url(raw_url)
-        if not url:
-            continue
+    pending = [r for r in links if url_of(r) and url_of(r) not in processed_urls]
+
+    # backfill 링크는 오래된 기사라 최근 파티션이 아니라 전체 처리 기록과 비교, 한 번에 backfill_limit건까지만
+    backfill_links = load_backfill_links() if backfill_limit > 0 else []
+    if backfill_links:
+        all_processed = load_processed_urls(recent_months=None)
+        queued = {url_of(r) for r in pending}
+        backfill_pending = [
+            r for r in backfill_links if url_of(r) and url_of(r) not in all_processed and url_of(r) not in queued
+        ]
+        print(
+            f"[INFO] backfill 링크 {len(backfill_links)}건 중 미처리 {len(backfill_pending)}건 "
+            f"→ 이번에 {min(len(backfill_pending), backfill_limit)}건"
+        )
+        processed_urls |= all_processed
+        pending += backfill_pending[:backfill_limit]
+
+    queue = order_backlog(
+        "lp_news", pending, url_of, keywords=LP_News_Auto.KEYWORDS, processed=processed_urls, include_saved=backlog
+    )
+    budget = SummaryBudget("lp_news")
+    deferred: List[dict] = []
+    triage_skips: Dict[str, str] = {}
+    triaged = 0
+
+    def triage_until(end: int):
+        # TRIAGE_MODE: 목록 제목/요약문만으로 확실한 비펀드 기사는 본문도 안 받고 건너뜀 (BATCH건씩 필요할 때만)
+        nonlocal triaged
+        while triaged < min(end, len(queue)):
+            triage_skips.update(title_triage.triage(queue[triaged:triaged + title_triage.BATCH], url_of, budget=budget))
+            triaged += title_triage.BATCH
+
+    # EXTRACT_WORKERS: 한 창(WINDOW건) 앞까지 본문 fetch + 파싱을 워커 프로세스에서 미리 진행
+    prefetcher = extraction_pool.prefetcher("lp_news", download_article)
+
+    for i, row in enumerate(queue):
+        # run_pipeline에서 단계 timeout이 나면 다음 기사로 넘어가지 않고 멈춤 (stage_scheduler)
+        reason = budget.stop_reason() or stage_scheduler.cancel_reason()
+        if reason:
+            deferred = queue[i:]
+            print(f"[INFO] {reason} → {len(deferred)}건은 다음 실행으로 미룸")
+            break
 
+        raw_url = row.get("url")
+        url = url_of(row)
         source_id = make_source_id(url)
 
-        if url in processed_urls:
+        triage_until(i + 1)
+        if prefetcher is not None and i % prefetcher.window == 0:
+            ahead = queue[i:i + 2 * prefetcher.window]
+            triage_until(i + len(ahead))
+            prefetcher.schedule(url_of(r) for r in ahead if url_of(r) not in triage_skips)
+        if url in triage_skips:
+            print(f"[SKIP] triage {triage_skips[url]}: {row.get('title')}")
+            master_rows.append(
+                {
+                    "Deal ID": "",
+                    "기사 제목": row.get("title") or "",
+                    "기사 작성일": "",
+                    "url": url,
+                    "is_fundraising": "",
+                    "status": "triage_skipped",
+                    "Source ID": source_id,
+                    "raw_url": raw_url,
+                }
+            )
             continue
 
+        started = time.monotonic()
+
         try:
             print(f"[INFO] 요약 중: url={url} (raw={raw_url})")
-            title, body = extract_article_text(url)
-            data = call_openai(title=title, body=body)
+            title, body, meta = extract_article_text(url, prefetcher=prefetcher)
+            data = call_openai(title=title, body=body, budget=budget, key=url)
 
             # is_fundraising 플래그 해석
             is_fundraising = data.get("is_fundraising")
@@ -390,11 +414,15 @@ if __name__ == "__main__":
             else:
                 is_fundraising = bool(is_fundraising)
 
-            article_date = row.get("기사 작성일") or row.get("article_date") or row.get("date") or ""
+            # 작성일은 HTML 메타데이터(thebell key, article:published_time, JSON-LD 등)에서 'YYYY-MM-DD'로
+            article_date = (
+                meta["published"] or row.get("기사 작성일") or row.get("article_date") or row.get("date") or ""
+            )
 
             if is_fundraising:
                 deal_id = str(next_deal_id)
                 next_deal_id += 1
+                search_index.remember_body(url, body)
 
                 new_summary_rows.append(
                     {
@@ -440,8 +468,31 @@ if __name__ == "__main__":
                     }
                 )
 
+        except wire_schema.ExtractionFailed as e:
+            # 응답을 끝내 못 읽은 기사는 기록해 두고 다음 실행에서 다시 돈 쓰지 않음 (원문은 llm_failures.jsonl)
+            print(f"[WARN] 응답 해석 실패 (url={url}): {e}")
+            master_rows.append(
+                {
+                    "Deal ID": "",
+                    "기사 제목": title,
+                    "기사 작성일": "",
+                    "url": url,
+                    "is_fundraising": "",
+                    "status": "parse_failed",
+                    "Source ID": source_id,
+                    "raw_url": raw_url,
+                }
+            )
         except Exception as e:
             print(f"[WARN] 요약 실패 (url={url}): {e}")
+        budget.item_done(time.monotonic() - started)
+
+    if prefetcher is not None:
+        prefetcher.close()
+    budget.finish(deferred, keep_saved=not backlog)
+    title_triage.summary()
+    llm_stream.summary()
+    extraction_pool.summary()
 
     if not new_summary_rows:
         print("[INFO] 새로 요약할 URL 없음.")
@@ -451,4 +502,10 @@ if __name__ == "__main__":
 
     if master_rows:
         append_master_log(master_rows)
-        print(f"[INFO] 총 {len(master_rows)}건 처리 결과 기록 → {MASTER_CSV}")
\ No newline at end of file
+        print(f"[INFO] 총 {len(master_rows)}건 처리 결과 기록 → {MASTER_CSV}")
+
+    return new_summary_rows, master_rows
+
+
+if __name__ == "__main__":
+    main()
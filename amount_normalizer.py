@@ -0,0 +1,272 @@
+"""
+금액 텍스트 → 숫자 컬럼 (투자 금액 / 펀드규모).
+
+요약 CSV의 금액은 "7억 달러", "1억 8,700만 달러(약 2,750억 원)", "최소 445억원 이상" 같은 자유 텍스트라
+크기로 정렬/필터할 때마다 다시 파싱해야 했다. 저장할 때 아래 네 컬럼을 같이 채운다.
+
+  <컬럼> 값       : 원래 통화 기준 숫자 (예: 7억 달러 → 700000000)
+  <컬럼> 통화     : KRW / USD / EUR / JPY / CNY / GBP / SGD / HKD
+  <컬럼> 원화환산 : 원 단위 정수. 기사에 괄호로 원화 환산액이 있으면 그 값, 없으면 FX_RATES로 환산
+  <컬럼> 구분     : exact / approx(약, 수준) / min(최소, 이상, 초과) / max(최대, 이하, 미만) /
+                    range(300억~500억 → 값은 하한) / undisclosed(미공개, 비공개)
+못 읽은 텍스트(예: "15.5% 규모의 전략적 투자")는 네 컬럼 모두 빈 값.
+
+금액이 여러 개면 "총 ..." 금액, 없으면 괄호 밖 첫 금액을 대표값으로 쓴다.
+단위: 조/억/만(+천/백), million/billion(M/B/K, mn/bn), 통화 기호($, US$, €, ¥, ₩)와 단어(달러, 유로, 엔 ...).
+통화 표기가 없으면 원(KRW)으로 본다.
+
+  python amount_normalizer.py parse "1억 8,700만 달러(약 2,750억 원)"
+  python amount_normalizer.py backfill            # 기존 요약 CSV 전체에 컬럼 채우기
+  python amount_normalizer.py backfill --dry-run  # 파싱 결과 통계만
+
+환경 변수
+  - FX_RATES : 원화 환산 환율 덮어쓰기 (예: "USD=1380,EUR=1490", 1단위당 원)
+"""
+import os
+import re
+import argparse
+from collections import Counter
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+import csv_partitions
+
+FX_RATES: Dict[str, float] = {
+    "KRW": 1.0,
+    "USD": 1400.0,
+    "EUR": 1500.0,
+    "JPY": 9.3,
+    "CNY": 195.0,
+    "GBP": 1800.0,
+    "SGD": 1050.0,
+    "HKD": 180.0,
+}
+for _pair in (os.environ.get("FX_RATES") or "").split(","):
+    if "=" in _pair:
+        _code, _rate = _pair.split("=", 1)
+        FX_RATES[_code.strip().upper()] = float(_rate)
+
+_BIG_UNITS = {"조": 10 ** 12, "억": 10 ** 8, "만": 10 ** 4}
+_SMALL_UNITS = {"천": 1000, "백": 100, "십": 10}
+_MAGNITUDES = {
+    "trillion": 10 ** 12, "t": 10 ** 12,
+    "billion": 10 ** 9, "bn": 10 ** 9, "b": 10 ** 9,
+    "million": 10 ** 6, "mn": 10 ** 6, "m": 10 ** 6,
+    "thousand": 10 ** 3, "k": 10 ** 3,
+}
+# (통화 코드, 정규식) — 앞쪽이 우선 (싱가포르 달러가 달러보다 먼저)
+_CURRENCIES = [
+    ("SGD", r"싱가포르\s*달러|SGD|S\$"),
+    ("HKD", r"홍콩\s*달러|HKD|HK\$"),
+    ("USD", r"달러|dollars?|USD|US\$|\$"),
+    ("EUR", r"유로|euros?|EUR|€"),
+    ("JPY", r"엔|yen|JPY|¥|円"),
+    ("CNY", r"위안|yuan|CNY|RMB"),
+    ("GBP", r"파운드|pounds?|GBP|£"),
+    ("KRW", r"원|won|KRW|₩"),
+]
+_CURRENCY_RE = "|".join(f"(?:{pattern})" for _, pattern in _CURRENCIES)
+
+_NUM = r"\d[\d,]*(?:\.\d+)?"
+_AMOUNT_RE = re.compile(
+    rf"(?P<pre>(?:US\$|S\$|HK\$|\$|€|£|¥|₩|(?:USD|EUR|KRW|JPY|CNY|GBP)\s))?\s*"
+    rf"(?P<num>{_NUM}(?:\s*[천백십]?\s*[조억만](?:\s*{_NUM}(?:\s*[천백십]?\s*[조억만])?)*)?)"
+    rf"(?:\s*(?P<mag>trillion|billion|million|thousand|bn|mn|[tbmk])(?![a-z]))?"
+    rf"(?:\s*(?P<cur>{_CURRENCY_RE}))?",
+    re.IGNORECASE,
+)
+_GROUP_RE = re.compile(rf"({_NUM})\s*([천백십])?\s*([조억만])?")
+_RANGE_SEP_RE = re.compile(r"\s*[~\-–]\s*")
+_DELIMITERS = ",;()/"
+
+UNDISCLOSED = ("미공개", "비공개", "undisclosed", "확인 불가")
+QUALIFIER_WORDS = [
+    ("min", ("최소", "이상", "초과", "at least", "over ")),
+    ("max", ("최대", "이하", "미만", "up to")),
+    ("approx", ("약", "수준", "가량", "about", "approximately", "~")),
+]
+
+
+@dataclass
+class Amount:
+    value: Optional[float]
+    currency: str = ""
+    krw: Optional[float] = None
+    qualifier: str = ""
+
+
+@dataclass
+class _Candidate:
+    start: int
+    end: int
+    value: float
+    currency: str
+    has_unit: bool
+    in_parens: bool
+
+
+def _currency_code(token: str) -> str:
+    token = (token or "").strip()
+    for code, pattern in _CURRENCIES:
+        if re.fullmatch(pattern, token, re.IGNORECASE):
+            return code
+    return ""
+
+
+def _number(num: str) -> float:
+    """'1억 8,700만' / '2만5,000' / '1.2억' → 숫자."""
+    total = 0.0
+    for digits, small, big in _GROUP_RE.findall(num):
+        n = float(digits.replace(",", "")) * (_SMALL_UNITS[small] if small else 1)
+        total += n * (_BIG_UNITS[big] if big else 1)
+    return total
+
+
+def _paren_depths(text: str) -> List[int]:
+    depths, depth = [], 0
+    for ch in text:
+        if ch == "(":
+            depth += 1
+        depths.append(depth)
+        if ch == ")":
+            depth = max(0, depth - 1)
+    return depths
+
+
+def _candidates(text: str) -> List[_Candidate]:
+    depths = _paren_depths(text)
+    out = []
+    for m in _AMOUNT_RE.finditer(text):
+        num = m.group("num")
+        mag = (m.group("mag") or "").lower()
+        currency = _currency_code(m.group("cur") or "") or _currency_code(m.group("pre") or "")
+        has_unit = bool(mag) or any(u in num for u in _BIG_UNITS)
+        if not (has_unit or currency):
+            continue  # "2025년", "3곳" 같은 단순 숫자
+        value = _number(num) * _MAGNITUDES.get(mag, 1)
+        out.append(_Candidate(m.start("num"), m.end(), value, currency, has_unit, depths[m.start("num")] > 0))
+    return out
+
+
+def _segment(text: str, start: int, end: int) -> str:
+    """후보 주변의 구분자(, ; ( ) /) 사이 텍스트 (약/최소/이상 같은 수식어 찾기용)."""
+    left = max((text.rfind(d, 0, start) for d in _DELIMITERS), default=-1)
+    rights = [i for i in (text.find(d, end) for d in _DELIMITERS) if i >= 0]
+    return text[left + 1:min(rights) if rights else len(text)]
+
+
+def _qualifier(text: str, c: _Candidate) -> str:
+    segment = _segment(text, c.start, c.end)
+    for name, words in QUALIFIER_WORDS:
+        if any(w in segment for w in words):
+            return name
+    return "exact"
+
+
+def parse_amount(text: str, default_currency: str = "KRW") -> Optional[Amount]:
+    """금액 텍스트 → Amount (미공개면 value=None, qualifier=undisclosed / 못 읽으면 None)."""
+    text = (text or "").strip()
+    if not text:
+        return None
+    if any(w in text.lower() for w in UNDISCLOSED):
+        return Amount(None, qualifier="undisclosed")
+
+    cands = _candidates(text)
+    if not cands:
+        return None
+    outside = [c for c in cands if not c.in_parens] or cands
+    primary = next((c for c in outside if "총" in text[max(0, c.start - 4):c.start]), outside[0])
+    idx = cands.index(primary)
+    following = cands[idx + 1] if idx + 1 < len(cands) else None
+
+    qualifier = _qualifier(text, primary)
+    currency = primary.currency
+    # "300억~500억원": 하한을 값으로, 통화는 뒤쪽에서
+    if following is not None and _RANGE_SEP_RE.fullmatch(text[primary.end:following.start]):
+        qualifier = "range"
+        currency = currency or following.currency
+    currency = currency or default_currency
+
+    krw = None
+    if currency == "KRW":
+        krw = primary.value
+    elif following is not None and following.in_parens and following.currency == "KRW":
+        # "1억 8,700만 달러(약 2,750억 원)": 기사에 나온 원화 환산액 우선
+        krw = following.value
+    elif currency in FX_RATES:
+        krw = primary.value * FX_RATES[currency]
+    return Amount(primary.value, currency, krw, qualifier)
+
+
+# ------------------------
+# CSV 컬럼
+# ------------------------
+
+def column_names(prefix: str) -> List[str]:
+    return [f"{prefix} 값", f"{prefix} 통화", f"{prefix} 원화환산", f"{prefix} 구분"]
+
+
+def _fmt(value: Optional[float]) -> str:
+    if value is None:
+        return ""
+    return str(int(round(value))) if abs(value - round(value)) < 1e-6 or value >= 1000 else f"{value:g}"
+
+
+def columns(text: str, prefix: str) -> Dict[str, str]:
+    """금액 텍스트 → 요약 CSV에 같이 쓸 네 컬럼 {<prefix> 값, 통화, 원화환산, 구분}."""
+    names = column_names(prefix)
+    amount = parse_amount(text)
+    if amount is None:
+        return {name: "" for name in names}
+    return dict(zip(names, [_fmt(amount.value), amount.currency, _fmt(amount.krw), amount.qualifier]))
+
+
+# 요약 CSV → 금액 원문 컬럼
+TARGETS = [
+    ("wowtale_deals.csv", "투자 금액", "utf-8"),
+    ("lp_news_summaries.csv", "펀드규모", "utf-8-sig"),
+]
+
+
+def backfill(dry_run: bool = False):
+    """기존 요약 CSV 전체 행에 금액 컬럼을 (다시) 채운다."""
+    for path, column, encoding in TARGETS:
+        if not csv_partitions.exists(path):
+            print(f"[INFO] {path} 없음 → 건너뜀")
+            continue
+        kinds: Counter = Counter()
+        unparsed: List[str] = []
+
+        def update(row: dict):
+            cols = columns(row.get(column) or "", column)
+            row.update(cols)
+            kind = cols[f"{column} 구분"] or ("unparsed" if (row.get(column) or "").strip() else "empty")
+            kinds[kind] += 1
+            if kind == "unparsed" and len(unparsed) < 10:
+                unparsed.append(row.get(column))
+
+        if dry_run:
+            for row in csv_partitions.iter_rows(path, encoding=encoding):
+                update(dict(row))  # 행 캐시(csv_partitions)를 건드리지 않게 사본으로
+        else:
+            csv_partitions.rewrite_rows(path, update, column_names(column), encoding=encoding)
+        total = sum(kinds.values())
+        print(f"[INFO] {path} {column}: {total}행 " + " / ".join(f"{k} {v}" for k, v in kinds.most_common()))
+        for text in unparsed:
+            print(f"  못 읽음: {text}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="금액 텍스트 정규화 도구")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_parse = sub.add_parser("parse", help="금액 텍스트 하나 파싱")
+    p_parse.add_argument("text")
+    p_backfill = sub.add_parser("backfill", help="기존 요약 CSV에 금액 컬럼 채우기")
+    p_backfill.add_argument("--dry-run", action="store_true", help="파일은 그대로 두고 통계만")
+    args = parser.parse_args()
+
+    if args.cmd == "parse":
+        print(parse_amount(args.text))
+        print(columns(args.text, "금액"))
+    else:
+        backfill(dry_run=args.dry_run)
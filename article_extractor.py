@@ -0,0 +1,327 @@
+"""
+기사 본문 추출 엔진 (도메인별 selector 학습 캐시).
+
+사이트별 후보 셀렉터(SITE_RULES)를 매번 전부 시도하는 대신,
+도메인마다 "본문이 나온 셀렉터(+몇 번째 노드)"를 selector_cache.json에 기억해 두고
+다음 기사부터는 그 셀렉터 하나만 바로 쓴다.
+
+- 캐시된 셀렉터 결과가 비었거나 그 도메인 평균 길이의 MIN_LENGTH_RATIO 미만이면
+  전체 탐색으로 검증/재학습 (레이아웃이 바뀐 경우)
+- 캐시가 맞더라도 VERIFY_EVERY건마다 한 번은 전체 탐색과 비교해서 어긋나면 재학습
+- 전체 탐색 규칙은 기존 스크립트와 같다
+    - longest: 후보 셀렉터의 모든 노드 중 텍스트가 가장 긴 노드 (wowtale)
+    - first  : 후보 순서대로 "셀렉터 p" 또는 셀렉터 노드 텍스트가 처음 나오는 곳 (thebell / newstopkorea)
+
+벤치마크 (저장해 둔 페이지로 전체 탐색 vs 캐시 경로 시간과 결과 일치율 비교):
+  python article_extractor.py record urls.txt bench_pages/
+  python article_extractor.py bench bench_pages/
+"""
+import os
+import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import tracing
+
+CACHE_PATH = "selector_cache.json"
+VERIFY_EVERY = 20
+MIN_LENGTH_RATIO = 0.3
+LENGTH_ALPHA = 0.2
+
+# 도메인 → (탐색 방식, 후보 셀렉터)
+SITE_RULES: Dict[str, Tuple[str, List[str]]] = {
+    "wowtale.net": (
+        "longest",
+        [
+            "article .tdb-block-inner",      # Newspaper/tdb 계열 본문 래퍼
+            "article .td-post-content",      # 구형/다른 스킨에서의 본문
+            "article .entry-content",        # 워드프레스 기본
+            "article",                       # 그래도 안 잡히면 article 전체
+            ".td-post-content",              # article 태그가 없을 때
+            ".entry-content",                # fallback 1
+        ],
+    ),
+    # newstopkorea는 기사 본문 article.atlview-grid-body를 우선 시도
+    "newstopkorea.com": (
+        "first",
+        [
+            "article.atlview-grid-body",
+            "div#article-view-content-div",
+            "div.article",
+            "div#content",
+        ],
+    ),
+}
+# 그 외(thebell 등) 기본값
+DEFAULT_RULE: Tuple[str, List[str]] = (
+    "first",
+    [
+        "div#article-view-content-div",
+        "div.article",
+        "div#content",
+    ],
+)
+
+
+def domain_of(url: str) -> str:
+    netloc = (urlparse(url).netloc or "").lower()
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
+def rule_for(url: str) -> Tuple[str, List[str]]:
+    domain = domain_of(url)
+    for site, rule in SITE_RULES.items():
+        if domain == site or domain.endswith("." + site):
+            return rule
+    return DEFAULT_RULE
+
+
+# ------------------------
+# 탐색
+# ------------------------
+
+def _first_texts(soup, sel: str) -> List[str]:
+    texts = []
+    parts = soup.select(sel + " p") or soup.select(sel)
+    for p in parts:
+        t = p.get_text(" ", strip=True)
+        if t:
+            texts.append(t)
+    return texts
+
+
+def full_search(soup, mode: str, candidates: List[str]) -> Tuple[Optional[str], Optional[str], int]:
+    """전체 탐색 → (본문, 셀렉터, 노드 index). 못 찾으면 (None, None, -1)."""
+    if mode == "longest":
+        best_node = None
+        best = (None, -1)
+        best_len = 0
+        # 각 셀렉터에서 나온 모든 노드를 검사하여, 텍스트 길이가 가장 긴 노드를 선택
+        for sel in candidates:
+            for idx, node in enumerate(soup.select(sel)):
+                l = len(node.get_text("\n", strip=True))
+                if l > best_len:
+                    best_len = l
+                    best_node = node
+                    best = (sel, idx)
+        if best_node is None:
+            return None, None, -1
+        return best_node.get_text("\n", strip=True), best[0], best[1]
+
+    for sel in candidates:
+        texts = _first_texts(soup, sel)
+        if texts:
+            return "\n".join(texts), sel, 0
+    return None, None, -1
+
+
+def cached_extract(soup, mode: str, selector: str, index: int) -> Optional[str]:
+    if mode == "longest":
+        nodes = soup.select(selector)
+        if index >= len(nodes):
+            return None
+        return nodes[index].get_text("\n", strip=True) or None
+    texts = _first_texts(soup, selector)
+    return "\n".join(texts) if texts else None
+
+
+# ------------------------
+# 도메인별 캐시
+# ------------------------
+
+class SelectorCache:
+    def __init__(self, path: Optional[str] = CACHE_PATH, readonly: bool = False):
+        self.path = path
+        self.readonly = readonly  # 파일은 읽기만 (extraction_pool 워커 프로세스끼리 같은 파일에 쓰지 않도록)
+        self.lock = threading.Lock()
+        self.entries: Dict[str, dict] = {}
+        if path and os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                self.entries = json.load(f)
+        self.stats = {"hits": 0, "verified": 0, "relearned": 0, "full_searches": 0}
+
+    def _save(self):
+        if not self.path or self.readonly:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+    def _learn(self, domain: str, mode: str, selector: str, index: int, length: int):
+        with self.lock:
+            prev = self.entries.get(domain) or {}
+            changed = (prev.get("selector"), prev.get("index"), prev.get("mode")) != (selector, index, mode)
+            self.entries[domain] = {
+                "mode": mode,
+                "selector": selector,
+                "index": index,
+                "avg_length": prev.get("avg_length") or length,
+                "uses": 0 if changed else int(prev.get("uses") or 0),
+                "updated_at": datetime.now().isoformat(timespec="seconds"),
+            }
+            if changed:
+                self.stats["relearned"] += 1
+                self._save()
+
+    def _observe(self, domain: str, length: int):
+        with self.lock:
+            e = self.entries[domain]
+            e["uses"] = int(e.get("uses") or 0) + 1
+            e["avg_length"] = LENGTH_ALPHA * length + (1 - LENGTH_ALPHA) * float(e.get("avg_length") or length)
+
+    def extract(self, soup, url: str) -> Tuple[Optional[str], Optional[str]]:
+        """본문 텍스트와 사용한 셀렉터 (못 찾으면 (None, None) → 호출 쪽 fallback)."""
+        domain = domain_of(url)
+        mode, candidates = rule_for(url)
+        entry = self.entries.get(domain)
+
+        with tracing.span("extract.body", domain=domain) as attrs:
+            if entry and entry.get("mode") == mode:
+                text = cached_extract(soup, mode, entry["selector"], int(entry.get("index") or 0))
+                avg = float(entry.get("avg_length") or 0)
+                plausible = text is not None and len(text) >= MIN_LENGTH_RATIO * avg
+                verify = int(entry.get("uses") or 0) % VERIFY_EVERY == VERIFY_EVERY - 1
+                if plausible and not verify:
+                    self.stats["hits"] += 1
+                    self._observe(domain, len(text))
+                    attrs["path"] = "cache"
+                    return text, f"{entry['selector']}[{entry.get('index', 0)}] (cached)"
+                if plausible and verify:
+                    self.stats["verified"] += 1
+
+            attrs["path"] = "full"
+            self.stats["full_searches"] += 1
+            text, selector, index = full_search(soup, mode, candidates)
+            if text is None:
+                return None, None
+            self._learn(domain, mode, selector, index, len(text))
+            self._observe(domain, len(text))
+            return text, f"{selector}[{index}]"
+
+    def adopt(self, domain: str, entry: dict):
+        """다른 프로세스(extraction_pool 워커)가 새로 학습한 셀렉터를 반영하고 저장."""
+        self._learn(domain, entry["mode"], entry["selector"], int(entry.get("index") or 0), int(entry.get("avg_length") or 0))
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return dict(self.stats, domains={d: e.get("selector") for d, e in self.entries.items()})
+
+
+_default: Optional[SelectorCache] = None
+_default_lock = threading.Lock()
+
+
+def default_cache() -> SelectorCache:
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = SelectorCache()
+            tracing.register_section("selector_cache", _default.snapshot)
+        return _default
+
+
+def use_cache(cache: SelectorCache):
+    """기본 캐시 교체 (extraction_pool 워커는 readonly 사본을 쓴다)."""
+    global _default
+    with _default_lock:
+        _default = cache
+
+
+def extract_main_text(soup, url: str) -> Tuple[Optional[str], Optional[str]]:
+    return default_cache().extract(soup, url)
+
+
+# ------------------------
+# 벤치마크
+# ------------------------
+
+def record(urls_file: str, out_dir: str):
+    """URL 목록의 원본 HTML을 out_dir에 저장 (index.jsonl에 url ↔ 파일)."""
+    from pipeline_context import fetch
+
+    os.makedirs(out_dir, exist_ok=True)
+    with open(urls_file, encoding="utf-8") as f:
+        urls = [line.strip() for line in f if line.strip()]
+    with open(os.path.join(out_dir, "index.jsonl"), "a", encoding="utf-8") as index:
+        for url in urls:
+            res = fetch(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=20)
+            if res.status_code >= 400:
+                print(f"[WARN] {url} HTTP {res.status_code}")
+                continue
+            name = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16] + ".html"
+            with open(os.path.join(out_dir, name), "w", encoding="utf-8") as out:
+                out.write(res.text)
+            index.write(json.dumps({"url": url, "file": name}, ensure_ascii=False) + "\n")
+            print(f"[INFO] 저장 {url} → {name}")
+
+
+def bench(pages_dir: str, repeat: int = 3):
+    """저장된 페이지마다 전체 탐색과 캐시 경로를 각각 repeat번 돌려 시간/결과 일치 비교."""
+    from bs4 import BeautifulSoup
+
+    with open(os.path.join(pages_dir, "index.jsonl"), encoding="utf-8") as f:
+        pages = [json.loads(line) for line in f if line.strip()]
+
+    cache = SelectorCache(path=None)
+    per_domain: Dict[str, dict] = {}
+    for page in pages:
+        url = page["url"]
+        with open(os.path.join(pages_dir, page["file"]), encoding="utf-8") as f:
+            soup = BeautifulSoup(f.read(), "html.parser")
+        mode, candidates = rule_for(url)
+
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            expected, _, _ = full_search(soup, mode, candidates)
+        full_s = (time.perf_counter() - t0) / repeat
+
+        t0 = time.perf_counter()
+        for _ in range(repeat):
+            got, _ = cache.extract(soup, url)
+        cached_s = (time.perf_counter() - t0) / repeat
+
+        d = per_domain.setdefault(domain_of(url), {"pages": 0, "full": 0.0, "cached": 0.0, "equal": 0})
+        d["pages"] += 1
+        d["full"] += full_s
+        d["cached"] += cached_s
+        d["equal"] += int(got == expected)
+        if got != expected:
+            print(f"[DIFF] {url} (full {len(expected or '')}자 / cached {len(got or '')}자)")
+
+    print(f"\n{'domain':<20} {'pages':>5} {'full ms':>9} {'cached ms':>10} {'speedup':>8} {'equal':>7}")
+    for domain, d in sorted(per_domain.items()):
+        n = d["pages"]
+        speedup = d["full"] / d["cached"] if d["cached"] else 0.0
+        print(
+            f"{domain:<20} {n:>5} {d['full'] / n * 1000:>9.2f} {d['cached'] / n * 1000:>10.2f} "
+            f"{speedup:>7.1f}x {d['equal'] / n:>6.0%}"
+        )
+    print(f"\n캐시 통계: {cache.snapshot()}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="도메인별 본문 셀렉터 캐시 도구")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_record = sub.add_parser("record", help="URL 목록의 HTML을 저장")
+    p_record.add_argument("urls_file")
+    p_record.add_argument("out_dir")
+    p_bench = sub.add_parser("bench", help="저장된 페이지로 전체 탐색 vs 캐시 비교")
+    p_bench.add_argument("pages_dir")
+    p_bench.add_argument("--repeat", type=int, default=3)
+    p_show = sub.add_parser("show", help="학습된 셀렉터 출력")
+    args = parser.parse_args()
+
+    if args.cmd == "record":
+        record(args.urls_file, args.out_dir)
+    elif args.cmd == "bench":
+        bench(args.pages_dir, repeat=args.repeat)
+    else:
+        json.dump(SelectorCache().entries, sys.stdout, ensure_ascii=False, indent=2)
+        print()
@@ -0,0 +1,199 @@
+"""
+기사 메타데이터(제목 / 작성일 / 출처 / 기자) 결정적 추출.
+
+LLM에게 날짜·출처를 물어보지 않고 HTML에서 바로 읽는다.
+  1) 사이트별 규칙 (thebell / newstopkorea / wowtale)
+  2) 공통 메타 태그: og:title, article:published_time, og:site_name, author / article:author
+  3) JSON-LD: datePublished, headline, author, publisher.name
+  4) <time datetime="...">
+
+published는 "YYYY-MM-DD", date_source는 어디서 읽었는지 (신뢰도 판단용).
+"""
+import re
+import json
+from datetime import datetime
+from typing import List
+from urllib.parse import urlparse, parse_qs
+
+# 도메인 → 매체명
+SOURCE_NAMES = {
+    "thebell.co.kr": "더벨",
+    "newstopkorea.com": "뉴스톱코리아",
+    "wowtale.net": "와우테일",
+}
+
+# URL/본문에서 날짜를 읽는 사이트별 규칙
+_THEBELL_KEY_RE = re.compile(r"^(20\d{2})(\d{2})(\d{2})")
+_WOWTALE_PATH_RE = re.compile(r"/(20\d{2})/(\d{2})/(\d{2})/")
+_DATE_RE = re.compile(r"(20\d{2})\s*[.\-/년]\s*(\d{1,2})\s*[.\-/월]\s*(\d{1,2})")
+
+# 날짜 신뢰 순서: 메타/JSON-LD/사이트 규칙은 신뢰, 본문 텍스트 패턴은 참고용
+RELIABLE_DATE_SOURCES = {"site", "meta", "json-ld", "time"}
+
+
+def _domain(url: str) -> str:
+    netloc = (urlparse(url).netloc or "").lower()
+    return netloc[4:] if netloc.startswith("www.") else netloc
+
+
+def _site(url: str) -> str:
+    domain = _domain(url)
+    for site in SOURCE_NAMES:
+        if domain == site or domain.endswith("." + site):
+            return site
+    return ""
+
+
+def normalize_date(value: str) -> str:
+    """ISO 8601 / '2025.12.02' / '2025년 12월 2일' 등 → 'YYYY-MM-DD' (실패하면 빈 문자열)."""
+    value = (value or "").strip()
+    if not value:
+        return ""
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).date().isoformat()
+    except ValueError:
+        pass
+    m = _DATE_RE.search(value)
+    if not m:
+        return ""
+    try:
+        return datetime(int(m.group(1)), int(m.group(2)), int(m.group(3))).date().isoformat()
+    except ValueError:
+        return ""
+
+
+def _meta(soup, *keys: str) -> str:
+    for key in keys:
+        tag = soup.find("meta", attrs={"property": key}) or soup.find("meta", attrs={"name": key})
+        if tag and (tag.get("content") or "").strip():
+            return tag["content"].strip()
+    return ""
+
+
+def _json_ld(soup) -> List[dict]:
+    items: List[dict] = []
+    for script in soup.find_all("script", attrs={"type": "application/ld+json"}):
+        try:
+            data = json.loads(script.string or script.get_text() or "")
+        except (ValueError, TypeError):
+            continue
+        stack = data if isinstance(data, list) else [data]
+        while stack:
+            item = stack.pop(0)
+            if not isinstance(item, dict):
+                continue
+            items.append(item)
+            graph = item.get("@graph")
+            if isinstance(graph, list):
+                stack.extend(graph)
+    return items
+
+
+def _ld_name(value) -> str:
+    if isinstance(value, list):
+        return ", ".join(n for n in (_ld_name(v) for v in value) if n)
+    if isinstance(value, dict):
+        return (value.get("name") or "").strip()
+    return (value or "").strip() if isinstance(value, str) else ""
+
+
+# ------------------------
+# 사이트별 규칙
+# ------------------------
+
+def _site_date(soup, url: str, site: str) -> str:
+    if site == "thebell.co.kr":
+        # 기사 key가 작성일시로 시작 (예: key=202405011234567)
+        key = (parse_qs(urlparse(url).query).get("key") or [""])[0]
+        m = _THEBELL_KEY_RE.match(key)
+        if m:
+            return normalize_date("-".join(m.groups()))
+        node = soup.select_one(".userBox .date, .viewHead .date, span.date")
+        return normalize_date(node.get_text(" ", strip=True)) if node else ""
+
+    if site == "newstopkorea.com":
+        # 기사 정보 영역: "입력 2025.12.02 10:00"
+        for li in soup.select("ul.infomation li, .info-group li, .article-head-info li"):
+            text = li.get_text(" ", strip=True)
+            if "입력" in text:
+                return normalize_date(text)
+        return ""
+
+    if site == "wowtale.net":
+        m = _WOWTALE_PATH_RE.search(url)
+        if m:
+            return normalize_date("-".join(m.groups()))
+    return ""
+
+
+def _site_author(soup, site: str) -> str:
+    if site == "newstopkorea.com":
+        for li in soup.select("ul.infomation li, .info-group li"):
+            text = li.get_text(" ", strip=True)
+            if "기자" in text and "입력" not in text:
+                return text
+    if site == "wowtale.net":
+        node = soup.select_one(".tdb-author-name, .td-post-author-name a, a[rel='author']")
+        if node:
+            return node.get_text(" ", strip=True)
+    return ""
+
+
+# ------------------------
+# 추출
+# ------------------------
+
+def extract_metadata(soup, url: str) -> dict:
+    """
+    → {"title", "published", "date_source", "source", "author"}
+    published: 'YYYY-MM-DD' 또는 빈 문자열, date_source: site/meta/json-ld/time/text/""
+    """
+    site = _site(url)
+    ld_items = _json_ld(soup)
+    ld_article = next(
+        (i for i in ld_items if i.get("datePublished") or i.get("headline")),
+        {},
+    )
+
+    title = _meta(soup, "og:title", "twitter:title") or (ld_article.get("headline") or "").strip()
+
+    published, date_source = _site_date(soup, url, site), "site"
+    if not published:
+        published, date_source = normalize_date(_meta(soup, "article:published_time", "pubdate", "publishdate", "date")), "meta"
+    if not published and ld_article:
+        published, date_source = normalize_date(ld_article.get("datePublished") or ""), "json-ld"
+    if not published:
+        time_tag = soup.find("time", attrs={"datetime": True})
+        published, date_source = (normalize_date(time_tag["datetime"]), "time") if time_tag else ("", "")
+    if not published:
+        # 마지막 수단: 본문 앞부분의 날짜 패턴 (신뢰하지 않음)
+        published = normalize_date(soup.get_text(" ", strip=True)[:2000])
+        date_source = "text" if published else ""
+
+    source = SOURCE_NAMES.get(site) or _meta(soup, "og:site_name") or _ld_name(ld_article.get("publisher"))
+    author = (
+        _site_author(soup, site)
+        or _meta(soup, "author", "article:author", "dable:author", "byl")
+        or _ld_name(ld_article.get("author"))
+    )
+
+    return {
+        "title": title,
+        "published": published,
+        "date_source": date_source,
+        "source": source,
+        "author": author,
+    }
+
+
+def has_reliable_date(meta: dict) -> bool:
+    return bool(meta.get("published")) and meta.get("date_source") in RELIABLE_DATE_SOURCES
+
+
+def has_reliable_source(meta: dict) -> bool:
+    return bool(meta.get("source"))
+
+
+def dotted(date_iso: str) -> str:
+    """'2025-12-02' → '2025.12.02' (wowtale 요약 CSV의 기사 날짜 형식)."""
+    return date_iso.replace("-", ".") if date_iso else ""
@@ -0,0 +1,409 @@
+"""
+과거 기사 backfill 크롤러 (thebell / newstopkorea / wowtale).
+
+평소 수집기(LP_News_Auto.py, wowtale_auto.py)는 목록 3~4페이지만 보므로,
+몇 년치 LP Radar / wowtale 투자 기사를 채우려면 이걸로 목록 페이지를 끝까지 훑는다.
+
+- 소스별 커서(backfill_state.json): 다음에 읽을 페이지 번호, 끝 도달 여부, 누적 통계
+  중간에 끊겨도(Ctrl+C, timeout) 다시 실행하면 그 페이지부터 이어서 읽는다.
+  목록은 최신순이라 그 사이 새 기사가 올라오면 기존 기사가 뒤 페이지로 밀리는데,
+  이 경우 몇 건을 다시 볼 뿐(중복 제거됨) 건너뛰지는 않는다.
+- 소스끼리는 동시에, 소스 안에서는 페이지 CONCURRENCY장씩 동시에 가져오되
+  호스트별 최소 요청 간격(DELAY)을 지킨다. 실제 동시 요청 수는 host_limiter(AIMD)가
+  응답 상태/latency를 보고 호스트별로 조절한다.
+- 결과는 CHUNK_PAGES 페이지마다 링크 저장소에 append하고 그 다음에 커서를 저장한다.
+  (수집 결과 전체를 메모리에 모아두지 않음. 중복 확인용 기존 URL도 임시 SQLite 파일에 둔다)
+    - thebell / newstopkorea → lp_news_backfill_links.csv
+    - wowtale                → wowtale_backfill_links.csv
+  평소 링크 큐와 분리된 backfill 큐라서, 요약기는 배치 실행 한 번에 SUMMARY_BACKFILL_PER_RUN건씩만
+  가져가고(summary_scheduler 예산 안에서) watch_pipeline의 새 기사 요약은 이 큐를 건드리지 않는다.
+- 429/503 재시도는 pipeline_context.fetch가 한다. 그래도 실패한 페이지는 error로 두고
+  커서를 거기서 멈춰 다음 실행에서 이어 읽는다.
+- 진행 중/종료 시 pages/s, articles/s(목록에서 훑은 기사 링크 수 기준), 새 URL 수를 출력
+
+사용법:
+  python backfill_crawler.py                         # 세 소스 모두, 끝까지
+  python backfill_crawler.py --sources thebell --max-pages 200
+  python backfill_crawler.py --reset wowtale         # 해당 소스 커서를 처음으로
+
+환경 변수
+  - BACKFILL_CONCURRENCY : 소스별 동시 페이지 요청 수 (기본 3)
+  - BACKFILL_DELAY       : 같은 호스트 요청 사이 최소 간격 초 (기본 1.0)
+"""
+import os
+import json
+import time
+import sqlite3
+import argparse
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import csv_partitions
+import LP_News_Auto
+import wowtale_auto
+import wowtale_GPT_auto
+from pipeline_context import fetch, parse_html
+
+STATE_PATH = "backfill_state.json"
+
+CONCURRENCY = int(os.environ.get("BACKFILL_CONCURRENCY") or 3)
+DELAY = float(os.environ.get("BACKFILL_DELAY") or 1.0)
+CHUNK_PAGES = 20
+PAGE_RETRIES = 3
+
+HEADERS = {"User-Agent": "Mozilla/5.0"}
+
+
+@dataclass
+class Source:
+    name: str
+    page_request: Callable[[int], Tuple[str, Optional[dict]]]  # page → (url, params)
+    parse: Callable[[object, str], Tuple[list, int]]           # (soup, url) → (매칭 기사(URL 또는 dict), 전체 기사 링크 수)
+    store: str                                                 # "lp" / "wowtale"
+
+
+SOURCES: Dict[str, Source] = {
+    s.name: s
+    for s in [
+        Source(
+            "thebell",
+            lambda p: (LP_News_Auto.BASE_URL, {"page": p, "svccode": "03"}),
+            lambda soup, url: LP_News_Auto.parse_thebell_list(soup),
+            "lp",
+        ),
+        Source(
+            "newstopkorea",
+            lambda p: (LP_News_Auto.NEWSTOPKOREA_LIST_URL, dict(LP_News_Auto.NEWSTOPKOREA_PARAMS, page=p)),
+            lambda soup, url: LP_News_Auto.parse_newstopkorea_list(soup),
+            "lp",
+        ),
+        Source(
+            "wowtale",
+            lambda p: (wowtale_auto.list_page_url(p), None),
+            wowtale_auto.parse_list_page,
+            "wowtale",
+        ),
+    ]
+}
+
+
+# ------------------------
+# 커서 저장
+# ------------------------
+
+_state_lock = threading.Lock()
+
+
+def load_state(path: str = STATE_PATH) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_cursor(name: str, cursor: dict, path: str = STATE_PATH):
+    with _state_lock:
+        state = load_state(path)
+        state[name] = cursor
+        tmp = path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+
+
+# ------------------------
+# 호스트별 요청 간격
+# ------------------------
+
+class HostPacer:
+    """같은 호스트로 가는 요청 시작 간격을 min_interval 이상으로 유지."""
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self.lock = threading.Lock()
+        self.next_at: Dict[str, float] = {}
+
+    def wait(self, host: str):
+        with self.lock:
+            now = time.monotonic()
+            at = max(now, self.next_at.get(host, 0.0))
+            self.next_at[host] = at + self.min_interval
+        if at > now:
+            time.sleep(at - now)
+
+
+# ------------------------
+# 링크 저장소
+# ------------------------
+
+class SeenUrls:
+    """
+    이미 본 URL 목록을 임시 SQLite 파일에 둔다 (몇 년치 URL을 메모리 set으로 들고 있지 않음).
+    크롤링이 끝나면 파일은 지운다. 호출하는 쪽(LinkSink)이 lock을 잡고 쓴다.
+    """
+
+    def __init__(self):
+        fd, self.path = tempfile.mkstemp(prefix="backfill_seen_", suffix=".db")
+        os.close(fd)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("CREATE TABLE urls (url TEXT PRIMARY KEY) WITHOUT ROWID")
+
+    def load(self, urls: Iterable[str]):
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO urls (url) VALUES (?)", ((u,) for u in urls if u))
+
+    def add_new(self, url: str) -> bool:
+        """처음 보는 URL이면 기록하고 True."""
+        cur = self.conn.execute("INSERT OR IGNORE INTO urls (url) VALUES (?)", (url,))
+        return cur.rowcount == 1
+
+    def close(self):
+        self.conn.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def _row_urls(path: str, fields: Tuple[str, ...], encoding: str = "utf-8-sig") -> Iterable[str]:
+    # 행 캐시(csv_partitions)에 전체를 올리지 않고 한 행씩 흘려 읽음
+    for row in csv_partitions.iter_rows(path, encoding=encoding, cache=False):
+        for field in fields:
+            if row.get(field):
+                yield row[field]
+
+
+class LinkSink:
+    """새 URL만 골라 링크 CSV에 chunk 단위로 append (thebell/newstopkorea가 같은 sink를 공유)."""
+
+    def __init__(self, store: str):
+        self.store = store
+        self.lock = threading.Lock()
+        self.seen = SeenUrls()
+        self.next_deal = 0
+
+        # backfill은 오래된 기사를 다루므로 최근 파티션이 아니라 전체에서 중복 확인
+        if store == "lp":
+            for path in (
+                LP_News_Auto.LINKS_CSV, LP_News_Auto.SUMMARIES_CSV, LP_News_Auto.MASTER_CSV, LP_News_Auto.BACKFILL_CSV
+            ):
+                self.seen.load(self._lp_urls(path))
+            self.next_deal += 1
+        else:
+            self.seen.load(_row_urls(wowtale_auto.LATEST_CSV, ("url",), encoding="utf-8"))
+            self.seen.load(_row_urls(wowtale_GPT_auto.SUMMARY_CSV, ("기사 링크",), encoding="utf-8"))
+            self.seen.load(_row_urls(wowtale_auto.BACKFILL_CSV, ("url",), encoding="utf-8"))
+
+    def _lp_urls(self, path: str) -> Iterable[str]:
+        # URL을 흘려 보내면서 최대 Deal ID도 같이 갱신 (파티션이면 manifest 값 사용)
+        if csv_partitions.is_partitioned(path):
+            self.next_deal = max(self.next_deal, csv_partitions.max_id(path))
+        for row in csv_partitions.iter_rows(path, cache=False):
+            for field in ("url", "raw_url"):
+                if row.get(field):
+                    yield row[field]
+            dn = row.get("Deal ID") or row.get("deal_number") or row.get("deal_id")
+            if dn and dn.isdigit():
+                self.next_deal = max(self.next_deal, int(dn))
+
+    def write(self, items: list) -> int:
+        """items: URL 문자열(wowtale) 또는 {"url", "title", "snippet"} (thebell/newstopkorea)."""
+        with self.lock:
+            new_items = []
+            with self.seen.conn:
+                for it in items:
+                    if self.seen.add_new(it["url"] if isinstance(it, dict) else it):
+                        new_items.append(it)
+            if not new_items:
+                return 0
+            if self.store == "lp":
+                LP_News_Auto.append_links_to_csv(new_items, LP_News_Auto.BACKFILL_CSV, start_deal_number=self.next_deal)
+                self.next_deal += len(new_items)
+            else:
+                stamp = datetime.now().isoformat(timespec="seconds")
+                csv_partitions.append_rows(
+                    wowtale_auto.BACKFILL_CSV,
+                    [{"url": u, "found_at": stamp} for u in new_items],
+                    ["url", "found_at"],
+                    encoding="utf-8",
+                )
+            return len(new_items)
+
+
+# ------------------------
+# 소스 1개 backfill
+# ------------------------
+
+def _fetch_page(source: Source, page: int, pacer: HostPacer) -> Tuple[str, list, int]:
+    """→ (상태 "ok"/"end"/"error", 매칭 기사, 전체 기사 링크 수)"""
+    url, params = source.page_request(page)
+    host = urlparse(url).netloc
+    # 429/503 재시도는 fetch(pipeline_context)가 Retry-After를 지켜서 한다 → 여기서는 연결 오류만 다시 시도
+    for attempt in range(PAGE_RETRIES):
+        pacer.wait(host)
+        try:
+            res = fetch(url, params=params, headers=HEADERS, timeout=20)
+        except Exception as e:
+            print(f"[WARN] [{source.name}] page {page} 요청 실패 ({attempt + 1}/{PAGE_RETRIES}): {e}")
+            time.sleep(2 ** attempt)
+            continue
+        if res.status_code == 404:
+            return "end", [], 0
+        if res.status_code >= 400:
+            print(f"[WARN] [{source.name}] page {page} HTTP {res.status_code}")
+            return "error", [], 0
+        items, total = source.parse(parse_html(res.text, url), url)
+        return ("ok" if total else "end"), items, total
+    return "error", [], 0
+
+
+def backfill_source(
+    source: Source,
+    sink: LinkSink,
+    pacer: HostPacer,
+    max_pages: Optional[int] = None,
+    concurrency: int = CONCURRENCY,
+    cancel: Optional[threading.Event] = None,
+) -> dict:
+    """
+    소스 하나를 커서부터 끝까지(또는 max_pages장) 읽는다. backfill()의 스레드에서 실행.
+    cancel이 set되면 지금 배치까지만 반영하고 남은 링크를 flush + 커서 저장 후 돌아온다 (Ctrl+C).
+    """
+    cursor = load_state().get(source.name) or {"next_page": 1, "done": False, "pages": 0, "articles": 0, "new": 0}
+    if cursor.get("done"):
+        print(f"[INFO] [{source.name}] 이미 목록 끝까지 backfill 완료 (--reset {source.name} 으로 처음부터)")
+        return cursor
+
+    page = int(cursor.get("next_page") or 1)
+    print(f"[INFO] [{source.name}] page {page}부터 backfill 시작")
+
+    started = time.monotonic()
+    run_pages = run_articles = run_new = 0
+    buffer: list = []
+    chunk_pages = chunk_articles = 0
+    stop = False
+
+    def flush():
+        nonlocal buffer, chunk_pages, chunk_articles, run_new
+        added = sink.write(buffer)
+        run_new += added
+        cursor["next_page"] = page
+        cursor["pages"] = int(cursor.get("pages") or 0) + chunk_pages
+        cursor["articles"] = int(cursor.get("articles") or 0) + chunk_articles
+        cursor["new"] = int(cursor.get("new") or 0) + added
+        cursor["updated_at"] = datetime.now().isoformat(timespec="seconds")
+        save_cursor(source.name, cursor)
+        buffer = []
+        chunk_pages = chunk_articles = 0
+
+        elapsed = max(time.monotonic() - started, 1e-6)
+        print(
+            f"[BACKFILL] [{source.name}] next page {page} · {run_pages / elapsed:.2f} pages/s · "
+            f"{run_articles / elapsed:.1f} articles/s · 새 URL {run_new}건"
+        )
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"backfill-{source.name}") as pool:
+        try:
+            while not stop:
+                if cancel is not None and cancel.is_set():
+                    print(f"[INFO] [{source.name}] 중단 → page {page}부터 이어서 가능")
+                    break
+                n = concurrency
+                if max_pages is not None:
+                    n = min(n, max_pages - run_pages)
+                    if n <= 0:
+                        break
+                batch = list(range(page, page + n))
+                results = list(pool.map(lambda p: _fetch_page(source, p, pacer), batch))
+
+                # 앞 페이지부터 순서대로 반영 → 실패한 페이지 이후는 커서를 넘기지 않음
+                for p, (status, items, total) in zip(batch, results):
+                    if status == "end":
+                        print(f"[INFO] [{source.name}] page {p}에서 목록 끝")
+                        cursor["done"] = True
+                        stop = True
+                        break
+                    if status == "error":
+                        print(f"[WARN] [{source.name}] page {p} 실패 → 여기서 멈추고 다음 실행에 이어서")
+                        stop = True
+                        break
+                    buffer.extend(items)
+                    run_pages += 1
+                    run_articles += total
+                    chunk_pages += 1
+                    chunk_articles += total
+                    page = p + 1
+
+                if chunk_pages >= CHUNK_PAGES:
+                    flush()
+        finally:
+            flush()
+
+    return cursor
+
+
+def backfill(sources: List[str], max_pages: Optional[int] = None, concurrency: int = CONCURRENCY, delay: float = DELAY):
+    pacer = HostPacer(delay)
+    sinks: Dict[str, LinkSink] = {}
+    for name in sources:
+        store = SOURCES[name].store
+        if store not in sinks:
+            sinks[store] = LinkSink(store)
+
+    # Ctrl+C(KeyboardInterrupt)는 메인 스레드에만 오므로 여기서 받아 소스 스레드들에 중단을 알리고,
+    # 각자 flush + 커서 저장을 마치고 빠져나온 다음에야 sink(임시 URL DB)를 닫는다
+    cancel = threading.Event()
+    started = time.monotonic()
+    try:
+        with ThreadPoolExecutor(max_workers=len(sources), thread_name_prefix="backfill") as pool:
+            futures = {
+                name: pool.submit(
+                    backfill_source, SOURCES[name], sinks[SOURCES[name].store], pacer, max_pages, concurrency, cancel
+                )
+                for name in sources
+            }
+            try:
+                wait(list(futures.values()))
+            except KeyboardInterrupt:
+                print("\n[INFO] 중단 요청 → 소스별로 받은 링크를 저장하고 멈추는 중...")
+                cancel.set()
+                wait(list(futures.values()))
+            cursors = {name: f.result() for name, f in futures.items()}
+    finally:
+        for sink in sinks.values():
+            sink.seen.close()
+
+    elapsed = time.monotonic() - started
+    print("\n=== backfill 결과 (누적) ===")
+    for name, c in cursors.items():
+        status = "완료" if c.get("done") else f"다음 page {c.get('next_page')}"
+        print(f"  {name:<13} {status:<16} pages {c.get('pages', 0):>6}  articles {c.get('articles', 0):>7}  새 URL {c.get('new', 0):>6}")
+    print(f"  이번 실행 {elapsed:.1f}s")
+    return cursors
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="thebell / newstopkorea / wowtale 과거 기사 링크 backfill")
+    parser.add_argument("--sources", default=",".join(SOURCES), help="쉼표 구분 (기본: 전체)")
+    parser.add_argument("--max-pages", type=int, help="이번 실행에서 소스별로 읽을 최대 페이지 수")
+    parser.add_argument("--concurrency", type=int, default=CONCURRENCY, help="소스별 동시 페이지 요청 수")
+    parser.add_argument("--delay", type=float, default=DELAY, help="같은 호스트 요청 사이 최소 간격(초)")
+    parser.add_argument("--reset", help="커서를 처음으로 되돌릴 소스 (쉼표 구분)")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.sources.split(",") if n.strip()]
+    unknown = [n for n in names if n not in SOURCES]
+    if unknown:
+        raise SystemExit(f"알 수 없는 소스: {', '.join(unknown)} (가능: {', '.join(SOURCES)})")
+
+    if args.reset:
+        for name in [n.strip() for n in args.reset.split(",") if n.strip()]:
+            save_cursor(name, {"next_page": 1, "done": False, "pages": 0, "articles": 0, "new": 0})
+            print(f"[INFO] [{name}] 커서 초기화")
+
+    backfill(names, max_pages=args.max_pages, concurrency=args.concurrency, delay=args.delay)
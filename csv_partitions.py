@@ -0,0 +1,594 @@
+"""
+월 단위 파티션 CSV 저장소 + 마이그레이션/컴팩션 도구.
+
+단일 CSV(lp_news_master_log.csv 등) 대신 아래와 같은 레이아웃을 지원한다.
+
+  lp_news_master_log/
+    manifest.json      ← 파티션별 행 수 / Deal ID 범위 / 헤더
+    2025-12.csv
+    2026-01.csv
+    ...
+
+- 파티션 디렉터리(<csv 이름에서 .csv를 뺀 폴더>/manifest.json)가 있으면 파티션 모드,
+  없으면 기존 단일 CSV를 그대로 읽고 쓴다. (호출하는 쪽 코드는 동일)
+- 새 행은 "기록 시점의 월" 파티션에 append 되므로 Deal ID가 파티션 순서대로 단조 증가하고,
+  최대 Deal ID / 총 행 수는 manifest만 읽어서 알 수 있다.
+- 중복 체크처럼 최근 데이터만 필요한 reader는 recent_months로 최근 N개 파티션만 읽는다.
+
+사용법 (마이그레이션 / 컴팩션):
+  python csv_partitions.py migrate lp_news_master_log.csv lp_news_summaries.csv wowtale_deals.csv
+  python csv_partitions.py compact lp_news_master_log.csv
+  python csv_partitions.py info lp_news_master_log.csv
+"""
+import os
+import re
+import csv
+import json
+import argparse
+from datetime import datetime
+from typing import Callable, Dict, Iterator, List, Optional
+
+import tracing
+
+MANIFEST_NAME = "manifest.json"
+ID_FIELD = "Deal ID"
+
+# 중복 체크용 reader가 읽을 최근 파티션 개수 (0/미설정이면 전체)
+DEDUP_MONTHS = int(os.environ.get("CSV_DEDUP_MONTHS") or 0) or None
+
+# 한 프로세스에서 여러 단계(run_pipeline.py)가 같은 CSV를 읽을 때 재사용하는 전체 행 캐시.
+# 파일(또는 manifest)의 mtime/size가 바뀌면 다시 읽고, append_rows로 쓴 행은 캐시에도 바로 붙인다.
+_ROW_CACHE: Dict[str, tuple] = {}
+
+# 마이그레이션 시 기존 파일의 "정식" 헤더/인코딩/날짜 컬럼.
+# 기존 파일은 헤더(6~12컬럼)보다 긴 행(8~14컬럼)이 섞여 있어서 헤더만 믿으면 컬럼이 유실된다.
+KNOWN_LAYOUTS: Dict[str, dict] = {
+    "lp_news_master_log.csv": {
+        "fieldnames": [
+            "Deal ID",
+            "기사 제목",
+            "기사 작성일",
+            "url",
+            "is_fundraising",
+            "status",
+            "Source ID",
+            "raw_url",
+        ],
+        "encoding": "utf-8-sig",
+        "date_fields": ["기사 작성일"],
+    },
+    "lp_news_summaries.csv": {
+        "fieldnames": [
+            "Deal ID",
+            "기사 제목",
+            "기사 작성일",
+            "LP",
+            "운용사",
+            "펀드명",
+            "펀드규모",
+            "펀드유형",
+            "투자섹터",
+            "조성상태",
+            "요약",
+            "url",
+            "Source ID",
+            "raw_url",
+            "펀드규모 값",
+            "펀드규모 통화",
+            "펀드규모 원화환산",
+            "펀드규모 구분",
+        ],
+        "encoding": "utf-8-sig",
+        "date_fields": ["기사 작성일"],
+    },
+    "wowtale_deals.csv": {
+        "fieldnames": [
+            "Deal ID",
+            "투자 받는 회사 (Target / Startup)",
+            "투자사 (Investor)",
+            "투자 금액",
+            "라운드",
+            "사업 섹터",
+            "주요 사업부문",
+            "기사 날짜",
+            "기사 출처",
+            "비고",
+            "기사 링크",
+            "투자 금액 값",
+            "투자 금액 통화",
+            "투자 금액 원화환산",
+            "투자 금액 구분",
+        ],
+        "encoding": "utf-8",
+        "date_fields": ["기사 날짜"],
+    },
+}
+
+
+# ------------------------
+# 경로 / manifest
+# ------------------------
+
+def partition_dir(csv_path: str) -> str:
+    """lp_news_master_log.csv → lp_news_master_log/"""
+    return os.path.splitext(csv_path)[0]
+
+
+def manifest_path(csv_path: str) -> str:
+    return os.path.join(partition_dir(csv_path), MANIFEST_NAME)
+
+
+def is_partitioned(csv_path: str) -> bool:
+    return os.path.exists(manifest_path(csv_path))
+
+
+def exists(csv_path: str) -> bool:
+    """단일 파일 또는 파티션 레이아웃 중 하나라도 있으면 True."""
+    return is_partitioned(csv_path) or os.path.exists(csv_path)
+
+
+def load_manifest(csv_path: str) -> Optional[dict]:
+    path = manifest_path(csv_path)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_manifest(csv_path: str, manifest: dict):
+    """manifest.json을 임시 파일에 쓰고 rename (중간에 죽어도 깨진 manifest가 남지 않게)."""
+    path = manifest_path(csv_path)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(tmp, path)
+
+
+def _partition_file(csv_path: str, key: str) -> str:
+    return os.path.join(partition_dir(csv_path), f"{key}.csv")
+
+
+def current_partition_key() -> str:
+    return datetime.now().strftime("%Y-%m")
+
+
+def _parse_id(value) -> Optional[int]:
+    if value is None:
+        return None
+    try:
+        return int(float(str(value).strip()))
+    except ValueError:
+        return None
+
+
+def _update_stats(stats: dict, row: dict):
+    stats["rows"] = stats.get("rows", 0) + 1
+    n = _parse_id(row.get(ID_FIELD) or row.get("deal_number"))
+    if n is None:
+        return
+    if stats.get("min_id") is None or n < stats["min_id"]:
+        stats["min_id"] = n
+    if stats.get("max_id") is None or n > stats["max_id"]:
+        stats["max_id"] = n
+
+
+# ------------------------
+# Reader
+# ------------------------
+
+def selected_partitions(csv_path: str, recent_months: Optional[int] = None) -> List[str]:
+    """읽어야 할 파티션 키 목록 (오래된 순). recent_months가 있으면 최근 N개만."""
+    manifest = load_manifest(csv_path) or {}
+    keys = sorted((manifest.get("partitions") or {}).keys())
+    if recent_months:
+        keys = keys[-recent_months:]
+    return keys
+
+
+def _signature(csv_path: str):
+    path = manifest_path(csv_path) if is_partitioned(csv_path) else csv_path
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (path, st.st_mtime_ns, st.st_size)
+
+
+def iter_rows(csv_path: str, recent_months: Optional[int] = None, encoding: str = "utf-8-sig",
+              cache: bool = True) -> Iterator[dict]:
+    """
+    CSV 행을 dict로 순회.
+    - 파티션 모드: manifest에 등록된 파티션 중 필요한 것만 순서대로 읽음
+    - 단일 파일 모드: 기존처럼 파일 전체를 읽음 (recent_months 무시)
+    전체를 읽는 경우는 프로세스 내 캐시를 거친다 (cache=False면 캐시 없이 한 행씩 흘려 읽음).
+    """
+    if (recent_months and is_partitioned(csv_path)) or not cache:
+        yield from _iter_rows_uncached(csv_path, recent_months, encoding)
+        return
+
+    key = os.path.abspath(csv_path)
+    sig = _signature(csv_path)
+    cached = _ROW_CACHE.get(key)
+    if cached is None or cached[0] != sig:
+        rows = list(_iter_rows_uncached(csv_path, None, encoding))
+        cached = (sig, rows)
+        if sig is not None:
+            _ROW_CACHE[key] = cached
+    yield from cached[1]
+
+
+def _iter_rows_uncached(csv_path: str, recent_months: Optional[int], encoding: str) -> Iterator[dict]:
+    if is_partitioned(csv_path):
+        for key in selected_partitions(csv_path, recent_months):
+            path = _partition_file(csv_path, key)
+            if not os.path.exists(path):
+                print(f"[WARN] manifest에 있는 파티션 파일이 없음: {path}")
+                continue
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                for row in csv.DictReader(f):
+                    yield row
+        return
+
+    if not os.path.exists(csv_path):
+        return
+    # 헤더보다 긴 예전 행(나중에 컬럼이 추가된 append)은 정식 헤더 순서로 다시 매핑 (_read_legacy_rows와 같은 규칙)
+    fieldnames = KNOWN_LAYOUTS.get(os.path.basename(csv_path), {}).get("fieldnames")
+    with open(csv_path, newline="", encoding=encoding) as f:
+        reader = csv.DictReader(f)
+        for row in reader:
+            extra = row.pop(None, None)
+            if extra and fieldnames:
+                values = [row[name] for name in reader.fieldnames] + extra
+                row = {name: "" for name in fieldnames}
+                row.update(zip(fieldnames, values))
+            yield row
+
+
+def read_rows(csv_path: str, recent_months: Optional[int] = None, encoding: str = "utf-8-sig") -> List[dict]:
+    return list(iter_rows(csv_path, recent_months=recent_months, encoding=encoding))
+
+
+def max_id(csv_path: str, encoding: str = "utf-8-sig") -> int:
+    """최대 Deal ID. 파티션 모드에서는 manifest만 읽는다."""
+    manifest = load_manifest(csv_path)
+    if manifest is not None:
+        ids = [p.get("max_id") for p in (manifest.get("partitions") or {}).values()]
+        ids = [i for i in ids if i is not None]
+        return max(ids) if ids else 0
+
+    last = 0
+    for row in iter_rows(csv_path, encoding=encoding):
+        n = _parse_id(row.get(ID_FIELD) or row.get("deal_number") or row.get("deal_id"))
+        if n is not None and n > last:
+            last = n
+    return last
+
+
+def row_count(csv_path: str, encoding: str = "utf-8-sig") -> int:
+    """총 행 수. 파티션 모드에서는 manifest만 읽는다."""
+    manifest = load_manifest(csv_path)
+    if manifest is not None:
+        return sum(p.get("rows", 0) for p in (manifest.get("partitions") or {}).values())
+    return sum(1 for _ in iter_rows(csv_path, encoding=encoding))
+
+
+# ------------------------
+# Writer
+# ------------------------
+
+def ensure_header(csv_path: str, fieldnames: List[str], encoding: str = "utf-8-sig"):
+    """단일 파일 모드에서 파일이 없으면 헤더만 만든다. 파티션 모드에서는 할 일 없음."""
+    if exists(csv_path):
+        return
+    with open(csv_path, "w", newline="", encoding=encoding) as f:
+        csv.DictWriter(f, fieldnames=fieldnames).writeheader()
+
+
+def ensure_columns(csv_path: str, fieldnames: List[str], encoding: str = "utf-8-sig"):
+    """
+    append할 파일(단일 파일 / 이번 달 파티션)의 헤더에 없는 컬럼이 있으면 헤더 끝에 붙여 다시 쓴다.
+    기존 행의 새 컬럼은 빈 값. (지난 달 파티션은 각자 헤더로 읽히므로 그대로 둔다.)
+    """
+    partitioned = is_partitioned(csv_path)
+    path = _partition_file(csv_path, current_partition_key()) if partitioned else csv_path
+    if partitioned:
+        encoding = "utf-8-sig"
+    if not os.path.exists(path):
+        return
+    with open(path, newline="", encoding=encoding) as f:
+        reader = csv.DictReader(f)
+        header = list(reader.fieldnames or [])
+        missing = [name for name in fieldnames if name not in header]
+        if not missing:
+            return
+        rows = list(reader)
+    if not partitioned and os.path.basename(csv_path) in KNOWN_LAYOUTS:
+        # 헤더보다 긴 예전 행이 섞인 파일 → 정식 헤더 기준으로 다시 써야 값이 안 밀린다
+        rewrite_rows(csv_path, lambda row: None, missing, encoding=encoding)
+        print(f"[INFO] {path} 헤더에 컬럼 추가: {', '.join(missing)}")
+        return
+
+    tmp = path + ".tmp"
+    with open(tmp, "w", newline="", encoding=encoding) as f:
+        writer = csv.DictWriter(f, fieldnames=header + missing, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+    os.replace(tmp, path)
+    _ROW_CACHE.pop(os.path.abspath(csv_path), None)
+    print(f"[INFO] {path} 헤더에 컬럼 추가: {', '.join(missing)}")
+
+
+def rewrite_rows(csv_path: str, update: Callable[[dict], None], add_fields: List[str], encoding: str = "utf-8-sig") -> int:
+    """
+    전체 행을 읽어 update(row)로 고친 뒤 다시 쓴다 (헤더 끝에 add_fields가 없으면 추가). 컬럼 backfill용.
+    단일 파일은 KNOWN_LAYOUTS 정식 헤더로 읽으므로 헤더보다 긴 예전 행도 제 컬럼으로 정리된다.
+    """
+    if is_partitioned(csv_path):
+        manifest = load_manifest(csv_path) or {}
+        fieldnames = list(manifest.get("fieldnames") or [])
+        count = 0
+        for key in sorted(manifest.get("partitions") or {}):
+            path = _partition_file(csv_path, key)
+            if not os.path.exists(path):
+                continue
+            with open(path, newline="", encoding="utf-8-sig") as f:
+                reader = csv.DictReader(f)
+                header = list(reader.fieldnames or [])
+                rows = list(reader)
+            header += [name for name in add_fields if name not in header]
+            for row in rows:
+                update(row)
+            tmp = path + ".tmp"
+            with open(tmp, "w", newline="", encoding="utf-8-sig") as f:
+                writer = csv.DictWriter(f, fieldnames=header, extrasaction="ignore")
+                writer.writeheader()
+                writer.writerows(rows)
+            os.replace(tmp, path)
+            count += len(rows)
+        manifest["fieldnames"] = fieldnames + [name for name in add_fields if name not in fieldnames]
+        save_manifest(csv_path, manifest)
+    else:
+        if not os.path.exists(csv_path):
+            return 0
+        with open(csv_path, newline="", encoding=encoding) as f:
+            header = [h.lstrip("\ufeff") for h in (next(csv.reader(f), None) or [])]
+        layout = KNOWN_LAYOUTS.get(os.path.basename(csv_path), {})
+        fieldnames = list(layout.get("fieldnames") or header)
+        fieldnames += [name for name in header + add_fields if name not in fieldnames]
+        rows = _read_legacy_rows(csv_path, fieldnames, encoding)
+        for row in rows:
+            update(row)
+        tmp = csv_path + ".tmp"
+        with open(tmp, "w", newline="", encoding=encoding) as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+            writer.writeheader()
+            writer.writerows(rows)
+        os.replace(tmp, csv_path)
+        count = len(rows)
+
+    _ROW_CACHE.pop(os.path.abspath(csv_path), None)
+    return count
+
+
+def append_rows(csv_path: str, rows: List[dict], fieldnames: List[str], encoding: str = "utf-8-sig"):
+    """
+    행 append.
+    - 파티션 모드: 이번 달 파티션 파일에 쓰고 manifest 통계 갱신
+    - 단일 파일 모드: 기존 동작 그대로 (없으면 헤더 포함 생성)
+    """
+    if not rows:
+        return
+
+    key = os.path.abspath(csv_path)
+    cached = _ROW_CACHE.get(key)
+    if cached is not None and cached[0] != _signature(csv_path):
+        cached = None
+
+    with tracing.span("csv.write", path=csv_path, rows=len(rows)):
+        _append_rows_to_disk(csv_path, rows, fieldnames, encoding)
+
+    # 캐시가 최신이었다면 방금 쓴 행을 CSV에서 읽은 것과 같은 모양(문자열)으로 붙임
+    if cached is None:
+        _ROW_CACHE.pop(key, None)
+        return
+    for r in rows:
+        cached[1].append({f: "" if r.get(f) is None else str(r.get(f)) for f in fieldnames})
+    _ROW_CACHE[key] = (_signature(csv_path), cached[1])
+
+
+def _append_rows_to_disk(csv_path: str, rows: List[dict], fieldnames: List[str], encoding: str):
+    if not is_partitioned(csv_path):
+        file_exists = os.path.exists(csv_path)
+        with open(csv_path, "a", newline="", encoding=encoding) as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames)
+            if not file_exists:
+                writer.writeheader()
+            for r in rows:
+                writer.writerow(r)
+        return
+
+    manifest = load_manifest(csv_path) or {}
+    partitions = manifest.setdefault("partitions", {})
+    key = current_partition_key()
+    path = _partition_file(csv_path, key)
+    file_exists = os.path.exists(path)
+
+    with open(path, "a", newline="", encoding="utf-8-sig") as f:
+        writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+        if not file_exists:
+            writer.writeheader()
+        stats = partitions.setdefault(key, {"file": os.path.basename(path), "rows": 0, "min_id": None, "max_id": None})
+        for r in rows:
+            writer.writerow(r)
+            _update_stats(stats, r)
+
+    manifest["fieldnames"] = fieldnames
+    save_manifest(csv_path, manifest)
+
+
+# ------------------------
+# 마이그레이션 / 컴팩션
+# ------------------------
+
+_DATE_RE = re.compile(r"(20\d{2})[.\-/년\s]+(\d{1,2})")
+_THEBELL_KEY_RE = re.compile(r"[?&]key=(20\d{2})(\d{2})")
+_WOWTALE_PATH_RE = re.compile(r"wowtale\.net/(20\d{2})/(\d{2})/")
+
+
+def _guess_month(row: dict, date_fields: List[str]) -> Optional[str]:
+    """행에서 YYYY-MM 추정: 날짜 컬럼 → thebell key → wowtale URL 경로 순."""
+    for field in date_fields:
+        m = _DATE_RE.search(row.get(field) or "")
+        if m:
+            return f"{m.group(1)}-{int(m.group(2)):02d}"
+    for field in ("raw_url", "url", "기사 링크"):
+        value = row.get(field) or ""
+        m = _THEBELL_KEY_RE.search(value) or _WOWTALE_PATH_RE.search(value)
+        if m:
+            return f"{m.group(1)}-{m.group(2)}"
+    return None
+
+
+def _read_legacy_rows(csv_path: str, fieldnames: List[str], encoding: str) -> List[dict]:
+    """
+    단일 CSV를 정식 헤더 기준으로 읽는다.
+    헤더보다 긴 행(나중에 컬럼이 추가된 append)은 정식 헤더 순서로 매핑한다.
+    """
+    rows: List[dict] = []
+    with open(csv_path, newline="", encoding=encoding) as f:
+        reader = csv.reader(f)
+        header = next(reader, None) or []
+        header = [h.lstrip("\ufeff") for h in header]
+        for values in reader:
+            if not values:
+                continue
+            names = header if len(values) <= len(header) else fieldnames
+            row = {name: "" for name in fieldnames}
+            for name, value in zip(names, values):
+                row[name] = value
+            rows.append(row)
+    return rows
+
+
+def assign_partitions(rows: List[dict], date_fields: List[str]) -> List[str]:
+    """
+    행 순서(=append 순서)를 유지하면서 각 행의 파티션 키를 정한다.
+    추정 월이 이전 행보다 과거면 이전 행 파티션을 따라가게 해서(단조 증가),
+    파티션별 Deal ID 범위가 서로 겹치지 않게 한다.
+    """
+    guesses = [_guess_month(r, date_fields) for r in rows]
+    first = next((g for g in guesses if g), current_partition_key())
+
+    keys: List[str] = []
+    prev = first
+    for g in guesses:
+        if g and g > prev:
+            prev = g
+        keys.append(prev)
+    return keys
+
+
+def _write_partitions(csv_path: str, rows: List[dict], keys: List[str], fieldnames: List[str]) -> dict:
+    os.makedirs(partition_dir(csv_path), exist_ok=True)
+    grouped: Dict[str, List[dict]] = {}
+    for key, row in zip(keys, rows):
+        grouped.setdefault(key, []).append(row)
+
+    partitions: Dict[str, dict] = {}
+    for key in sorted(grouped):
+        path = _partition_file(csv_path, key)
+        tmp = path + ".tmp"
+        stats = {"file": os.path.basename(path), "rows": 0, "min_id": None, "max_id": None}
+        with open(tmp, "w", newline="", encoding="utf-8-sig") as f:
+            writer = csv.DictWriter(f, fieldnames=fieldnames, extrasaction="ignore")
+            writer.writeheader()
+            for row in grouped[key]:
+                writer.writerow(row)
+                _update_stats(stats, row)
+        os.replace(tmp, path)
+        partitions[key] = stats
+
+    manifest = {"fieldnames": fieldnames, "id_field": ID_FIELD, "partitions": partitions}
+    save_manifest(csv_path, manifest)
+    return manifest
+
+
+def migrate(csv_path: str, keep_source: bool = False) -> dict:
+    """단일 CSV → 월 파티션 레이아웃으로 변환."""
+    if is_partitioned(csv_path):
+        raise RuntimeError(f"이미 파티션 레이아웃입니다: {partition_dir(csv_path)}")
+    if not os.path.exists(csv_path):
+        raise FileNotFoundError(f"CSV 파일을 찾을 수 없습니다: {csv_path}")
+
+    layout = KNOWN_LAYOUTS.get(os.path.basename(csv_path), {})
+    encoding = layout.get("encoding", "utf-8-sig")
+    fieldnames = layout.get("fieldnames")
+    if not fieldnames:
+        with open(csv_path, newline="", encoding=encoding) as f:
+            fieldnames = [h.lstrip("\ufeff") for h in (next(csv.reader(f), None) or [])]
+
+    rows = _read_legacy_rows(csv_path, fieldnames, encoding)
+    keys = assign_partitions(rows, layout.get("date_fields", []))
+    manifest = _write_partitions(csv_path, rows, keys, fieldnames)
+
+    if not keep_source:
+        os.remove(csv_path)
+    return manifest
+
+
+def compact(csv_path: str) -> dict:
+    """
+    파티션 파일을 다시 써서 헤더를 manifest의 fieldnames로 통일하고,
+    파일 기준으로 manifest 통계를 다시 계산한다. (manifest에 없는 파티션 파일도 편입)
+    """
+    if not is_partitioned(csv_path):
+        raise RuntimeError(f"파티션 레이아웃이 아닙니다: {csv_path} (먼저 migrate 실행)")
+
+    manifest = load_manifest(csv_path) or {}
+    fieldnames = list(manifest.get("fieldnames") or [])
+
+    pdir = partition_dir(csv_path)
+    files = sorted(f for f in os.listdir(pdir) if re.fullmatch(r"\d{4}-\d{2}\.csv", f))
+
+    rows: List[dict] = []
+    keys: List[str] = []
+    for name in files:
+        with open(os.path.join(pdir, name), newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            for h in reader.fieldnames or []:
+                if h not in fieldnames:
+                    fieldnames.append(h)
+            for row in reader:
+                rows.append(row)
+                keys.append(name[:-4])
+
+    return _write_partitions(csv_path, rows, keys, fieldnames)
+
+
+def _print_info(csv_path: str):
+    manifest = load_manifest(csv_path)
+    if manifest is None:
+        print(f"[INFO] {csv_path}: 단일 파일 레이아웃 (행 {row_count(csv_path)}개)")
+        return
+    print(f"[INFO] {partition_dir(csv_path)}: 파티션 {len(manifest.get('partitions') or {})}개")
+    for key, p in sorted((manifest.get("partitions") or {}).items()):
+        print(f"  {key}: rows={p.get('rows')} Deal ID {p.get('min_id')}~{p.get('max_id')}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="월 단위 파티션 CSV 마이그레이션/컴팩션 도구")
+    parser.add_argument("command", choices=["migrate", "compact", "info"])
+    parser.add_argument("csv_paths", nargs="+")
+    parser.add_argument("--keep-source", action="store_true", help="migrate 후 원본 단일 CSV를 지우지 않음")
+    args = parser.parse_args()
+
+    for path in args.csv_paths:
+        if args.command == "migrate":
+            m = migrate(path, keep_source=args.keep_source)
+            print(f"[INFO] {path} → {partition_dir(path)}/ (파티션 {len(m['partitions'])}개)")
+        elif args.command == "compact":
+            m = compact(path)
+            print(f"[INFO] {partition_dir(path)}/ 컴팩션 완료 (파티션 {len(m['partitions'])}개)")
+        _print_info(path)
@@ -0,0 +1,570 @@
+"""
+딜 / 펀드 데이터셋 조회 CLI + 보조 인덱스 (SQLite).
+
+wowtale_deals.csv / lp_news_summaries.csv에 "2025년 이후 KVIC가 LP로 들어간 세컨더리 펀드" 같은 질문을 하려면
+스프레드시트로 열어 필터를 걸어야 했다. 조회용 컬럼을 정규화해 deal_index.db에 색인하고,
+필터 조합을 SQL 인덱스로 푼다 (질의마다 CSV 전체를 읽지 않음).
+
+  deals  (dataset, deal_id) → 날짜(YYYY-MM-DD) / 금액 원화환산 / 라운드 키 / 조성상태 키 / 원본 행(JSON)
+         (dataset, date), (date), (dataset, amount_krw), (dataset, round, date), (dataset, status, date) 인덱스
+  facets (kind, value, date, dataset, deal_id) — 값이 여러 개인 컬럼, 값마다 최신 날짜 순으로 바로 읽힘
+         sector: 사업 섹터 / 투자섹터, investor / lp / gp: entity_index의 대표 이름
+섹터/투자사/LP/운용사 필터가 있으면 그중 가장 드문 값의 facets 범위에서 출발해 나머지 조건을 행마다 확인하고,
+없으면 deals 인덱스(날짜 / 금액 / 라운드 / 조성상태) 중 SQLite 플래너가 고른다.
+
+append_summary / append_summaries가 행을 쓸 때 index_rows로 같이 색인하고 (매 실행 증분),
+인덱스가 없거나 빠진 행은 `sync`로 채운다.
+
+  python deal_query.py sync
+  python deal_query.py query --lp KVIC --from 2025-01 --status 신규결성
+  python deal_query.py query --sector "Biotech & Healthcare" --round "시리즈 B" --min-amount 100억 --format csv
+  python deal_query.py query --investor "Altos Ventures" --format json
+  python deal_query.py values round            # 필터에 쓸 수 있는 값 + 건수
+  python deal_query.py bench --rows 1000000    # 합성 100만 행 색인/조회 벤치마크
+
+필터 값 정규화
+  - 라운드: 공백/대소문자 무시, 시리즈/프리/시드 한글 표기를 영문과 같게 ("시리즈 B" = "Series B")
+  - 섹터 / 조성상태: 공백/대소문자 무시 정확히 일치
+  - 투자사 / LP / 운용사: entity_index로 대표 이름 해석 ("KVIC" = "한국벤처투자")
+  - 금액: amount_normalizer로 해석한 원화 기준 ("100억", "5M USD", 숫자)
+  - 날짜: "2025", "2025-03", "2025.03.02" (행 날짜가 없으면 thebell key / wowtale URL 경로의 날짜)
+투자사/라운드는 wowtale, LP/운용사/조성상태는 lp_news에만 있는 필터라 --dataset을 안 주면 필터로 정한다.
+
+환경 변수
+  - DEAL_INDEX_DB : 인덱스 파일 경로 (기본 deal_index.db)
+"""
+import os
+import re
+import csv
+import sys
+import json
+import time
+import random
+import sqlite3
+import argparse
+import threading
+from typing import Dict, Iterable, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import amount_normalizer
+import article_metadata
+import csv_partitions
+import entity_index
+import tracing
+
+DEAL_INDEX_DB = os.environ.get("DEAL_INDEX_DB") or "deal_index.db"
+
+DATASETS = {
+    "wowtale": {
+        "csv": "wowtale_deals.csv",
+        "encoding": "utf-8",
+        "date": "기사 날짜",
+        "url": "기사 링크",
+        "amount": "투자 금액 원화환산",
+        "round": "라운드",
+        "status": None,
+        "sector": "사업 섹터",
+        "names": {"investor": "투자사 (Investor)"},
+        "label": "투자 받는 회사 (Target / Startup)",
+    },
+    "lp_news": {
+        "csv": "lp_news_summaries.csv",
+        "encoding": "utf-8-sig",
+        "date": "기사 작성일",
+        "url": "url",
+        "amount": "펀드규모 원화환산",
+        "round": None,
+        "status": "조성상태",
+        "sector": "투자섹터",
+        "names": {"lp": "LP", "gp": "운용사"},
+        "label": "기사 제목",
+    },
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS deals (
+    dataset TEXT NOT NULL,
+    deal_id INTEGER NOT NULL,
+    date TEXT,
+    amount_krw REAL,
+    round TEXT,
+    status TEXT,
+    row TEXT NOT NULL,
+    PRIMARY KEY (dataset, deal_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS deals_date ON deals (dataset, date);
+CREATE INDEX IF NOT EXISTS deals_recent ON deals (date, dataset, deal_id);
+CREATE INDEX IF NOT EXISTS deals_amount ON deals (dataset, amount_krw);
+CREATE INDEX IF NOT EXISTS deals_round ON deals (dataset, round, date);
+CREATE INDEX IF NOT EXISTS deals_status ON deals (dataset, status, date);
+CREATE TABLE IF NOT EXISTS facets (
+    kind TEXT NOT NULL,
+    value TEXT NOT NULL,
+    date TEXT NOT NULL,
+    dataset TEXT NOT NULL,
+    deal_id INTEGER NOT NULL,
+    PRIMARY KEY (kind, value, date, dataset, deal_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS facets_deal ON facets (dataset, deal_id);
+"""
+
+_lock = threading.Lock()
+_write_lock = threading.Lock()  # wowtale / LP 체인이 동시에 쓰므로 쓰기는 한 번에 하나
+stats = {"indexed": 0, "queries": 0, "query_s": 0.0}
+
+
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    conn = sqlite3.connect(path or DEAL_INDEX_DB)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+# ------------------------
+# 값 정규화
+# ------------------------
+
+_ROUND_WORDS = [("시리즈", "series"), ("프리", "pre"), ("시드", "seed"), ("브릿지", "bridge"), ("엔젤", "angel")]
+
+
+def value_key(value: str) -> str:
+    """섹터 / 조성상태 비교 키: 공백 제거 + 소문자."""
+    return re.sub(r"\s+", "", value or "").lower()
+
+
+def round_key(value: str) -> str:
+    """'시리즈 B' / 'Series B' / '시리즈B' → 'seriesb', '프리IPO' → 'preipo'."""
+    key = value_key(value)
+    for korean, english in _ROUND_WORDS:
+        key = key.replace(korean, english)
+    return key.replace("-", "")
+
+
+def split_values(text: str) -> List[str]:
+    return [v.strip() for v in (text or "").split(",") if v.strip()]
+
+
+def row_date(row: dict, spec: dict) -> Optional[str]:
+    """행 날짜 'YYYY-MM-DD': 날짜 컬럼 → thebell key → wowtale URL 경로 (없으면 None)."""
+    date = article_metadata.normalize_date(row.get(spec["date"]) or "")
+    if date:
+        return date
+    for field in (spec["url"], "raw_url"):
+        url = row.get(field) or ""
+        key = (parse_qs(urlparse(url).query).get("key") or [""])[0]
+        m = article_metadata._THEBELL_KEY_RE.match(key) or article_metadata._WOWTALE_PATH_RE.search(url)
+        if m:
+            return "-".join(m.groups())
+    return None
+
+
+def date_bound(value: str, end: bool) -> str:
+    """'2025' / '2025-03' / '2025.03.02' → 범위 경계 (end면 그 기간의 마지막 날까지 포함)."""
+    full = article_metadata.normalize_date(value)
+    if full:
+        return full
+    m = re.fullmatch(r"(20\d{2})(?:[.\-/](\d{1,2}))?", (value or "").strip())
+    if not m:
+        raise ValueError(f"날짜 형식을 읽을 수 없음: {value}")
+    prefix = m.group(1) + (f"-{int(m.group(2)):02d}" if m.group(2) else "")
+    return prefix + ("-99" if end else "")  # 문자열 비교라 'YYYY-MM-99'는 그 달 모든 날짜보다 큼
+
+
+def amount_bound(value: str) -> float:
+    """'100억' / '5M USD' / '10000000000' → 원화 금액."""
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    amount = amount_normalizer.parse_amount(value)
+    if amount is None or amount.krw is None:
+        raise ValueError(f"금액을 읽을 수 없음: {value}")
+    return amount.krw
+
+
+def _column_key(row: dict, column: Optional[str], key_fn) -> Optional[str]:
+    return (key_fn(row.get(column) or "") or None) if column else None
+
+
+def _float(value) -> Optional[float]:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+# ------------------------
+# 색인
+# ------------------------
+
+def _index_row(conn: sqlite3.Connection, dataset: str, row: dict, entities: entity_index.EntityIndex,
+               replace: bool = True) -> bool:
+    spec = DATASETS[dataset]
+    deal_id = csv_partitions._parse_id(row.get("Deal ID"))
+    if deal_id is None:
+        return False
+    if replace and conn.execute("SELECT 1 FROM deals WHERE dataset = ? AND deal_id = ?", (dataset, deal_id)).fetchone():
+        conn.execute("DELETE FROM facets WHERE dataset = ? AND deal_id = ?", (dataset, deal_id))
+    date = row_date(row, spec)
+    conn.execute(
+        "INSERT OR REPLACE INTO deals (dataset, deal_id, date, amount_krw, round, status, row) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (
+            dataset,
+            deal_id,
+            date,
+            _float(row.get(spec["amount"])),
+            _column_key(row, spec["round"], round_key),
+            _column_key(row, spec["status"], value_key),
+            json.dumps(row, ensure_ascii=False),
+        ),
+    )
+    facets = {("sector", value_key(v)) for v in split_values(row.get(spec["sector"]))}
+    for kind, column in spec["names"].items():
+        for name in entity_index.split_names(row.get(column) or ""):
+            canonical = entities.resolve(name)
+            if canonical:
+                facets.add((kind, canonical))
+    conn.executemany(
+        "INSERT OR IGNORE INTO facets (kind, value, date, dataset, deal_id) VALUES (?, ?, ?, ?, ?)",
+        [(kind, value, date or "", dataset, deal_id) for kind, value in facets if value],
+    )
+    return True
+
+
+def index_rows(dataset: str, rows: Iterable[dict], path: Optional[str] = None,
+               entities: Optional[entity_index.EntityIndex] = None) -> int:
+    """요약 CSV에 방금 쓴 행들을 색인 (append_summary / append_summaries에서 호출). 반환: 색인한 행 수."""
+    entities = entities or entity_index.default_index()
+    count = 0
+    with tracing.span("deal_index.write", dataset=dataset):
+        with _write_lock:
+            conn = connect(path)
+            try:
+                with conn:
+                    for row in rows:
+                        count += _index_row(conn, dataset, row, entities)
+            finally:
+                conn.close()
+    with _lock:
+        stats["indexed"] += count
+    return count
+
+
+def sync(datasets: Optional[List[str]] = None, path: Optional[str] = None) -> Dict[str, int]:
+    """요약 CSV에서 아직 색인 안 된 행 추가 (Deal ID 기준)."""
+    entities = entity_index.default_index()
+    added = {}
+    with _write_lock:
+        conn = connect(path)
+        try:
+            for dataset in datasets or list(DATASETS):
+                spec = DATASETS[dataset]
+                if not csv_partitions.exists(spec["csv"]):
+                    continue
+                known = {r[0] for r in conn.execute("SELECT deal_id FROM deals WHERE dataset = ?", (dataset,))}
+                count = 0
+                with conn:
+                    for row in csv_partitions.iter_rows(spec["csv"], encoding=spec["encoding"]):
+                        deal_id = csv_partitions._parse_id(row.get("Deal ID"))
+                        if deal_id is not None and deal_id not in known:
+                            count += _index_row(conn, dataset, row, entities, replace=False)
+                            known.add(deal_id)
+                added[dataset] = count
+            if any(added.values()):
+                conn.execute("ANALYZE")  # 필터 조합별로 어떤 인덱스를 먼저 쓸지 플래너가 고르도록 통계 갱신
+        finally:
+            conn.close()
+    with _lock:
+        stats["indexed"] += sum(added.values())
+    return added
+
+
+# ------------------------
+# 조회
+# ------------------------
+
+# 여러 facet 필터 중 출발점을 고를 때 값별 행 수를 이만큼까지만 센다
+FACET_COUNT_CAP = 10000
+
+# 필터 → 그 필터가 있는 데이터셋
+_FILTER_DATASETS = {"investor": "wowtale", "round": "wowtale", "lp": "lp_news", "gp": "lp_news", "status": "lp_news"}
+
+
+def _datasets_for(filters: dict, dataset: Optional[str]) -> List[str]:
+    needed = {_FILTER_DATASETS[k] for k, v in filters.items() if v and k in _FILTER_DATASETS}
+    if dataset:
+        extra = needed - {dataset}
+        if extra:
+            raise ValueError(f"{dataset}에 없는 필터: " + ", ".join(k for k in filters if _FILTER_DATASETS.get(k) in extra and filters[k]))
+        return [dataset]
+    if len(needed) > 1:
+        raise ValueError("투자사/라운드(wowtale)와 LP/운용사/조성상태(lp_news) 필터는 같이 쓸 수 없음")
+    return sorted(needed) or list(DATASETS)
+
+
+def query(
+    dataset: Optional[str] = None,
+    sector: Optional[str] = None,
+    round: Optional[str] = None,
+    date_from: Optional[str] = None,
+    date_to: Optional[str] = None,
+    min_amount: Optional[str] = None,
+    max_amount: Optional[str] = None,
+    investor: Optional[str] = None,
+    lp: Optional[str] = None,
+    gp: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: Optional[int] = 100,
+    path: Optional[str] = None,
+    conn: Optional[sqlite3.Connection] = None,
+) -> List[dict]:
+    """필터 조합 → 요약 CSV 행 리스트 (최신 날짜 순, 각 행에 dataset 키 추가). 필터 값이 잘못되면 ValueError."""
+    filters = {"investor": investor, "round": round, "lp": lp, "gp": gp, "status": status}
+    datasets = _datasets_for(filters, dataset)
+    low = date_bound(date_from, end=False) if date_from else None
+    high = date_bound(date_to, end=True) if date_to else None
+
+    where = [f"d.dataset IN ({', '.join('?' * len(datasets))})"]
+    params: list = list(datasets)
+    for clause, value in (
+        ("d.date >= ?", low),
+        ("d.date <= ?", high),
+        ("d.amount_krw >= ?", amount_bound(min_amount) if min_amount else None),
+        ("d.amount_krw <= ?", amount_bound(max_amount) if max_amount else None),
+        ("d.round = ?", round_key(round) if round else None),
+        ("d.status = ?", value_key(status) if status else None),
+    ):
+        if value is not None:
+            where.append(clause)
+            params.append(value)
+
+    facets = [("sector", value_key(sector))] if sector else []
+    entities = entity_index.default_index()
+    for kind, name in (("investor", investor), ("lp", lp), ("gp", gp)):
+        if name:
+            facets.append((kind, entities.lookup(name) or name.strip()))
+
+    own = conn is None
+    conn = conn or connect(path)
+    started = time.perf_counter()
+    try:
+        drive = _driving_facet(conn, facets)
+        for kind, value in facets:
+            if (kind, value) != drive:
+                where.append(
+                    "EXISTS (SELECT 1 FROM facets o WHERE o.kind = ? AND o.value = ?"
+                    " AND o.dataset = d.dataset AND o.deal_id = d.deal_id)"
+                )
+                params += [kind, value]
+        if drive is None:
+            # facet 필터 없음: 플래너가 날짜/금액/라운드/조성상태 인덱스 중 고름
+            sql = f"SELECT d.dataset, d.row FROM deals d WHERE {' AND '.join(where)}"
+            order = "d.date DESC, d.dataset DESC, d.deal_id DESC"
+        else:
+            # 가장 드문 facet 값에서 출발: (kind, value, date, ...) 기본키라 이미 최신 날짜 순 → LIMIT 채우면 멈춤
+            drive_where = ["f.kind = ?", "f.value = ?"]
+            drive_params: list = list(drive)
+            if low:
+                drive_where.append("f.date >= ?")
+                drive_params.append(low)
+            if high:
+                drive_where.append("f.date <= ?")
+                drive_params.append(high)
+            sql = (
+                "SELECT d.dataset, d.row FROM facets f CROSS JOIN deals d "
+                "ON d.dataset = f.dataset AND d.deal_id = f.deal_id "
+                f"WHERE {' AND '.join(drive_where + where)}"
+            )
+            params = drive_params + params
+            order = "f.date DESC, f.dataset DESC, f.deal_id DESC"
+        sql += f" ORDER BY {order}"
+        if limit:
+            sql += f" LIMIT {int(limit)}"
+        rows = [dict(json.loads(row), dataset=ds) for ds, row in conn.execute(sql, params)]
+    finally:
+        if own:
+            conn.close()
+    with _lock:
+        stats["queries"] += 1
+        stats["query_s"] += time.perf_counter() - started
+    return rows
+
+
+def _driving_facet(conn: sqlite3.Connection, facets: List[tuple]) -> Optional[tuple]:
+    """facet 필터 중 행이 가장 적은 값 (세는 비용을 줄이려고 FACET_COUNT_CAP건에서 멈춤)."""
+    best, best_count = None, None
+    for kind, value in facets:
+        count = conn.execute(
+            f"SELECT COUNT(*) FROM (SELECT 1 FROM facets WHERE kind = ? AND value = ? LIMIT {FACET_COUNT_CAP})",
+            (kind, value),
+        ).fetchone()[0]
+        if best_count is None or count < best_count:
+            best, best_count = (kind, value), count
+    return best
+
+
+def values(kind: str, path: Optional[str] = None) -> List[tuple]:
+    """필터에 쓸 수 있는 값 + 건수: sector / investor / lp / gp (facets), round / status (deals)."""
+    conn = connect(path)
+    try:
+        if kind in ("round", "status"):
+            sql = f"SELECT {kind}, COUNT(*) FROM deals WHERE {kind} IS NOT NULL GROUP BY {kind} ORDER BY 2 DESC"
+            return conn.execute(sql).fetchall()
+        sql = "SELECT value, COUNT(*) FROM facets WHERE kind = ? GROUP BY value ORDER BY 2 DESC"
+        return conn.execute(sql, (kind,)).fetchall()
+    finally:
+        conn.close()
+
+
+def snapshot() -> dict:
+    with _lock:
+        out = dict(stats)
+    out["avg_query_ms"] = round(out["query_s"] / out["queries"] * 1000, 2) if out["queries"] else None
+    return out
+
+
+tracing.register_section("deal_index", snapshot)
+
+
+# ------------------------
+# 출력
+# ------------------------
+
+def write_rows(rows: List[dict], fmt: str, out=sys.stdout):
+    if fmt == "json":
+        json.dump(rows, out, ensure_ascii=False, indent=2)
+        out.write("\n")
+    elif fmt == "csv":
+        fieldnames: List[str] = []
+        for row in rows:
+            fieldnames += [k for k in row if k not in fieldnames]
+        writer = csv.DictWriter(out, fieldnames=fieldnames)
+        writer.writeheader()
+        writer.writerows(rows)
+    else:
+        for row in rows:
+            spec = DATASETS[row["dataset"]]
+            date = row_date(row, spec) or ""
+            amount = row.get(spec["amount"].replace(" 원화환산", "")) or ""
+            print(f"{row['dataset']:<8} #{row.get('Deal ID', ''):<6} {date:<10} {amount[:24]:<24} {row.get(spec['label']) or ''}", file=out)
+
+
+# ------------------------
+# 벤치마크 (합성 데이터)
+# ------------------------
+
+_SECTORS = ["ICT & Digitalization", "Biotech & Healthcare", "Semiconductor & Industrial",
+            "Consumer Internet & Fintech", "Interactive Contents & Media", "Energy", "ETC"]
+_ROUNDS = ["시드", "프리시리즈A", "Series A", "시리즈 B", "Series C", "Series D", "전략적 투자", "미공개"]
+_STATUSES = ["신규결성", "멀티클로징", "모집중", "1차 클로징", "위탁운용사 선정"]
+
+
+def _synthetic_rows(n: int, seed: int = 0) -> Iterable[tuple]:
+    """(dataset, row) n개: wowtale 3 : lp_news 1, 투자사/LP/운용사 이름 5,000개 풀."""
+    rng = random.Random(seed)
+    names = [f"합성투자사{i}" for i in range(5000)]
+    for i in range(1, n + 1):
+        date = f"{rng.randint(2015, 2026)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}"
+        amount = rng.randint(1, 5000) * 10 ** 8
+        investors = ", ".join(rng.sample(names, rng.randint(1, 4)))
+        if i % 4:
+            yield "wowtale", {
+                "Deal ID": i, "투자 받는 회사 (Target / Startup)": f"스타트업{i}", "투자사 (Investor)": investors,
+                "라운드": rng.choice(_ROUNDS), "사업 섹터": rng.choice(_SECTORS), "기사 날짜": date.replace("-", "."),
+                "투자 금액 원화환산": amount,
+            }
+        else:
+            yield "lp_news", {
+                "Deal ID": i, "기사 제목": f"합성 펀드 기사 {i}", "기사 작성일": date, "LP": investors,
+                "운용사": rng.choice(names), "투자섹터": ", ".join(rng.sample(_SECTORS, 2)),
+                "조성상태": rng.choice(_STATUSES), "펀드규모 원화환산": amount,
+            }
+
+
+def bench(rows: int, path: str):
+    """합성 데이터 색인 → 필터 조합별 조회 시간 (p50 / 최대)."""
+    if os.path.exists(path):
+        os.remove(path)
+    entities = entity_index.EntityIndex(index_path=None, aliases_path="")
+    started = time.perf_counter()
+    batch: Dict[str, List[dict]] = {"wowtale": [], "lp_news": []}
+    for dataset, row in _synthetic_rows(rows):
+        batch[dataset].append(row)
+        if len(batch[dataset]) >= 10000:
+            index_rows(dataset, batch[dataset], path=path, entities=entities)
+            batch[dataset] = []
+    for dataset, pending in batch.items():
+        index_rows(dataset, pending, path=path, entities=entities)
+    conn = connect(path)
+    conn.execute("ANALYZE")
+    elapsed = time.perf_counter() - started
+    print(f"[INFO] {rows:,}행 색인 {elapsed:.1f}s ({rows / elapsed:,.0f}행/s), {os.path.getsize(path) / 1024 / 1024:.0f} MB")
+
+    cases = {
+        "sector": dict(sector="Biotech & Healthcare"),
+        "round+date": dict(round="시리즈B", date_from="2024-01", date_to="2024-06"),
+        "amount range": dict(min_amount="4000억", max_amount="4010억"),
+        "investor": dict(investor="합성투자사42"),
+        "lp+status+date": dict(lp="합성투자사7", status="신규결성", date_from="2020"),
+        "gp+sector+amount": dict(gp="합성투자사123", sector="Energy", min_amount="1000억"),
+        "sector (no limit)": dict(dataset="wowtale", sector="Energy", date_from="2026-01", limit=None),
+    }
+    # 참고: 인덱스 없이 행마다 확인하는 전체 스캔 (CSV를 읽어 필터하던 방식에 해당)
+    t = time.perf_counter()
+    scanned = sum(1 for (row,) in conn.execute("SELECT row FROM deals") if "Energy" in json.loads(row).get("사업 섹터", ""))
+    print(f"  {'full scan (참고)':<18} {scanned:>6}건  {(time.perf_counter() - t) * 1000:10.0f} ms")
+
+    global_default = entity_index._default
+    entity_index._default = entities  # 조회 때 이름 해석도 합성 이름으로
+    try:
+        for name, kwargs in cases.items():
+            times, count = [], 0
+            for _ in range(5):
+                t = time.perf_counter()
+                count = len(query(conn=conn, **kwargs))
+                times.append((time.perf_counter() - t) * 1000)
+            times.sort()
+            print(f"  {name:<18} {count:>6}건  p50 {times[2]:7.2f} ms  max {times[-1]:7.2f} ms")
+    finally:
+        entity_index._default = global_default
+        conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="딜 / 펀드 데이터셋 조회")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("sync", help="아직 색인 안 된 요약 CSV 행 추가")
+    p_query = sub.add_parser("query", help="필터 조회")
+    p_query.add_argument("--dataset", choices=list(DATASETS))
+    p_query.add_argument("--sector")
+    p_query.add_argument("--round")
+    p_query.add_argument("--from", dest="date_from", help="시작 날짜 (2025 / 2025-03 / 2025-03-02)")
+    p_query.add_argument("--to", dest="date_to", help="끝 날짜 (해당 기간 포함)")
+    p_query.add_argument("--min-amount", help="최소 금액 (원화 환산, 예: 100억)")
+    p_query.add_argument("--max-amount", help="최대 금액 (원화 환산)")
+    p_query.add_argument("--investor")
+    p_query.add_argument("--lp")
+    p_query.add_argument("--gp")
+    p_query.add_argument("--status", help="조성상태")
+    p_query.add_argument("--limit", type=int, default=100, help="최대 행 수 (0이면 전부)")
+    p_query.add_argument("--format", choices=["table", "json", "csv"], default="table")
+    p_values = sub.add_parser("values", help="필터 값 목록 + 건수")
+    p_values.add_argument("kind", choices=["sector", "round", "status", "investor", "lp", "gp"])
+    p_bench = sub.add_parser("bench", help="합성 데이터 색인/조회 벤치마크")
+    p_bench.add_argument("--rows", type=int, default=1_000_000)
+    p_bench.add_argument("--db", default="deal_index_bench.db")
+    args = parser.parse_args()
+
+    if args.cmd == "sync":
+        print(f"[INFO] 색인 추가: {sync()}")
+    elif args.cmd == "query":
+        kwargs = {k: v for k, v in vars(args).items() if k not in ("cmd", "format")}
+        try:
+            result = query(**kwargs)
+        except ValueError as e:
+            raise SystemExit(f"[ERROR] {e}")
+        write_rows(result, args.format)
+    elif args.cmd == "values":
+        for value, count in values(args.kind):
+            print(f"{count:>6}  {value}")
+    else:
+        bench(args.rows, args.db)
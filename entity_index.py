@@ -0,0 +1,279 @@
+"""
+투자사 / LP / 운용사(GP) 이름 정규화 + 엔티티 → Deal ID 역인덱스.
+
+요약 CSV의 투자사 (Investor) / LP / 운용사 컬럼은 쉼표로 이어 붙인 문자열이고 표기도 제각각
+("한국벤처투자" / "KVIC", "스틱벤처스(주)" / "스틱벤처스")이라, "X가 참여한 딜"을 찾으려면
+모든 행을 substring으로 훑어야 했다. 이름을 대표 이름(canonical) 하나로 모으고
+대표 이름 → 데이터셋/역할별 Deal ID 목록을 파일에 유지한다.
+
+이름 해석 순서
+  1) 정규화 키: NFKC, 소문자, 공백/구두점/법인 표기((주), 주식회사, Inc. 등) 제거
+  2) entity_aliases.json (손으로 관리하는 별칭표, 대표 이름 → 별칭 리스트)과 지금까지 본 이름의 키
+  3) 퍼지 매칭: 첫 글자(와 숫자)가 같은 키 중 difflib 유사도가 FUZZY_THRESHOLD 이상이면 같은 엔티티로 보고
+     entity_index.json의 fuzzy 목록에 남긴다 (검토 후 맞으면 별칭표로 옮기고, 틀리면 별칭표에 따로 등록)
+  4) 그래도 없으면 새 엔티티
+"한국통신사업자연합회(KTOA)", "레드포인트벤처스(Redpoint Ventures)"처럼 괄호 안 영문 표기는 별칭으로 같이 등록한다.
+
+인덱스 (entity_index.json, append_summary / append_summaries가 행을 쓸 때마다 갱신)
+  {"keys": {정규화 키: 대표 이름}, "fuzzy": {이름: 대표 이름},
+   "postings": {대표 이름: {"wowtale.investor": [Deal ID...], "lp_news.lp": [...], "lp_news.gp": [...]}}}
+LP 뉴스와 wowtale의 Deal ID는 서로 다른 번호 체계라 데이터셋별로 따로 둔다.
+
+  python entity_index.py rebuild             # 두 요약 CSV 전체로 다시 만들기
+  python entity_index.py query KVIC          # 이름 해석 + 참여 Deal ID
+  python entity_index.py fuzzy               # 퍼지 매칭으로 묶인 이름 (검토용)
+
+환경 변수
+  - ENTITY_FUZZY_THRESHOLD : 퍼지 매칭 최소 유사도 (기본 0.92, 1이면 끔)
+"""
+import os
+import re
+import json
+import argparse
+import difflib
+import threading
+import unicodedata
+from typing import Dict, Iterable, List, Optional
+
+import csv_partitions
+import tracing
+
+ALIASES_PATH = "entity_aliases.json"
+INDEX_PATH = "entity_index.json"
+FUZZY_THRESHOLD = float(os.environ.get("ENTITY_FUZZY_THRESHOLD") or 0.92)
+
+# (데이터셋.역할) → (요약 CSV, 이름 컬럼, 인코딩)
+FIELDS = {
+    "wowtale.investor": ("wowtale_deals.csv", "투자사 (Investor)", "utf-8"),
+    "lp_news.lp": ("lp_news_summaries.csv", "LP", "utf-8-sig"),
+    "lp_news.gp": ("lp_news_summaries.csv", "운용사", "utf-8-sig"),
+}
+
+_CORP_MARKS = re.compile(r"\(주\)|㈜|주식회사|\b(?:inc|corp|co|ltd|llc|plc|gmbh)\b\.?", re.IGNORECASE)
+_NON_WORD = re.compile(r"[\W_]+")
+_DIGITS = re.compile(r"\d+")
+_ABBREV = re.compile(r"^(.+?)\s*\(([A-Za-z][A-Za-z0-9&.,'\- ]{1,60})\)$")
+_SPLIT = re.compile(r"[,、;]|\s및\s")
+_PARENS = re.compile(r"\([^()]*\)")
+_SKIP_NAMES = {"", "미공개", "비공개", "확인 불가", "기타", "등"}
+
+_lock = threading.Lock()
+stats = {"rows_indexed": 0, "new_entities": 0, "fuzzy_matches": 0}
+
+
+def normalize(name: str) -> str:
+    """비교용 키: NFKC → 소문자 → 법인 표기/공백/구두점 제거."""
+    text = unicodedata.normalize("NFKC", name or "").lower()
+    text = _CORP_MARKS.sub(" ", text)
+    return _NON_WORD.sub("", text)
+
+
+def split_names(text: str) -> List[str]:
+    """'A, B(주), C(Cee, C2) 등' → ['A', 'B(주)', 'C(Cee, C2)'] (괄호 안 쉼표에서는 나누지 않음)"""
+    text = text or ""
+    masked = _PARENS.sub(lambda m: "\0" * len(m.group()), text)
+    parts, start = [], 0
+    for m in _SPLIT.finditer(masked):
+        parts.append(text[start:m.start()])
+        start = m.end()
+    parts.append(text[start:])
+    names = []
+    for part in parts:
+        name = re.sub(r"\s*등$", "", part.strip()).strip()
+        if name not in _SKIP_NAMES:
+            names.append(name)
+    return names
+
+
+class EntityIndex:
+    def __init__(self, index_path: Optional[str] = INDEX_PATH, aliases_path: str = ALIASES_PATH):
+        self.index_path = index_path
+        self.keys: Dict[str, str] = {}
+        self.fuzzy: Dict[str, str] = {}
+        self.postings: Dict[str, Dict[str, List[int]]] = {}
+        if index_path and os.path.exists(index_path):
+            with open(index_path, encoding="utf-8") as f:
+                data = json.load(f)
+            self.keys = data.get("keys") or {}
+            self.fuzzy = data.get("fuzzy") or {}
+            self.postings = data.get("postings") or {}
+        # 손으로 관리하는 별칭표가 항상 우선
+        self.curated: Dict[str, str] = {}
+        if os.path.exists(aliases_path):
+            with open(aliases_path, encoding="utf-8") as f:
+                for canonical, aliases in json.load(f).items():
+                    for alias in [canonical] + list(aliases):
+                        self.curated[normalize(alias)] = canonical
+        self._buckets: Dict[tuple, set] = {}
+        for key in list(self.keys) + list(self.curated):
+            self._bucket(key)
+
+    @staticmethod
+    def _bucket_key(key: str) -> tuple:
+        # 첫 글자 + 숫자들: "OO펀드 1호" / "OO펀드 2호"처럼 숫자만 다른 이름은 다른 엔티티라 비교하지 않음
+        return key[0], tuple(_DIGITS.findall(key))
+
+    def _bucket(self, key: str):
+        if key:
+            bucket = self._buckets.setdefault(self._bucket_key(key), set())
+            bucket.add(key)
+
+    def _register(self, key: str, canonical: str):
+        if key and key not in self.keys:
+            self.keys[key] = canonical
+            self._bucket(key)
+
+    def lookup(self, name: str) -> Optional[str]:
+        """등록된 이름만 해석 (새 엔티티/퍼지 등록 없음, 조회용)."""
+        key = normalize(name)
+        m = _ABBREV.match((name or "").strip())
+        if key not in self.curated and key not in self.keys and m:
+            key = normalize(m.group(1))
+        return self.curated.get(key) or self.keys.get(key) or self._fuzzy_match(key)
+
+    def _fuzzy_match(self, key: str) -> Optional[str]:
+        if not key or FUZZY_THRESHOLD >= 1:
+            return None
+        best, best_ratio = None, FUZZY_THRESHOLD
+        matcher = difflib.SequenceMatcher(None, b=key)
+        for other in sorted(self._buckets.get(self._bucket_key(key), ())):
+            matcher.set_seq1(other)
+            if matcher.real_quick_ratio() < best_ratio or matcher.quick_ratio() < best_ratio:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= best_ratio:
+                best, best_ratio = other, ratio
+        if best is None:
+            return None
+        return self.curated.get(best) or self.keys.get(best)
+
+    def resolve(self, name: str) -> Optional[str]:
+        """이름 → 대표 이름. 처음 보는 이름이면 퍼지 매칭 또는 새 엔티티로 등록."""
+        name = (name or "").strip()
+        m = _ABBREV.match(name)
+        abbrev = None
+        if m and normalize(name) not in self.curated:
+            name, abbrev = m.group(1).strip(), m.group(2).strip()
+        key = normalize(name)
+        if not key:
+            return None
+
+        canonical = self.curated.get(key) or self.keys.get(key)
+        if canonical is None:
+            canonical = self._fuzzy_match(key)
+            if canonical is not None:
+                self.fuzzy[name] = canonical
+                with _lock:
+                    stats["fuzzy_matches"] += 1
+            else:
+                canonical = name
+                with _lock:
+                    stats["new_entities"] += 1
+            self._register(key, canonical)
+        for alias in (abbrev or "").split(","):
+            self._register(normalize(alias), canonical)
+        return canonical
+
+    def add_row(self, dataset: str, deal_id, names_by_role: Dict[str, str]):
+        """행 하나의 이름 컬럼들 → postings에 Deal ID 추가. names_by_role: {"investor": "A, B", ...}"""
+        try:
+            deal_id = int(deal_id)
+        except (TypeError, ValueError):
+            return
+        for role, text in names_by_role.items():
+            field = f"{dataset}.{role}"
+            for name in split_names(text):
+                canonical = self.resolve(name)
+                if canonical is None:
+                    continue
+                ids = self.postings.setdefault(canonical, {}).setdefault(field, [])
+                if deal_id not in ids:
+                    ids.append(deal_id)
+        with _lock:
+            stats["rows_indexed"] += 1
+
+    def deals(self, name: str) -> Dict[str, List[int]]:
+        """이름 → {데이터셋.역할: Deal ID 목록} (모르는 이름이면 빈 dict)."""
+        canonical = self.lookup(name)
+        return {field: sorted(ids) for field, ids in (self.postings.get(canonical) or {}).items()}
+
+    def save(self):
+        if not self.index_path:
+            return
+        data = {"keys": self.keys, "fuzzy": self.fuzzy, "postings": self.postings}
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"), sort_keys=True)
+        os.replace(tmp, self.index_path)
+
+    def snapshot(self) -> dict:
+        with _lock:
+            return dict(stats, entities=len(self.postings), keys=len(self.keys), fuzzy_total=len(self.fuzzy))
+
+
+_default: Optional[EntityIndex] = None
+_default_lock = threading.Lock()
+
+
+def default_index() -> EntityIndex:
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = EntityIndex()
+            tracing.register_section("entity_index", _default.snapshot)
+        return _default
+
+
+def index_rows(dataset: str, rows: Iterable[dict], roles: Dict[str, str]):
+    """
+    요약 CSV에 방금 쓴 행들을 인덱스에 반영하고 저장 (append_summary / append_summaries에서 호출).
+    roles: {역할: 이름 컬럼} (예: {"lp": "LP", "gp": "운용사"})
+    """
+    index = default_index()
+    with _default_lock:
+        for row in rows:
+            index.add_row(dataset, row.get("Deal ID"), {role: row.get(column) or "" for role, column in roles.items()})
+        index.save()
+
+
+def rebuild() -> EntityIndex:
+    """두 요약 CSV 전체로 인덱스를 처음부터 다시 만든다 (퍼지 매칭 기록도 새로)."""
+    global _default
+    index = EntityIndex(index_path=None)
+    index.index_path = INDEX_PATH
+    datasets: Dict[tuple, Dict[str, str]] = {}
+    for field, (path, column, encoding) in FIELDS.items():
+        dataset, role = field.split(".")
+        datasets.setdefault((dataset, path, encoding), {})[role] = column
+    for (dataset, path, encoding), roles in datasets.items():
+        for row in csv_partitions.iter_rows(path, encoding=encoding):
+            index.add_row(dataset, row.get("Deal ID"), {role: row.get(column) or "" for role, column in roles.items()})
+    index.save()
+    with _default_lock:
+        _default = index
+    return index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="투자사/LP/운용사 엔티티 인덱스 도구")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("rebuild", help="요약 CSV 전체로 인덱스 다시 만들기")
+    p_query = sub.add_parser("query", help="이름 해석 + 참여 Deal ID")
+    p_query.add_argument("name")
+    sub.add_parser("fuzzy", help="퍼지 매칭으로 묶인 이름 목록")
+    args = parser.parse_args()
+
+    if args.cmd == "rebuild":
+        idx = rebuild()
+        print(f"[INFO] {INDEX_PATH} 생성: {json.dumps(idx.snapshot(), ensure_ascii=False)}")
+    elif args.cmd == "query":
+        idx = default_index()
+        canonical = idx.lookup(args.name)
+        if canonical is None:
+            raise SystemExit(f"모르는 이름: {args.name}")
+        print(f"{args.name} → {canonical}")
+        for field, ids in sorted(idx.deals(canonical).items()):
+            print(f"  {field:<18} {len(ids):>4}건  Deal ID {', '.join(map(str, ids))}")
+    else:
+        for name, canonical in sorted(default_index().fuzzy.items()):
+            print(f"{name} → {canonical}")
@@ -0,0 +1,305 @@
+"""
+기사 본문 fetch + HTML 파싱/본문 추출 병렬화 (backfill처럼 밀린 기사가 많을 때).
+
+html.parser 기반 BeautifulSoup 파싱은 순수 파이썬이라 스레드로 돌려도 GIL 때문에 한 코어만 쓴다.
+그래서 두 단계를 나눈다.
+  - fetch       : 스레드 (네트워크 대기, 호스트별 동시 요청 수는 host_limiter가 조절)
+  - 파싱/본문 추출: 프로세스 풀. 워커는 raw HTML bytes를 받아 작은 dict
+                  {"title", "body", "meta", "selector"}만 돌려준다 (soup 객체는 넘기지 않음)
+기사를 WINDOW건씩 묶어 먼저 받아 두고, 한 창을 executor.map(chunksize=...)으로 넘겨
+작업당 pickle/IPC 오버헤드를 줄인다. 요약 루프가 현재 창을 LLM으로 처리하는 동안
+다음 창의 fetch/파싱이 뒤에서 진행된다.
+
+워커의 본문 셀렉터 캐시(article_extractor)는 파일을 읽기만 하고, 워커가 새로 학습한 셀렉터는
+결과에 실어 보내 부모 프로세스가 selector_cache.json에 반영한다.
+워커 안의 span은 리포트에 안 남으므로 파싱 시간은 extraction_pool 섹션에 따로 집계한다
+(parse_cpu_s / parse_wall_s 가 대략 병렬 배율).
+
+로컬 확인 (article_extractor.py record 로 저장해 둔 페이지로 순차 vs 풀 비교):
+  python extraction_pool.py bench bench_pages/ --workers 4
+
+환경 변수
+  - EXTRACT_WORKERS           : 파싱 프로세스 수 (기본 0 = 끔, 요약 루프 안에서 기사마다 fetch + 파싱 / auto = CPU 수)
+  - EXTRACT_WINDOW            : 한 번에 미리 받아 파싱할 기사 수 (기본 64)
+  - EXTRACT_FETCH_CONCURRENCY : fetch 스레드 수 (기본 8)
+"""
+import os
+import json
+import time
+import argparse
+import importlib
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional
+
+import tracing
+
+_workers_env = (os.environ.get("EXTRACT_WORKERS") or "0").strip().lower()
+WORKERS = (os.cpu_count() or 1) if _workers_env == "auto" else int(_workers_env)
+WINDOW = int(os.environ.get("EXTRACT_WINDOW") or 64)
+FETCH_CONCURRENCY = int(os.environ.get("EXTRACT_FETCH_CONCURRENCY") or 8)
+CHUNKS_PER_WORKER = 4  # 창 하나를 워커당 몇 덩어리로 나눌지 (작을수록 IPC 적고, 클수록 부하 분산)
+
+# 종류 → parse_article(html, url)이 있는 모듈 (워커에서 import, 부모가 __main__으로 실행돼도 동작)
+PARSERS = {
+    "lp_news": "LP_News_GPT_Auto",
+    "wowtale": "wowtale_GPT_auto",
+}
+
+_lock = threading.Lock()
+stats = {
+    "windows": 0,
+    "fetched": 0,
+    "fetch_errors": 0,
+    "parsed": 0,
+    "parse_errors": 0,
+    "fetch_wall_s": 0.0,
+    "parse_cpu_s": 0.0,
+    "parse_wall_s": 0.0,
+    "selectors_adopted": 0,
+}
+
+
+def enabled() -> bool:
+    return WORKERS > 0
+
+
+# ------------------------
+# 워커 프로세스
+# ------------------------
+
+def _init_worker():
+    import article_extractor
+
+    article_extractor.use_cache(article_extractor.SelectorCache(readonly=True))
+
+
+def _parse_task(task: tuple) -> dict:
+    """(kind, url, HTML bytes, encoding) → 작은 결과 dict. 예외는 dict로 돌려줘 같은 덩어리의 다른 기사는 계속."""
+    import article_extractor
+
+    kind, url, content, encoding = task
+    started = time.process_time()  # 워커 CPU 시간 (여러 워커가 한 코어를 나눠 써도 부풀지 않게)
+    cache = article_extractor.default_cache()
+    relearned = cache.stats["relearned"]
+    try:
+        # 인코딩을 모르면 bytes 그대로 → BeautifulSoup이 meta charset으로 판단
+        html = content.decode(encoding, errors="replace") if encoding else content
+        record = importlib.import_module(PARSERS[kind]).parse_article(html, url)
+    except Exception as e:
+        return {"url": url, "error": f"{type(e).__name__}: {e}", "parse_s": time.process_time() - started}
+    record["url"] = url
+    record["parse_s"] = time.process_time() - started
+    if cache.stats["relearned"] != relearned:
+        domain = article_extractor.domain_of(url)
+        record["learned"] = (domain, dict(cache.entries[domain]))
+    return record
+
+
+# ------------------------
+# 부모 프로세스: 창 단위 prefetch
+# ------------------------
+
+class ArticlePrefetcher:
+    """
+    schedule(urls)로 창 단위 fetch + 파싱을 예약하고 get(url)로 결과를 받는다.
+    예약 안 된 URL을 get하면 그 URL 하나짜리 창을 바로 예약한다.
+
+        with ArticlePrefetcher("lp_news", download_article) as prefetcher:
+            prefetcher.schedule(urls[:WINDOW])
+            record = prefetcher.get(urls[0])   # {"title", "body", "meta", "selector"}
+    """
+
+    def __init__(
+        self,
+        kind: str,
+        download: Callable[[str], object],
+        workers: int = None,
+        window: int = WINDOW,
+        fetch_concurrency: int = FETCH_CONCURRENCY,
+    ):
+        self.kind = kind
+        self.download = download  # url → requests.Response (raise_for_status까지)
+        self.workers = workers or WORKERS or 1
+        self.window = window
+        self.fetch_concurrency = fetch_concurrency
+        self.lock = threading.Lock()
+        self.windows: Dict[str, Future] = {}  # url → 그 url이 들어 있는 창의 future ({url: record})
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def start(self) -> "ArticlePrefetcher":
+        # fork는 스레드(HTTP 풀, host_limiter)가 돌고 있는 프로세스에서 안전하지 않으므로 spawn
+        self.procs = ProcessPoolExecutor(
+            max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"), initializer=_init_worker
+        )
+        self.fetchers = ThreadPoolExecutor(max_workers=self.fetch_concurrency, thread_name_prefix="extract-fetch")
+        # 창 2개까지 동시에 (한 창 파싱 중에 다음 창 fetch)
+        self.runner = ThreadPoolExecutor(max_workers=2, thread_name_prefix="extract-window")
+        return self
+
+    def close(self):
+        self.runner.shutdown(wait=False, cancel_futures=True)
+        self.fetchers.shutdown(wait=False, cancel_futures=True)
+        self.procs.shutdown(wait=True, cancel_futures=True)
+
+    def schedule(self, urls: Iterable[str]):
+        with self.lock:
+            todo = [u for u in dict.fromkeys(urls) if u and u not in self.windows]
+            for i in range(0, len(todo), self.window):
+                chunk = todo[i:i + self.window]
+                future = self.runner.submit(self._run_window, chunk)
+                for u in chunk:
+                    self.windows[u] = future
+
+    def get(self, url: str) -> dict:
+        """미리 파싱한 결과 (fetch/파싱 실패면 RuntimeError → 호출 쪽의 기존 예외 처리로)."""
+        self.schedule([url])
+        with self.lock:
+            future = self.windows.pop(url)
+        record = future.result()[url]
+        if "error" in record:
+            raise RuntimeError(record["error"])
+        return record
+
+    def _download(self, url: str) -> tuple:
+        try:
+            res = self.download(url)
+            return url, res.content, res.encoding, None
+        except Exception as e:
+            return url, None, None, f"{type(e).__name__}: {e}"
+
+    def _run_window(self, urls: List[str]) -> Dict[str, dict]:
+        import article_extractor
+
+        with tracing.span("extract.window", kind=self.kind, articles=len(urls)) as attrs:
+            started = time.perf_counter()
+            downloads = list(self.fetchers.map(self._download, urls))
+            fetched = time.perf_counter()
+
+            out: Dict[str, dict] = {}
+            tasks = []
+            for url, content, encoding, error in downloads:
+                if error:
+                    out[url] = {"url": url, "error": error}
+                else:
+                    tasks.append((self.kind, url, content, encoding))
+            chunksize = max(1, len(tasks) // (self.workers * CHUNKS_PER_WORKER))
+            parse_cpu = 0.0
+            adopted = 0
+            for record in self.procs.map(_parse_task, tasks, chunksize=chunksize):
+                parse_cpu += record.pop("parse_s", 0.0)
+                learned = record.pop("learned", None)
+                if learned:
+                    article_extractor.default_cache().adopt(*learned)
+                    adopted += 1
+                out[record["url"]] = record
+            parsed = time.perf_counter()
+            attrs.update(chunksize=chunksize, fetch_s=round(fetched - started, 3), parse_s=round(parsed - fetched, 3))
+
+        parse_errors = sum(1 for t in tasks if "error" in out[t[1]])
+        with _lock:
+            stats["windows"] += 1
+            stats["fetched"] += len(tasks)
+            stats["fetch_errors"] += len(urls) - len(tasks)
+            stats["parsed"] += len(tasks) - parse_errors
+            stats["parse_errors"] += parse_errors
+            stats["fetch_wall_s"] += fetched - started
+            stats["parse_cpu_s"] += parse_cpu
+            stats["parse_wall_s"] += parsed - fetched
+            stats["selectors_adopted"] += adopted
+        return out
+
+
+def prefetcher(kind: str, download: Callable[[str], object]) -> Optional[ArticlePrefetcher]:
+    """EXTRACT_WORKERS가 켜져 있으면 시작된 ArticlePrefetcher (다 쓰면 close()), 아니면 None."""
+    return ArticlePrefetcher(kind, download).start() if enabled() else None
+
+
+def snapshot() -> dict:
+    with _lock:
+        s = dict(stats, workers=WORKERS, window=WINDOW)
+    for key in ("fetch_wall_s", "parse_cpu_s", "parse_wall_s"):
+        s[key] = round(s[key], 2)
+    s["parallelism"] = round(s["parse_cpu_s"] / s["parse_wall_s"], 2) if s["parse_wall_s"] else 0.0
+    return s
+
+
+def summary():
+    s = snapshot()
+    if not s["windows"]:
+        return
+    print(
+        f"[INFO] 본문 추출 풀({s['workers']} 프로세스): {s['parsed']}건 파싱 "
+        f"(fetch 실패 {s['fetch_errors']} / 파싱 실패 {s['parse_errors']}) · "
+        f"파싱 CPU {s['parse_cpu_s']:.1f}s / 벽시계 {s['parse_wall_s']:.1f}s (x{s['parallelism']})"
+    )
+
+
+tracing.register_section("extraction_pool", snapshot)
+
+
+# ------------------------
+# 로컬 확인
+# ------------------------
+
+class _SavedPage:
+    def __init__(self, content: bytes):
+        self.content = content
+        self.encoding = "utf-8"  # article_extractor.record가 utf-8로 저장
+
+
+def bench(pages_dir: str, workers: int):
+    """저장된 페이지를 순차 파싱 vs 프로세스 풀로 파싱해서 시간과 결과 일치 비교."""
+    with open(os.path.join(pages_dir, "index.jsonl"), encoding="utf-8") as f:
+        pages = [json.loads(line) for line in f if line.strip()]
+    files = {p["url"]: os.path.join(pages_dir, p["file"]) for p in pages}
+    urls = list(files)
+
+    def kind_of(url: str) -> str:
+        return "wowtale" if "wowtale.net" in url else "lp_news"
+
+    def load(url: str) -> _SavedPage:
+        with open(files[url], "rb") as f:
+            return _SavedPage(f.read())
+
+    _init_worker()
+    t0 = time.perf_counter()
+    expected = {}
+    for url in urls:
+        page = load(url)
+        expected[url] = _parse_task((kind_of(url), url, page.content, page.encoding))
+    sequential = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    got: Dict[str, dict] = {}
+    for kind in sorted({kind_of(u) for u in urls}):
+        with ArticlePrefetcher(kind, load, workers=workers) as pf:
+            kind_urls = [u for u in urls if kind_of(u) == kind]
+            pf.schedule(kind_urls)
+            for u in kind_urls:
+                got[u] = pf.get(u)
+    pooled = time.perf_counter() - t0
+
+    equal = sum(1 for u in got if got[u].get("body") == expected[u].get("body"))
+    print(f"페이지 {len(urls)}개")
+    print(f"  순차 파싱        {sequential:>7.2f}s")
+    print(f"  풀({workers} 프로세스)  {pooled:>7.2f}s  (프로세스 기동 포함, x{sequential / pooled:.1f})")
+    print(f"  본문 일치        {equal}/{len(got)}")
+    print(json.dumps(snapshot(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="본문 추출 프로세스 풀 도구")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_bench = sub.add_parser("bench", help="저장된 페이지로 순차 vs 풀 파싱 비교")
+    p_bench.add_argument("pages_dir")
+    p_bench.add_argument("--workers", type=int, default=WORKERS or (os.cpu_count() or 1))
+    args = parser.parse_args()
+
+    bench(args.pages_dir, args.workers)
@@ -0,0 +1,138 @@
+"""
+호스트별 적응형 동시 요청 제한 (AIMD).
+
+pipeline_context.fetch를 거치는 모든 요청(목록 수집, 기사 본문, backfill)이 호스트별 슬롯을 하나씩 잡는다.
+
+- 정상 응답이 이어지면 동시 요청 한도를 조금씩 올림 (additive increase: 성공 1건마다 +1/한도 → 한도만큼 성공하면 +1)
+- 429 / 5xx / 네트워크 오류 / latency 급증(EWMA의 SPIKE_FACTOR배 초과)이면 한도를 절반으로 (multiplicative decrease)
+  한 번 줄인 뒤 latency 한 주기 동안은 다시 줄이지 않음 (같은 혼잡으로 여러 번 깎이지 않도록)
+- 429의 Retry-After는 그 시간 동안 해당 호스트 요청 시작을 막는다
+- 호스트별 상태(현재 한도, latency EWMA, 요청/오류/429 수, 감소 횟수)는 실행 리포트의 host_limits에 들어간다
+
+환경 변수
+  - HOST_INITIAL_CONCURRENCY : 호스트별 시작 한도 (기본 2)
+  - HOST_MAX_CONCURRENCY     : 호스트별 최대 한도 (기본 8)
+"""
+import os
+import time
+import threading
+from typing import Dict, Optional
+
+import tracing
+
+INITIAL_CONCURRENCY = float(os.environ.get("HOST_INITIAL_CONCURRENCY") or 2)
+MAX_CONCURRENCY = float(os.environ.get("HOST_MAX_CONCURRENCY") or 8)
+MIN_CONCURRENCY = 1.0
+DECREASE_FACTOR = 0.5
+SPIKE_FACTOR = 3.0
+LATENCY_ALPHA = 0.2
+MIN_SAMPLES = 5  # latency 급증 판단 전에 필요한 표본 수
+
+
+class HostLimiter:
+    """호스트 하나의 AIMD 상태."""
+
+    def __init__(self, host: str, initial: float = INITIAL_CONCURRENCY, maximum: float = MAX_CONCURRENCY):
+        self.host = host
+        self.limit = max(MIN_CONCURRENCY, min(initial, maximum))
+        self.maximum = maximum
+        self.inflight = 0
+        self.cond = threading.Condition()
+        self.latency_ewma: Optional[float] = None
+        self.samples = 0
+        self.blocked_until = 0.0
+        self.last_decrease = 0.0
+        self.stats = {"requests": 0, "errors": 0, "throttled": 0, "spikes": 0, "decreases": 0, "peak_limit": self.limit}
+
+    def acquire(self):
+        with self.cond:
+            while True:
+                wait_s = self.blocked_until - time.monotonic()
+                if wait_s > 0:
+                    self.cond.wait(wait_s)
+                    continue
+                if self.inflight < int(self.limit):
+                    self.inflight += 1
+                    return
+                self.cond.wait()
+
+    def release(self, latency: float, status: Optional[int] = None, error: bool = False, retry_after: float = 0.0):
+        with self.cond:
+            self.inflight -= 1
+            self.stats["requests"] += 1
+
+            throttled = status == 429 or status == 503
+            failed = error or (status is not None and status >= 500)
+            spike = (
+                not failed
+                and not throttled
+                and self.samples >= MIN_SAMPLES
+                and self.latency_ewma is not None
+                and latency > SPIKE_FACTOR * self.latency_ewma
+            )
+
+            if throttled:
+                self.stats["throttled"] += 1
+                if retry_after > 0:
+                    self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+            if failed:
+                self.stats["errors"] += 1
+            if spike:
+                self.stats["spikes"] += 1
+
+            if throttled or failed or spike:
+                self._decrease()
+            else:
+                self.limit = min(self.maximum, self.limit + 1.0 / self.limit)
+                self.stats["peak_limit"] = max(self.stats["peak_limit"], self.limit)
+
+            # 오류 응답의 latency는 EWMA에 넣지 않음 (빠른 실패가 기준을 낮추지 않도록)
+            if not failed and not throttled:
+                self.samples += 1
+                if self.latency_ewma is None:
+                    self.latency_ewma = latency
+                else:
+                    self.latency_ewma = LATENCY_ALPHA * latency + (1 - LATENCY_ALPHA) * self.latency_ewma
+
+            self.cond.notify_all()
+
+    def _decrease(self):
+        now = time.monotonic()
+        window = max(1.0, self.latency_ewma or 0.0)
+        if now - self.last_decrease < window:
+            return
+        self.last_decrease = now
+        self.limit = max(MIN_CONCURRENCY, self.limit * DECREASE_FACTOR)
+        self.stats["decreases"] += 1
+
+    def snapshot(self) -> dict:
+        with self.cond:
+            return dict(
+                self.stats,
+                limit=round(self.limit, 2),
+                inflight=self.inflight,
+                latency_ewma=round(self.latency_ewma or 0.0, 3),
+                peak_limit=round(self.stats["peak_limit"], 2),
+            )
+
+
+_lock = threading.Lock()
+_limiters: Dict[str, HostLimiter] = {}
+
+
+def limiter_for(host: str) -> HostLimiter:
+    with _lock:
+        lim = _limiters.get(host)
+        if lim is None:
+            lim = HostLimiter(host)
+            _limiters[host] = lim
+        return lim
+
+
+def snapshot() -> Dict[str, dict]:
+    with _lock:
+        limiters = list(_limiters.values())
+    return {lim.host: lim.snapshot() for lim in limiters}
+
+
+tracing.register_section("host_limits", snapshot)
@@ -0,0 +1,278 @@
+"""
+LLM 응답 스트리밍 + 음성 판정 조기 중단.
+
+출력 스키마의 첫 필드를 분류 플래그(is_fundraising / is_deal)로 두고 응답을 스트림으로 받으면서
+조각이 올 때마다 누적 텍스트에서 플래그 값을 찾는다.
+  - false가 보이면 그 자리에서 스트림을 닫고(나머지 생성 취소) 음성으로 기록
+  - true거나 플래그가 끝까지 안 보이면 응답 전체를 받아 기존처럼 JSON 파싱
+
+절약량은 "완료된 응답의 평균 소요 시간/출력 토큰" 대비 중단 시점까지 받은 양으로 추정하고
+실행 리포트의 llm_stream 섹션과 summary() 출력에 남긴다.
+중단된 호출은 usage를 못 받으므로 예산에는 입력 글자 수/받은 조각 수로 추정한 토큰을 반영한다.
+
+로컬 확인 (API 키 없이 조각 단위로 스트리밍하는 mock 클라이언트 사용):
+  python llm_stream.py selftest
+
+환경 변수
+  - LLM_STREAM            : off(기본) / on / mock (mock은 OpenAI 대신 MockClient로 스트리밍)
+  - LLM_STREAM_MOCK_DELAY : mock 조각 사이 지연 초 (기본 0.02)
+"""
+import os
+import re
+import json
+import time
+import argparse
+import threading
+from types import SimpleNamespace
+from typing import Callable, Optional, Tuple
+
+import tracing
+import wire_schema
+from pipeline_context import cached_tokens, openai_client
+
+MODE = (os.environ.get("LLM_STREAM") or "off").strip().lower()
+ENABLED = MODE in ("on", "mock")
+MOCK_DELAY = float(os.environ.get("LLM_STREAM_MOCK_DELAY") or 0.02)
+DEFAULT_CHARS_PER_TOKEN = 2.0  # 한국어 위주 프롬프트 기준 대략값 (완료된 호출 usage로 보정)
+
+_lock = threading.Lock()
+stats = {
+    "streams": 0,
+    "aborted": 0,
+    "completed": 0,
+    "time_saved_s": 0.0,
+    "tokens_avoided": 0,
+}
+# 완료된 응답 평균 (절약량 추정 기준)
+_avg = {"seconds": None, "completion_tokens": None, "chars_per_token": DEFAULT_CHARS_PER_TOKEN}
+AVG_ALPHA = 0.2
+
+
+def _ewma(key: str, value: float):
+    prev = _avg[key]
+    _avg[key] = value if prev is None else AVG_ALPHA * value + (1 - AVG_ALPHA) * prev
+
+
+class FlagWatcher:
+    """스트림 조각을 이어 붙이며 '"flag_key": true/false'가 나오는지 본다."""
+
+    def __init__(self, flag_key: str):
+        self.pattern = re.compile(r'"%s"\s*:\s*(true|false)' % re.escape(flag_key))
+        self.buffer = ""
+        self.value: Optional[bool] = None
+
+    def feed(self, text: str) -> Optional[bool]:
+        self.buffer += text
+        if self.value is None:
+            m = self.pattern.search(self.buffer)
+            if m:
+                self.value = m.group(1) == "true"
+        return self.value
+
+
+# ------------------------
+# mock 클라이언트
+# ------------------------
+
+def _default_mock_reply(kwargs: dict) -> str:
+    """
+    mock 모드 기본 응답: 사용자 프롬프트에 펀드/딜 단어가 있으면 양성, 아니면 음성.
+    응답 모양은 wire_schema의 예시 응답 (LLM_WIRE_FORMAT에 맞는 형식).
+    """
+    text = " ".join(m.get("content") or "" for m in kwargs.get("messages") or [])
+    kind = "wowtale" if "인수(M&A)" in text else "lp_news"
+    article = text.split("기사 본문", 1)[-1]
+    positive = any(k in article for k in ("결성", "출자사업", "투자 유치", "투자를 유치", "인수"))
+    verbose, compact = wire_schema.SAMPLES[kind if positive else f"{kind}(negative)"]
+    if wire_schema.FORMAT == "compact":
+        return json.dumps(compact, ensure_ascii=False, separators=(",", ":"))
+    return json.dumps(verbose, ensure_ascii=False)
+
+
+class MockStream:
+    """응답 문자열을 몇 글자씩 잘라 OpenAI 스트림 조각 모양으로 흘려보낸다."""
+
+    def __init__(self, reply: str, chunk_chars: int = 4, delay: float = MOCK_DELAY):
+        self.reply = reply
+        self.chunk_chars = chunk_chars
+        self.delay = delay
+        self.sent_chunks = 0
+        self.closed = False
+
+    def __iter__(self):
+        for i in range(0, len(self.reply), self.chunk_chars):
+            if self.closed:
+                return
+            time.sleep(self.delay)
+            self.sent_chunks += 1
+            delta = SimpleNamespace(content=self.reply[i:i + self.chunk_chars])
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=self.sent_chunks)
+        yield SimpleNamespace(choices=[], usage=usage)
+
+    def close(self):
+        self.closed = True
+
+
+class MockClient:
+    """openai_client()와 같은 모양 (chat.completions.create(stream=True, ...))."""
+
+    def __init__(self, reply_fn: Callable[[dict], str] = _default_mock_reply, delay: float = MOCK_DELAY):
+        self.reply_fn = reply_fn
+        self.delay = delay
+        self.streams = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        stream = MockStream(self.reply_fn(kwargs), delay=self.delay)
+        self.streams.append(stream)
+        return stream
+
+
+_mock_client: Optional[MockClient] = None
+
+
+def _client():
+    global _mock_client
+    if MODE != "mock":
+        return openai_client()
+    with _lock:
+        if _mock_client is None:
+            _mock_client = MockClient()
+        return _mock_client
+
+
+# ------------------------
+# 스트리밍 호출
+# ------------------------
+
+def stream_completion(flag_key: str, budget=None, client=None, prompt=None, **kwargs) -> Tuple[str, bool]:
+    """
+    chat completion을 스트림으로 받는다 → (받은 텍스트, 중단 여부).
+    flag_key 값이 false로 나오면 스트림을 닫고 (지금까지 받은 텍스트, True)를 반환.
+    prompt(prompt_templates.PromptTemplate)가 있으면 usage를 받은 호출의 캐시 적중을 기록.
+    """
+    model = kwargs.get("model", "")
+    client = client or _client()
+    watcher = FlagWatcher(flag_key)
+    prompt_chars = sum(len(m.get("content") or "") for m in kwargs.get("messages") or [])
+    started = time.perf_counter()
+    chunks = 0
+    usage = None
+    aborted = False
+
+    with tracing.span("llm.stream", model=model, flag=flag_key) as attrs:
+        stream = client.chat.completions.create(stream=True, stream_options={"include_usage": True}, **kwargs)
+        try:
+            for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    usage = chunk.usage
+                if not chunk.choices:
+                    continue
+                text = chunk.choices[0].delta.content or ""
+                if not text:
+                    continue
+                chunks += 1
+                if watcher.feed(text) is False:
+                    aborted = True
+                    break
+        finally:
+            close = getattr(stream, "close", None)
+            if aborted and close is not None:
+                close()
+        elapsed = time.perf_counter() - started
+
+        if usage is not None:
+            prompt_tokens = getattr(usage, "prompt_tokens", 0) or 0
+            completion_tokens = getattr(usage, "completion_tokens", 0) or 0
+        else:
+            # 중단했거나 usage 조각이 없으면 추정 (조각 1개 ≈ 토큰 1개)
+            prompt_tokens = int(prompt_chars / _avg["chars_per_token"])
+            completion_tokens = chunks
+        attrs.update(prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, aborted=aborted, flag_value=watcher.value)
+        if usage is not None:
+            attrs["cached_tokens"] = cached_tokens(usage)
+            if prompt is not None:
+                # 첫 조각까지가 아니라 전체 소요 시간 (chat_completion과 같은 기준)
+                prompt.observe(prompt_tokens, attrs["cached_tokens"], elapsed)
+        if budget is not None:
+            budget.charge(model, prompt_tokens, completion_tokens)
+
+    with _lock:
+        stats["streams"] += 1
+        if aborted:
+            stats["aborted"] += 1
+            if _avg["seconds"] is not None:
+                stats["time_saved_s"] += max(0.0, _avg["seconds"] - elapsed)
+            if _avg["completion_tokens"] is not None:
+                stats["tokens_avoided"] += max(0, int(_avg["completion_tokens"]) - completion_tokens)
+        else:
+            stats["completed"] += 1
+            _ewma("seconds", elapsed)
+            _ewma("completion_tokens", completion_tokens)
+            if usage is not None and prompt_tokens:
+                _ewma("chars_per_token", prompt_chars / prompt_tokens)
+    return watcher.buffer, aborted
+
+
+def snapshot() -> dict:
+    with _lock:
+        return dict(
+            stats,
+            mode=MODE,
+            time_saved_s=round(stats["time_saved_s"], 2),
+            avg_completed_s=round(_avg["seconds"] or 0.0, 2),
+            avg_completion_tokens=round(_avg["completion_tokens"] or 0.0, 1),
+        )
+
+
+def summary():
+    s = snapshot()
+    if not s["streams"]:
+        return
+    print(
+        f"[INFO] 스트리밍 {s['streams']}건 중 조기 중단 {s['aborted']}건 "
+        f"→ 절약 추정 {s['time_saved_s']:.1f}s / 출력 토큰 {s['tokens_avoided']}개"
+    )
+
+
+tracing.register_section("llm_stream", snapshot)
+
+
+# ------------------------
+# 로컬 확인
+# ------------------------
+
+def selftest(rounds: int = 3):
+    """mock 스트림으로 양성/음성 응답을 번갈아 받아 조기 중단과 절약 통계를 확인."""
+    replies = {
+        "pos": _default_mock_reply({"messages": [{"content": "기사 본문: 출자사업"}]}),
+        "neg": _default_mock_reply({"messages": [{"content": "기사 본문: "}]}),
+    }
+    for i in range(rounds):
+        for kind in ("pos", "neg"):
+            client = MockClient(reply_fn=lambda _kw, r=replies[kind]: r)
+            text, aborted = stream_completion(
+                wire_schema.flag_key("lp_news"),
+                client=client,
+                model="mock",
+                messages=[{"role": "user", "content": "테스트 기사"}],
+            )
+            sent = client.streams[0].sent_chunks
+            total = -(-len(replies[kind]) // client.streams[0].chunk_chars)
+            print(f"[{kind}] 중단={aborted} 받은 조각 {sent}/{total} 텍스트={text[:40]!r}")
+            assert aborted == (kind == "neg"), "음성 응답만 중단되어야 함"
+            if not aborted:
+                json.loads(text)
+    summary()
+    print(json.dumps(snapshot(), ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM 스트리밍 조기 중단 도구")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_self = sub.add_parser("selftest", help="mock 스트림으로 조기 중단 확인")
+    p_self.add_argument("--rounds", type=int, default=3)
+    args = parser.parse_args()
+
+    selftest(args.rounds)
@@ -0,0 +1,269 @@
+"""
+저가 모델 우선 라우팅 (tiered).
+
+LLM_ROUTING=tiered 이면 요약 전에 싼 모델(CLASSIFIER_MODEL)에 펀드레이징/딜 여부만 물어본다.
+  - 아니라고(false) 충분히 확신하면(확률 ≥ ESCALATE_BELOW) 전체 추출 없이 바로 음성 처리
+  - 맞다고 했거나 확신이 낮으면 기존처럼 추출 모델(EXTRACTION_MODEL)로 전체 스키마 추출
+확신도는 응답 logprobs의 true/false 토큰 확률 (logprobs를 못 받으면 모델이 적은 confidence).
+
+오프라인 평가 (lp_news_master_log.csv의 is_fundraising 라벨 재생):
+  python model_router.py eval --limit 50
+  python model_router.py eval --limit 50 --baseline   # 추출 모델 단독 호출도 같이 측정
+기사 본문은 --cache-dir(기본 eval_cache/)에 저장해 두고 다음 평가부터 재사용.
+
+환경 변수
+  - LLM_ROUTING           : off(기본) / tiered
+  - LLM_CLASSIFIER_MODEL  : 1차 분류 모델 (기본 gpt-4.1-nano)
+  - LLM_EXTRACTION_MODEL  : 전체 추출 모델 (기본 gpt-4.1-mini)
+  - LLM_ESCALATE_BELOW    : 음성 판정을 그대로 믿을 최소 확률 (기본 0.85)
+"""
+import os
+import json
+import math
+import time
+import argparse
+import threading
+from typing import Optional, Tuple
+
+import csv_partitions
+import tracing
+import wire_schema
+from pipeline_context import chat_completion
+
+ROUTING = (os.environ.get("LLM_ROUTING") or "off").strip().lower()
+CLASSIFIER_MODEL = os.environ.get("LLM_CLASSIFIER_MODEL") or "gpt-4.1-nano"
+EXTRACTION_MODEL = os.environ.get("LLM_EXTRACTION_MODEL") or "gpt-4.1-mini"
+ESCALATE_BELOW = float(os.environ.get("LLM_ESCALATE_BELOW") or 0.85)
+CLASSIFIER_BODY_CHARS = 3000  # 분류에는 본문 앞부분만
+
+CLASSIFIER_PROMPTS = {
+    "lp_news": """
+너는 VC/PE 기사 분류기다. 기사 안에 '신규 펀드레이징 또는 출자사업'에 대한 구체 정보 블록이 있는지만 판별한다.
+
+true: 특정 차수/연도/프로그램명이 붙은 출자사업 또는 펀드가 명시되고, 그에 대한 구체적인 금액·자펀드 규모,
+      위탁운용사(GP) 선정, 클로징 완료/마감, 출자사업 공고 등의 사실이 있는 경우 (신규 결성, 추가 클로징 포함)
+false: 개별 기업 투자 집행, 과거 성과/통계 리뷰, 운용성과·엑시트, 기관 전략·조직·정책 동향,
+       '출자 규모를 키운다' 같은 추상적 계획만 있는 기사
+모호하면 false.
+
+JSON 한 개만 출력: {"flag": true 또는 false, "confidence": 0~1 사이 숫자}
+""",
+    "wowtale": """
+너는 스타트업 뉴스 분류기다. 이 기사가 실제 투자·펀딩·인수(M&A) 딜 한 건을 다루는지만 판별한다.
+투자 유치/인수 발표가 기사 핵심이면 true, 행사·인터뷰·정책·실적 등 딜이 없는 기사면 false.
+
+JSON 한 개만 출력: {"flag": true 또는 false, "confidence": 0~1 사이 숫자}
+""",
+}
+
+# 분류에서 음성으로 끝냈을 때 요약기에 돌려줄 결과
+NEGATIVE_RESULTS = {
+    "lp_news": {"is_fundraising": False},
+    "wowtale": {"deal_id": None, "is_deal": False},
+}
+
+_lock = threading.Lock()
+stats = {"screened": 0, "short_circuited": 0, "escalated": 0, "classifier_errors": 0}
+
+
+def _flag_probability(resp) -> Optional[float]:
+    """logprobs에서 true/false 토큰의 확률."""
+    try:
+        tokens = resp.choices[0].logprobs.content
+    except AttributeError:
+        return None
+    for t in tokens or []:
+        if t.token.strip().lower() in ("true", "false"):
+            return math.exp(t.logprob)
+    return None
+
+
+def classify(kind: str, title: str, body: str, budget=None, model: str = None) -> Tuple[bool, float]:
+    """(flag, 확신도)"""
+    flag, confidence, _ = _classify(kind, title, body, budget, model or CLASSIFIER_MODEL)
+    return flag, confidence
+
+
+def _classify(kind: str, title: str, body: str, budget, model: str):
+    resp = chat_completion(
+        budget=budget,
+        model=model,
+        messages=[
+            {"role": "system", "content": CLASSIFIER_PROMPTS[kind]},
+            {"role": "user", "content": f"[기사 제목]\n{title}\n\n[기사 본문]\n{body[:CLASSIFIER_BODY_CHARS]}"},
+        ],
+        response_format={"type": "json_object"},
+        temperature=0,
+        max_tokens=20,
+        logprobs=True,
+    )
+    data = wire_schema.loads(resp.choices[0].message.content)
+    flag = data.get("flag")
+    if isinstance(flag, str):
+        flag = flag.strip().lower() in ("true", "1", "yes", "y")
+    flag = bool(flag)
+
+    confidence = _flag_probability(resp)
+    if confidence is None:
+        try:
+            confidence = float(data.get("confidence"))
+        except (TypeError, ValueError):
+            confidence = 0.0
+    return flag, max(0.0, min(1.0, confidence)), resp
+
+
+def screen(kind: str, title: str, body: str, budget=None) -> Optional[dict]:
+    """
+    tiered 모드에서 확실한 음성이면 NEGATIVE_RESULTS[kind]를, 아니면 None(→ 추출 모델로 진행)을 반환.
+    off 모드거나 분류 호출이 실패해도 None.
+    """
+    if ROUTING != "tiered":
+        return None
+
+    with tracing.span("llm.screen", kind=kind, model=CLASSIFIER_MODEL) as attrs:
+        try:
+            flag, confidence = classify(kind, title, body, budget=budget)
+        except Exception as e:
+            print(f"[WARN] 1차 분류 실패 → 추출 모델로 진행: {e}")
+            with _lock:
+                stats["classifier_errors"] += 1
+            return None
+        attrs["flag"] = flag
+        attrs["confidence"] = round(confidence, 3)
+
+    with _lock:
+        stats["screened"] += 1
+        if not flag and confidence >= ESCALATE_BELOW:
+            stats["short_circuited"] += 1
+        else:
+            stats["escalated"] += 1
+    if not flag and confidence >= ESCALATE_BELOW:
+        print(f"[ROUTE] 1차 분류 음성 (p={confidence:.2f}) → 추출 생략")
+        return dict(NEGATIVE_RESULTS[kind])
+    return None
+
+
+def snapshot() -> dict:
+    with _lock:
+        return dict(stats, mode=ROUTING, classifier=CLASSIFIER_MODEL, extraction=EXTRACTION_MODEL)
+
+
+tracing.register_section("model_routing", snapshot)
+
+
+# ------------------------
+# 오프라인 평가
+# ------------------------
+
+def _load_article(url: str, cache_dir: str) -> Tuple[str, str]:
+    import hashlib
+
+    import LP_News_GPT_Auto
+
+    path = os.path.join(cache_dir, hashlib.sha1(url.encode("utf-8")).hexdigest()[:16] + ".json")
+    if os.path.exists(path):
+        with open(path, encoding="utf-8") as f:
+            cached = json.load(f)
+        return cached["title"], cached["body"]
+    title, body, _ = LP_News_GPT_Auto.extract_article_text(url)
+    os.makedirs(cache_dir, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"url": url, "title": title, "body": body}, f, ensure_ascii=False)
+    return title, body
+
+
+def _usage_cost(model: str, resp) -> Tuple[int, float]:
+    from summary_scheduler import estimate_cost
+
+    usage = getattr(resp, "usage", None)
+    p = getattr(usage, "prompt_tokens", 0) or 0
+    c = getattr(usage, "completion_tokens", 0) or 0
+    return p + c, estimate_cost(model, p, c)
+
+
+def evaluate(master_csv: str, limit: int, cache_dir: str, baseline: bool = False):
+    """master log 라벨 대비 1차 분류 일치율, 호출 latency, tiered 추정 비용 (baseline이면 추출 모델 단독과 비교)."""
+    import LP_News_GPT_Auto
+
+    rows = []
+    # migrate 이후 파티션 레이아웃 / 헤더보다 긴 예전 행도 csv_partitions가 제 컬럼으로 읽어 준다
+    for row in csv_partitions.iter_rows(master_csv):
+        label = (row.get("is_fundraising") or "").strip().lower()
+        if row.get("url") and label in ("true", "false"):
+            rows.append((row["url"], label == "true"))
+    rows = rows[-limit:] if limit else rows
+    print(f"[INFO] 평가 대상 {len(rows)}건 (양성 {sum(1 for _, y in rows if y)}건)")
+
+    confusion = {"tp": 0, "fp": 0, "tn": 0, "fn": 0}
+    short_circuit_fn = 0  # 음성으로 끝냈는데 실제로는 양성 (놓친 기사)
+    escalations = 0
+    cls_latency, cls_cost = [], 0.0  # 분류 호출
+    base_latency, base_cost = [], 0.0
+    base_agree = 0
+
+    for url, label in rows:
+        try:
+            title, body = _load_article(url, cache_dir)
+        except Exception as e:
+            print(f"[WARN] 본문 로드 실패 {url}: {e}")
+            continue
+
+        started = time.perf_counter()
+        flag, confidence, resp = _classify("lp_news", title, body, None, CLASSIFIER_MODEL)
+        cls_latency.append(time.perf_counter() - started)
+        _, cost = _usage_cost(CLASSIFIER_MODEL, resp)
+        cls_cost += cost
+
+        key = ("t" if flag == label else "f") + ("p" if flag else "n")
+        confusion[key] += 1
+        escalate = flag or confidence < ESCALATE_BELOW
+        escalations += int(escalate)
+        if not escalate and label:
+            short_circuit_fn += 1
+
+        if baseline:
+            started = time.perf_counter()
+            resp = chat_completion(
+                model=EXTRACTION_MODEL,
+                messages=LP_News_GPT_Auto.build_messages(title, body),
+                response_format={"type": "json_object"},
+                temperature=0.1,
+            )
+            base_latency.append(time.perf_counter() - started)
+            _, cost = _usage_cost(EXTRACTION_MODEL, resp)
+            base_cost += cost
+            data = LP_News_GPT_Auto.parse_response(resp.choices[0].message.content)
+            base_agree += int(bool(data.get("is_fundraising")) == label)
+
+    n = sum(confusion.values())
+    if not n:
+        print("[INFO] 평가한 기사가 없습니다.")
+        return
+
+    print(f"\n=== 1차 분류 평가 ({CLASSIFIER_MODEL}, 임계값 {ESCALATE_BELOW}) ===")
+    print(f"  일치율            {(confusion['tp'] + confusion['tn']) / n:.1%}  {confusion}")
+    print(f"  추출로 넘긴 비율  {escalations / n:.1%}")
+    print(f"  놓친 양성         {short_circuit_fn}건 (음성 확신으로 추출 생략했지만 라벨은 양성)")
+    print(f"  분류 latency      평균 {sum(cls_latency) / len(cls_latency):.2f}s")
+    print(f"  분류 비용         ${cls_cost:.4f} (기사당 ${cls_cost / n:.5f})")
+    if baseline and base_latency:
+        avg_base = base_cost / len(base_latency)
+        tiered = cls_cost + avg_base * escalations
+        print(f"\n=== 추출 모델 단독 ({EXTRACTION_MODEL}) ===")
+        print(f"  라벨 일치율       {base_agree / len(base_latency):.1%}")
+        print(f"  latency           평균 {sum(base_latency) / len(base_latency):.2f}s")
+        print(f"  비용              ${base_cost:.4f}")
+        print(f"  tiered 추정 비용  ${tiered:.4f} ({(1 - tiered / base_cost) if base_cost else 0:.0%} 절감)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="저가 모델 1차 분류 라우팅 도구")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_eval = sub.add_parser("eval", help="lp_news_master_log.csv 라벨로 1차 분류 평가")
+    p_eval.add_argument("--master", default="lp_news_master_log.csv")
+    p_eval.add_argument("--limit", type=int, default=50, help="최근 N건 (0이면 전체)")
+    p_eval.add_argument("--cache-dir", default="eval_cache")
+    p_eval.add_argument("--baseline", action="store_true", help="추출 모델 단독 호출도 측정")
+    args = parser.parse_args()
+
+    evaluate(args.master, args.limit, args.cache_dir, baseline=args.baseline)
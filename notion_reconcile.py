@@ -0,0 +1,221 @@
+"""
+Notion DB ↔ CSV 정합성 점검 + 중복 페이지 일괄 archive.
+
+DB마다 전체를 한 번만 스캔해서
+  1) 정규화 URL / Source ID 기준으로 페이지를 묶고,
+  2) 중복 그룹에서 남길 페이지를 결정적 규칙으로 고른 뒤 나머지를 archive (NotionWriter 경유),
+  3) CSV에는 있는데 Notion에 없는 행 / Notion에는 있는데 CSV에 없는 페이지를 리포트한다.
+
+남길 페이지 규칙 (앞에서부터 비교):
+  - 동기화 ledger가 가리키는 페이지
+  - created_time이 가장 이른 페이지 (사람이 단 코멘트/수정이 붙어 있을 가능성이 높음)
+  - page id 사전순
+
+사용법:
+  python notion_reconcile.py                 # lp_news + wowtale 리포트만
+  python notion_reconcile.py lp_news --archive
+  NOTION_DRY_RUN=true python notion_reconcile.py --archive   # archive 대상만 출력
+
+환경 변수
+  - lp_news : NOTION_API_KEY(또는 NOTION_TOKEN), NOTION_LP_NEWS_DB
+  - wowtale : NOTION_TOKEN, NOTION_DATABASE_ID
+  - NOTION_DRY_RUN : true면 archive 요청을 보내지 않고 출력만
+"""
+import os
+import json
+import argparse
+from typing import Dict, List, Optional
+
+import csv_partitions
+from notion_snapshot import NOTION_API_BASE, NotionIndex, property_text
+from notion_sync_ledger import SyncLedger
+from notion_writer import NotionWriter
+from url_utils import make_source_id
+
+NOTION_VERSION = "2022-06-28"
+DRY_RUN = (os.environ.get("NOTION_DRY_RUN", "").strip().lower() in {"1", "true", "yes", "y"})
+
+TARGETS: Dict[str, dict] = {
+    "lp_news": {
+        "token_env": ["NOTION_API_KEY", "NOTION_TOKEN"],
+        "database_env": "NOTION_LP_NEWS_DB",
+        "csv_path": "lp_news_summaries.csv",
+        "url_prop": "url",
+        "source_id_prop": "Source ID",
+        "csv_url_field": "url",
+        "csv_source_id_field": "Source ID",
+        "ledger_path": "lp_news_notion_ledger.json",
+        "dead_letter_path": "lp_news_notion_dead_letter.jsonl",
+    },
+    "wowtale": {
+        "token_env": ["NOTION_TOKEN"],
+        "database_env": "NOTION_DATABASE_ID",
+        "csv_path": "wowtale_deals.csv",
+        "url_prop": "기사 링크",
+        "source_id_prop": None,
+        "csv_url_field": "기사 링크",
+        "csv_source_id_field": None,
+        "ledger_path": None,
+        "dead_letter_path": "wowtale_notion_dead_letter.jsonl",
+    },
+}
+
+
+def _env_first(names: List[str]) -> str:
+    for name in names:
+        value = os.environ.get(name)
+        if value:
+            return value
+    raise KeyError(f"환경 변수가 필요합니다: {' 또는 '.join(names)}")
+
+
+def canonical_key(url_value: str, source_id: str = "") -> str:
+    """Source ID가 있으면 그대로, 없으면 정규화 URL 기반 Source ID."""
+    if source_id:
+        return source_id
+    if url_value:
+        return make_source_id(url_value)
+    return ""
+
+
+def page_key(page: dict, conf: dict) -> str:
+    source_id = property_text(page, conf["source_id_prop"]) if conf["source_id_prop"] else ""
+    return canonical_key(property_text(page, conf["url_prop"]), source_id)
+
+
+def row_key(row: dict, conf: dict) -> str:
+    source_id = (row.get(conf["csv_source_id_field"]) or "").strip() if conf["csv_source_id_field"] else ""
+    return canonical_key((row.get(conf["csv_url_field"]) or "").strip(), source_id)
+
+
+def choose_keeper(pages: List[dict], preferred_ids: set) -> dict:
+    return min(
+        pages,
+        key=lambda p: (
+            0 if p.get("id") in preferred_ids else 1,
+            p.get("created_time") or "",
+            p.get("id") or "",
+        ),
+    )
+
+
+def reconcile(name: str, archive: bool = False, dry_run: bool = DRY_RUN) -> dict:
+    conf = TARGETS[name]
+    headers = {
+        "Authorization": f"Bearer {_env_first(conf['token_env'])}",
+        "Content-Type": "application/json",
+        "Notion-Version": NOTION_VERSION,
+    }
+    database_id = _env_first([conf["database_env"]])
+
+    print(f"\n=== [{name}] Notion ↔ {conf['csv_path']} 점검 ===")
+    writer = NotionWriter(headers, dead_letter_path=conf["dead_letter_path"], dry_run=dry_run)
+    ledger: Optional[SyncLedger] = SyncLedger(conf["ledger_path"]) if conf["ledger_path"] else None
+    preferred_ids = {e.get("page_id") for e in ledger.rows.values()} if ledger else set()
+
+    try:
+        index = NotionIndex.load(
+            database_id,
+            headers,
+            writer=writer,
+            url_prop=conf["url_prop"],
+            source_id_prop=conf["source_id_prop"],
+        )
+
+        # 1) 페이지를 canonical key로 묶기 (DB 스캔 1번으로 끝)
+        groups: Dict[str, List[dict]] = {}
+        keyless: List[str] = []
+        for page in index.pages:
+            key = page_key(page, conf)
+            if not key:
+                keyless.append(page["id"])
+                continue
+            groups.setdefault(key, []).append(page)
+
+        # 2) 중복 그룹 정리 (archive 요청이 실제로 성공한 페이지만 archived_ids에 기록)
+        archived_ids: List[str] = []
+
+        def on_archived(result: dict, meta: dict):
+            archived_ids.append(meta["page_id"])
+
+        duplicate_groups = {k: v for k, v in groups.items() if len(v) > 1}
+        for key, pages in sorted(duplicate_groups.items()):
+            keeper = choose_keeper(pages, preferred_ids)
+            extras = [p["id"] for p in pages if p["id"] != keeper["id"]]
+            print(f"[DUP] {key}: {len(pages)}개 (keep={keeper['id']}, archive={len(extras)}개)")
+            if not archive:
+                continue
+            for pid in extras:
+                writer.submit(
+                    "PATCH",
+                    f"{NOTION_API_BASE}/pages/{pid}",
+                    {"archived": True},
+                    meta={"action": "archive", "page_id": pid},
+                    on_done=on_archived,
+                )
+        writer.drain()
+
+        # 3) CSV ↔ Notion 누락 비교
+        csv_keys: Dict[str, str] = {}
+        for row in csv_partitions.iter_rows(conf["csv_path"]):
+            key = row_key(row, conf)
+            if key:
+                csv_keys[key] = (row.get("Deal ID") or "").strip()
+
+        missing_in_notion = sorted(k for k in csv_keys if k not in groups)
+        missing_in_csv = sorted(k for k in groups if k not in csv_keys)
+    finally:
+        writer.close()
+
+    # archive한 페이지를 가리키는 ledger 항목은 지워서 다음 동기화 때 다시 매칭되게 함
+    if ledger is not None and archived_ids and not dry_run:
+        archived_set = set(archived_ids)
+        for key, entry in list(ledger.rows.items()):
+            if entry.get("page_id") in archived_set:
+                ledger.forget(key)
+        ledger.save()
+
+    for key in missing_in_notion:
+        print(f"[MISSING][NOTION] {key} (Deal ID={csv_keys[key] or '-'})")
+    for key in missing_in_csv:
+        print(f"[MISSING][CSV] {key} (page_id={groups[key][0]['id']})")
+
+    report = {
+        "target": name,
+        "pages": len(index.pages),
+        "csv_rows": len(csv_keys),
+        "duplicate_groups": len(duplicate_groups),
+        "archived": 0 if dry_run else len(archived_ids),
+        "archive_candidates": sum(len(v) - 1 for v in duplicate_groups.values()),
+        "keyless_pages": keyless,
+        "missing_in_notion": missing_in_notion,
+        "missing_in_csv": missing_in_csv,
+        "dry_run": dry_run,
+    }
+    print(
+        f"[INFO] [{name}] 페이지 {report['pages']}개, CSV {report['csv_rows']}행, "
+        f"중복 그룹 {report['duplicate_groups']}개 (archive {report['archived']}/{report['archive_candidates']}), "
+        f"Notion 누락 {len(missing_in_notion)}, CSV 누락 {len(missing_in_csv)}, 키 없는 페이지 {len(keyless)}"
+    )
+    return report
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Notion DB 중복 정리 + CSV 정합성 리포트")
+    parser.add_argument("targets", nargs="*", help=f"점검할 대상 ({', '.join(TARGETS)}, all; 기본: 전체)")
+    parser.add_argument("--archive", action="store_true", help="중복 페이지를 실제로 archive (NOTION_DRY_RUN=true면 출력만)")
+    parser.add_argument("--report", help="결과를 JSON 파일로 저장")
+    args = parser.parse_args()
+
+    # nargs="*" + choices는 인자가 없을 때 기본값 리스트를 choice로 검사해서 실패하므로 직접 검사
+    unknown = [t for t in args.targets if t not in TARGETS and t != "all"]
+    if unknown:
+        parser.error(f"알 수 없는 대상: {', '.join(unknown)} (가능: {', '.join(TARGETS)}, all)")
+    names = list(TARGETS) if not args.targets or "all" in args.targets else args.targets
+    print(f"Dry-run mode: {DRY_RUN} (set NOTION_DRY_RUN=true)")
+    reports = [reconcile(n, archive=args.archive) for n in names]
+
+    if args.report:
+        with open(args.report, "w", encoding="utf-8") as f:
+            json.dump(reports, f, ensure_ascii=False, indent=2)
+        print(f"[INFO] 리포트 저장 → {args.report}")
@@ -0,0 +1,136 @@
+"""
+Notion 데이터베이스 스냅샷 인덱스.
+
+동기화 시작 시 DB 전체를 databases/query로 한 번만 페이지네이션해서 읽고,
+url / Source ID / Deal ID 기준 in-memory 인덱스를 만든다.
+이후 행 단위 존재 여부 확인은 API 호출 없이 인덱스 조회로 끝난다.
+(~500행 기준: 행마다 1~2번 query → 전체 query 5~6번)
+"""
+from typing import Dict, List, Optional, Tuple
+
+import requests
+
+NOTION_API_BASE = "https://api.notion.com/v1"
+
+
+def query_all_pages(database_id: str, headers: dict, page_size: int = 100, writer=None) -> List[dict]:
+    """DB의 모든 (archived 아닌) 페이지를 start_cursor로 끝까지 읽어온다.
+
+    writer(NotionWriter)를 넘기면 같은 rate limit 버킷과 429/5xx 재시도를 거쳐 조회한다.
+    """
+    query_url = f"{NOTION_API_BASE}/databases/{database_id}/query"
+    payload: dict = {"page_size": page_size}
+
+    results: List[dict] = []
+    while True:
+        if writer is not None:
+            data = writer.call("POST", query_url, dict(payload))
+        else:
+            resp = requests.post(query_url, headers=headers, json=payload)
+            resp.raise_for_status()
+            data = resp.json()
+
+        results.extend(data.get("results", []))
+
+        if not data.get("has_more") or not data.get("next_cursor"):
+            break
+        payload["start_cursor"] = data["next_cursor"]
+
+    return results
+
+
+def property_text(page: dict, name: str) -> str:
+    """페이지 프로퍼티 값을 문자열로 꺼낸다. (title / rich_text / number / url / select 지원)"""
+    prop = (page.get("properties") or {}).get(name)
+    if not prop:
+        return ""
+
+    ptype = prop.get("type")
+    value = prop.get(ptype)
+    if value is None:
+        return ""
+
+    if ptype in ("title", "rich_text"):
+        return "".join((t.get("plain_text") or (t.get("text") or {}).get("content") or "") for t in value).strip()
+    if ptype == "number":
+        # 3.0 → "3" (CSV의 Deal ID 문자열과 비교하기 위해)
+        return str(int(value)) if float(value).is_integer() else str(value)
+    if ptype == "url":
+        return value.strip()
+    if ptype == "select":
+        return (value.get("name") or "").strip()
+    return ""
+
+
+class NotionIndex:
+    """
+    url / Source ID / Deal ID → 페이지 리스트 인덱스.
+    같은 키에 페이지가 여러 개면 Notion query 결과 순서 그대로 리스트에 쌓는다.
+    """
+
+    def __init__(
+        self,
+        pages: List[dict],
+        url_prop: str = "url",
+        source_id_prop: Optional[str] = "Source ID",
+        deal_id_prop: str = "Deal ID",
+    ):
+        self.url_prop = url_prop
+        self.source_id_prop = source_id_prop
+        self.deal_id_prop = deal_id_prop
+
+        self.pages: List[dict] = []
+        self.by_url: Dict[str, List[dict]] = {}
+        self.by_source_id: Dict[str, List[dict]] = {}
+        self.by_deal_id: Dict[str, List[dict]] = {}
+        self.by_page_id: Dict[str, dict] = {}
+
+        for page in pages:
+            self.add(page)
+
+    @classmethod
+    def load(cls, database_id: str, headers: dict, writer=None, **kwargs) -> "NotionIndex":
+        pages = query_all_pages(database_id, headers, writer=writer)
+        index = cls(pages, **kwargs)
+        print(
+            f"[INFO] Notion 스냅샷 로딩: 페이지 {len(pages)}개 "
+            f"(url {len(index.by_url)}, Source ID {len(index.by_source_id)}, Deal ID {len(index.by_deal_id)})"
+        )
+        return index
+
+    def add(self, page: dict):
+        """새로 만든 페이지를 인덱스에 반영 (같은 실행 안에서 중복 CREATE 방지)."""
+        if not page or not page.get("id"):
+            return
+        self.pages.append(page)
+        self.by_page_id[page["id"]] = page
+
+        url = property_text(page, self.url_prop)
+        if url:
+            self.by_url.setdefault(url, []).append(page)
+        if self.source_id_prop:
+            source_id = property_text(page, self.source_id_prop)
+            if source_id:
+                self.by_source_id.setdefault(source_id, []).append(page)
+        deal_id = property_text(page, self.deal_id_prop)
+        if deal_id:
+            self.by_deal_id.setdefault(deal_id, []).append(page)
+
+    def find_by_url(self, url_value: str) -> Tuple[Optional[dict], int]:
+        """(첫 번째 페이지 또는 None, 같은 url 페이지 수)"""
+        pages = self.by_url.get(url_value or "", [])
+        return (pages[0] if pages else None), len(pages)
+
+    def find_by_source_id(self, source_id: str) -> Optional[dict]:
+        pages = self.by_source_id.get(source_id or "", [])
+        return pages[0] if pages else None
+
+    def find_by_deal_id(self, deal_id) -> Optional[dict]:
+        pages = self.by_deal_id.get(str(deal_id) if deal_id is not None else "", [])
+        return pages[0] if pages else None
+
+    def has_page(self, page_id: str) -> bool:
+        return bool(page_id) and page_id in self.by_page_id
+
+    def pages_by_url(self, url_value: str) -> List[dict]:
+        return list(self.by_url.get(url_value or "", []))
@@ -0,0 +1,81 @@
+"""
+Notion 증분 동기화용 ledger.
+
+CSV 행별로 "마지막으로 Notion에 보낸 properties의 해시 + page_id"를 JSON 파일에 저장해 두고,
+다음 실행에서는 해시가 달라진 행(또는 새 행)만 API로 보낸다.
+
+ledger 파일 예시 (깃에 같이 커밋됨 → 3시간마다 도는 워크플로 사이에서 유지):
+  {
+    "version": 1,
+    "rows": {
+      "thebell:202512051422352520104664": {"hash": "…", "page_id": "…", "synced_at": "…"}
+    }
+  }
+"""
+import os
+import json
+import hashlib
+from datetime import datetime
+from typing import Optional
+
+LEDGER_VERSION = 1
+
+
+def properties_hash(properties: dict) -> str:
+    """Notion properties dict의 안정적인 해시 (키 순서와 무관)."""
+    raw = json.dumps(properties, ensure_ascii=False, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class SyncLedger:
+    def __init__(self, path: str):
+        self.path = path
+        self.rows: dict = {}
+        self.dirty = False
+        self._load()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("version") != LEDGER_VERSION:
+            # 포맷이 바뀌면 전체 재동기화 (한 번 전체 PATCH 하고 다시 쌓임)
+            print(f"[WARN] ledger 버전 불일치 → 무시하고 새로 작성: {self.path}")
+            return
+        self.rows = data.get("rows") or {}
+
+    def get(self, key: str) -> Optional[dict]:
+        return self.rows.get(key)
+
+    def is_unchanged(self, key: str, props_hash: str) -> bool:
+        entry = self.rows.get(key)
+        return bool(entry and entry.get("hash") == props_hash and entry.get("page_id"))
+
+    def record(self, key: str, props_hash: str, page_id: str):
+        self.rows[key] = {
+            "hash": props_hash,
+            "page_id": page_id,
+            "synced_at": datetime.now().isoformat(timespec="seconds"),
+        }
+        self.dirty = True
+
+    def forget(self, key: str):
+        if self.rows.pop(key, None) is not None:
+            self.dirty = True
+
+    def save(self):
+        if not self.dirty:
+            return
+        tmp = self.path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(
+                {"version": LEDGER_VERSION, "rows": self.rows},
+                f,
+                ensure_ascii=False,
+                indent=1,
+                sort_keys=True,
+            )
+            f.write("\n")
+        os.replace(tmp, self.path)
+        self.dirty = False
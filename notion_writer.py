@@ -0,0 +1,288 @@
+"""
+Notion API 동시 writer 풀 (토큰 버킷 rate limit + 429/Retry-After + 5xx 백오프 + dead-letter).
+
+- 토큰 버킷: Notion 평균 한도(~3 req/s)에 맞춰 모든 요청(스냅샷 query 포함)이 같은 버킷을 공유
+- 429: Retry-After 헤더만큼 버킷 전체를 멈춘 뒤 재시도
+- 5xx / 네트워크 오류: 지수 백오프(+jitter)로 재시도
+- 재시도를 다 써도 실패한 요청은 dead-letter JSONL에 남기고, 다음 실행 시작 때 먼저 재시도
+
+고정 sleep(0.3) 직렬 처리 대신 워커 여러 개가 버킷 속도에 맞춰 보내므로,
+처리량이 rate limit에 거의 붙고 429가 나도 행이 유실되지 않는다.
+
+환경 변수
+  - NOTION_RATE_LIMIT      : 초당 요청 수 (기본 3)
+  - NOTION_WRITER_WORKERS  : 동시 요청 워커 수 (기본 3)
+"""
+import os
+import json
+import time
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, List, Optional
+
+import requests
+
+import tracing
+
+NOTION_RATE_LIMIT = float(os.environ.get("NOTION_RATE_LIMIT") or 3.0)
+NOTION_WRITER_WORKERS = int(os.environ.get("NOTION_WRITER_WORKERS") or 3)
+
+MAX_RETRIES = 6
+BACKOFF_BASE = 1.0   # 초
+BACKOFF_MAX = 30.0   # 초
+
+
+class NotionRequestError(Exception):
+    """재시도 후에도 실패한 Notion 요청."""
+
+    def __init__(self, message: str, status: Optional[int] = None, body: str = "", retryable: bool = False):
+        super().__init__(message)
+        self.status = status
+        self.body = body
+        self.retryable = retryable
+
+
+class TokenBucket:
+    """스레드 안전 토큰 버킷. acquire()는 토큰이 생길 때까지 block."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = threading.Lock()
+
+    def pause(self, seconds: float):
+        """429 Retry-After 동안 모든 워커를 멈춘다."""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+            self.tokens = 0.0
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                if now < self.paused_until:
+                    wait_s = self.paused_until - now
+                else:
+                    self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                    self.updated = now
+                    if self.tokens >= 1.0:
+                        self.tokens -= 1.0
+                        return
+                    wait_s = (1.0 - self.tokens) / self.rate
+            time.sleep(wait_s)
+
+
+def _retry_after_seconds(resp: requests.Response, attempt: int) -> float:
+    raw = (resp.headers.get("Retry-After") or "").strip()
+    try:
+        return max(0.0, float(raw))
+    except ValueError:
+        return min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+
+
+class NotionWriter:
+    """
+    사용 예:
+        writer = NotionWriter(notion_headers(), dead_letter_path="lp_news_notion_dead_letter.jsonl")
+        writer.retry_dead_letters(on_done)
+        writer.submit("PATCH", url, payload, meta={...}, on_done=on_done)
+        writer.close()   # 남은 작업 대기 + dead-letter 저장
+    """
+
+    def __init__(
+        self,
+        headers: dict,
+        dead_letter_path: Optional[str] = None,
+        rate: float = NOTION_RATE_LIMIT,
+        max_workers: int = NOTION_WRITER_WORKERS,
+        dry_run: bool = False,
+        session: Optional[requests.Session] = None,
+    ):
+        self.headers = headers
+        self.dead_letter_path = dead_letter_path
+        self.bucket = TokenBucket(rate)
+        self.dry_run = dry_run
+        self.session = session or requests.Session()
+        self.pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="notion-writer")
+        self.futures: List[Future] = []
+        self.dead_letters: List[dict] = []
+        self.dead_letters_retried = False
+        self.lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "rate_limited": 0, "failed": 0, "dead_lettered": 0}
+
+    # ------------------------
+    # 동기 호출 (스냅샷 query 등)
+    # ------------------------
+
+    def call(self, method: str, url: str, payload: Optional[dict] = None) -> dict:
+        """rate limit + 재시도를 거쳐 요청 1개를 보내고 응답 JSON 반환. 실패 시 NotionRequestError."""
+        with tracing.span("notion.request", method=method, url=url) as attrs:
+            return self._call(method, url, payload, attrs)
+
+    def _call(self, method: str, url: str, payload: Optional[dict], attrs: dict) -> dict:
+        for attempt in range(MAX_RETRIES + 1):
+            attrs["attempts"] = attempt + 1
+            self.bucket.acquire()
+            with self.lock:
+                self.stats["requests"] += 1
+            try:
+                resp = self.session.request(method, url, headers=self.headers, json=payload, timeout=30)
+            except requests.exceptions.RequestException as e:
+                if attempt >= MAX_RETRIES:
+                    raise NotionRequestError(f"{method} {url} 네트워크 오류: {e}", retryable=True)
+                self._backoff(attempt)
+                continue
+
+            attrs["status"] = resp.status_code
+            if resp.status_code == 429:
+                delay = _retry_after_seconds(resp, attempt)
+                with self.lock:
+                    self.stats["rate_limited"] += 1
+                print(f"[WARN] Notion 429 → {delay:.1f}s 대기 후 재시도 ({method} {url})")
+                if attempt >= MAX_RETRIES:
+                    raise NotionRequestError(f"{method} {url} 429 재시도 초과", status=429, body=resp.text[:300], retryable=True)
+                self.bucket.pause(delay)
+                continue
+
+            if resp.status_code >= 500:
+                if attempt >= MAX_RETRIES:
+                    raise NotionRequestError(
+                        f"{method} {url} {resp.status_code} 재시도 초과",
+                        status=resp.status_code,
+                        body=resp.text[:300],
+                        retryable=True,
+                    )
+                self._backoff(attempt)
+                continue
+
+            if resp.status_code >= 400:
+                raise NotionRequestError(
+                    f"{method} {url} {resp.status_code}",
+                    status=resp.status_code,
+                    body=resp.text[:300],
+                    retryable=False,
+                )
+
+            return resp.json()
+
+        raise NotionRequestError(f"{method} {url} 재시도 초과", retryable=True)
+
+    def _backoff(self, attempt: int):
+        with self.lock:
+            self.stats["retries"] += 1
+        delay = min(BACKOFF_MAX, BACKOFF_BASE * (2 ** attempt))
+        time.sleep(delay * (0.5 + random.random() / 2))
+
+    # ------------------------
+    # 비동기 제출
+    # ------------------------
+
+    def submit(
+        self,
+        method: str,
+        url: str,
+        payload: Optional[dict] = None,
+        meta: Optional[dict] = None,
+        on_done: Optional[Callable[[dict, dict], None]] = None,
+    ) -> Future:
+        """
+        요청을 워커 풀에 넣는다.
+        성공하면 on_done(응답 JSON, meta)을 호출 (writer lock 안에서 호출되므로 콜백끼리는 직렬).
+        """
+        meta = meta or {}
+        stage = tracing.current_stage()
+
+        def task():
+            tracing.set_stage(stage)
+            if self.dry_run:
+                print(f"[DRY_RUN][{method}] {url}")
+                return None
+            try:
+                result = self.call(method, url, payload)
+            except NotionRequestError as e:
+                self._record_failure(method, url, payload, meta, e)
+                return None
+            if on_done is not None:
+                with self.lock:
+                    on_done(result, meta)
+            return result
+
+        future = self.pool.submit(task)
+        self.futures.append(future)
+        return future
+
+    def _record_failure(self, method: str, url: str, payload: Optional[dict], meta: dict, e: NotionRequestError):
+        with self.lock:
+            self.stats["failed"] += 1
+            print(f"[ERROR] Notion 요청 실패: {e} {e.body}")
+            if not e.retryable:
+                # 400 validation 같은 건 다시 보내도 똑같이 실패하므로 dead-letter에 넣지 않음
+                return
+            self.stats["dead_lettered"] += 1
+            self.dead_letters.append(
+                {
+                    "method": method,
+                    "url": url,
+                    "payload": payload,
+                    "meta": meta,
+                    "error": str(e),
+                    "status": e.status,
+                    "failed_at": datetime.now().isoformat(timespec="seconds"),
+                }
+            )
+
+    def drain(self):
+        """지금까지 제출한 작업이 모두 끝날 때까지 대기."""
+        pending = self.futures
+        self.futures = []
+        wait(pending)
+
+    # ------------------------
+    # dead-letter
+    # ------------------------
+
+    def retry_dead_letters(self, on_done: Optional[Callable[[dict, dict], None]] = None) -> int:
+        """지난 실행의 dead-letter를 읽어서 다시 제출. 다시 실패하면 이번 실행 dead-letter로 들어감."""
+        if not self.dead_letter_path or not os.path.exists(self.dead_letter_path):
+            return 0
+
+        entries = []
+        with open(self.dead_letter_path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    entries.append(json.loads(line))
+        # 파일은 close()에서 이번 실행 결과로 덮어쓴다 (중간에 죽어도 기존 항목이 남도록)
+        self.dead_letters_retried = True
+
+        if entries:
+            print(f"[INFO] 지난 실행 dead-letter {len(entries)}건 재시도")
+        for entry in entries:
+            self.submit(entry["method"], entry["url"], entry.get("payload"), meta=entry.get("meta"), on_done=on_done)
+        self.drain()
+        return len(entries)
+
+    def close(self):
+        self.drain()
+        self.pool.shutdown(wait=True)
+
+        if self.dead_letter_path:
+            if self.dead_letters:
+                mode = "w" if self.dead_letters_retried else "a"
+                with open(self.dead_letter_path, mode, encoding="utf-8") as f:
+                    for entry in self.dead_letters:
+                        f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+                print(f"[WARN] 실패 요청 {len(self.dead_letters)}건 → {self.dead_letter_path} (다음 실행에서 재시도)")
+            elif self.dead_letters_retried and os.path.exists(self.dead_letter_path):
+                os.remove(self.dead_letter_path)
+
+        s = self.stats
+        print(
+            f"[INFO] Notion writer: 요청 {s['requests']}건, 재시도 {s['retries']}건, "
+            f"429 {s['rate_limited']}건, 실패 {s['failed']}건 (dead-letter {s['dead_lettered']}건)"
+        )
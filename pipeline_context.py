@@ -0,0 +1,129 @@
+"""
+파이프라인 공용 클라이언트.
+
+run_pipeline.py로 여러 단계를 한 프로세스에서 돌릴 때
+HTTP 커넥션 풀(requests.Session)과 OpenAI 클라이언트를 단계끼리 공유하기 위한 lazy 싱글턴.
+각 스크립트를 단독으로 실행해도 같은 함수로 만들어 쓰므로 동작은 동일하다.
+
+fetch / parse_html / chat_completion은 위 클라이언트를 쓰면서 tracing span을 남기는 얇은 래퍼.
+"""
+import os
+import time
+import threading
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+import host_limiter
+import tracing
+
+FETCH_RETRIES = 2  # 429 / 503 재시도 횟수
+
+_lock = threading.Lock()
+_http_session = None
+_openai_client = None
+
+
+def http_session() -> requests.Session:
+    """스크래퍼/기사 본문 fetch용 공유 세션 (keep-alive 커넥션 재사용)."""
+    global _http_session
+    with _lock:
+        if _http_session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=8, pool_maxsize=16)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _http_session = session
+        return _http_session
+
+
+def openai_client():
+    """OpenAI 클라이언트 (환경변수 OPENAI_API_KEY 필요). 처음 쓸 때 만든다."""
+    global _openai_client
+    with _lock:
+        if _openai_client is None:
+            from openai import OpenAI
+
+            _openai_client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+        return _openai_client
+
+
+# ------------------------
+# span을 남기는 공용 호출
+# ------------------------
+
+def _retry_after(res: requests.Response, attempt: int) -> float:
+    value = (res.headers or {}).get("Retry-After")
+    try:
+        return min(60.0, max(0.0, float(value)))
+    except (TypeError, ValueError):
+        return float(2 ** (attempt + 1))
+
+
+def fetch(url: str, method: str = "GET", **kwargs) -> requests.Response:
+    """
+    공유 세션으로 HTTP 요청 (span: http.request, 속성 url/host/status/bytes).
+    호스트별 AIMD 한도(host_limiter) 안에서 보내고, 429/503은 Retry-After(없으면 백오프) 후 재시도.
+    """
+    host = urlparse(url).netloc
+    limiter = host_limiter.limiter_for(host)
+    for attempt in range(FETCH_RETRIES + 1):
+        limiter.acquire()
+        started = time.perf_counter()
+        try:
+            with tracing.span("http.request", url=url, host=host, method=method) as attrs:
+                res = http_session().request(method, url, **kwargs)
+                attrs["status"] = res.status_code
+                attrs["bytes"] = len(res.content or b"")
+        except Exception:
+            limiter.release(time.perf_counter() - started, error=True)
+            raise
+
+        throttled = res.status_code in (429, 503)
+        delay = _retry_after(res, attempt) if throttled else 0.0
+        limiter.release(time.perf_counter() - started, status=res.status_code, retry_after=delay)
+        if not throttled or attempt >= FETCH_RETRIES:
+            return res
+        # 다음 acquire가 Retry-After 동안 이 호스트 요청을 막아 둔다
+        print(f"[WARN] {host} {res.status_code} → {delay:.0f}s 후 재시도 ({attempt + 1}/{FETCH_RETRIES})")
+    return res
+
+
+def parse_html(html: str, url: str = ""):
+    """BeautifulSoup 파싱 (span: html.parse)."""
+    from bs4 import BeautifulSoup
+
+    with tracing.span("html.parse", url=url, chars=len(html or "")):
+        return BeautifulSoup(html, "html.parser")
+
+
+def cached_tokens(usage) -> int:
+    """usage.prompt_tokens_details.cached_tokens (provider prompt-prefix 캐시 적중 토큰, 없으면 0)."""
+    details = getattr(usage, "prompt_tokens_details", None)
+    return getattr(details, "cached_tokens", 0) or 0
+
+
+def chat_completion(budget=None, prompt=None, **kwargs):
+    """
+    OpenAI chat completion (span: llm.call, 속성 model/토큰 수/캐시 적중 토큰 수).
+    budget(summary_scheduler.SummaryBudget)이 있으면 응답 usage를 예산에 반영.
+    prompt(prompt_templates.PromptTemplate)가 있으면 템플릿별 캐시 적중률/latency를 기록.
+    """
+    model = kwargs.get("model", "")
+    with tracing.span("llm.call", model=model) as attrs:
+        if prompt is not None:
+            attrs["prompt"] = prompt.id
+        started = time.perf_counter()
+        resp = openai_client().chat.completions.create(**kwargs)
+        elapsed = time.perf_counter() - started
+        usage = getattr(resp, "usage", None)
+        if usage is not None:
+            attrs["prompt_tokens"] = getattr(usage, "prompt_tokens", 0) or 0
+            attrs["completion_tokens"] = getattr(usage, "completion_tokens", 0) or 0
+            attrs["cached_tokens"] = cached_tokens(usage)
+            if budget is not None:
+                budget.charge(model, attrs["prompt_tokens"], attrs["completion_tokens"])
+            if prompt is not None:
+                prompt.observe(attrs["prompt_tokens"], attrs["cached_tokens"], elapsed)
+    return resp
@@ -0,0 +1,129 @@
+"""
+버전 관리되는 프롬프트 템플릿 (provider prompt-prefix 캐시용 배치).
+
+OpenAI는 요청 앞부분(1024토큰 이상)이 이전 요청과 바이트 단위로 같으면 그 부분을 캐시해서
+입력 토큰 비용과 첫 토큰 latency를 줄인다. 그래서 템플릿은
+  - system: 지시문 + 출력 스키마 + 예시 (정적, 기사마다 절대 바뀌지 않는 문자열)
+  - user  : 기사 제목/본문 등 가변 내용 (맨 뒤)
+두 부분으로만 구성하고, 기사마다 달라지는 값은 user 템플릿에만 넣는다.
+정적 부분의 해시(fingerprint)를 리포트에 남기므로 실행 간 prefix가 바뀌었는지 바로 보인다.
+지시문/스키마를 고치면 version을 올린다 (리포트에서 버전별로 캐시 적중률 비교).
+
+호출마다 usage.prompt_tokens_details.cached_tokens를 모아 실행 리포트의 prompt_cache 섹션에
+템플릿별 적중률(cached / prompt tokens)과 캐시 적중/미적중 호출의 평균 latency를 기록한다.
+
+  python prompt_templates.py show   # 등록된 템플릿, fingerprint, 정적 prefix 길이(추정 토큰)
+"""
+import sys
+import hashlib
+import argparse
+import threading
+from typing import Dict, List, Optional
+
+import tracing
+
+MIN_CACHEABLE_TOKENS = 1024  # 이보다 짧은 prefix는 캐시되지 않음
+
+_lock = threading.Lock()
+_registry: Dict[str, "PromptTemplate"] = {}
+_stats: Dict[str, dict] = {}
+
+
+class PromptTemplate:
+    def __init__(self, name: str, version: str, system: str, user: str):
+        self.name = name
+        self.version = version
+        self.system = system
+        self.user = user
+        self.id = f"{name}@{version}"
+        self.fingerprint = hashlib.sha1(system.encode("utf-8")).hexdigest()[:10]
+        with _lock:
+            _registry[self.id] = self
+
+    def render(self, **fields) -> List[dict]:
+        """정적 system + 가변 user 메시지. 가변 값은 user 템플릿에만 들어간다."""
+        return [
+            {"role": "system", "content": self.system},
+            {"role": "user", "content": self.user.format(**fields)},
+        ]
+
+    def observe(self, prompt_tokens: int, cached_tokens: int, seconds: float):
+        with _lock:
+            s = _stats.setdefault(
+                self.id,
+                {
+                    "fingerprint": self.fingerprint,
+                    "calls": 0,
+                    "prompt_tokens": 0,
+                    "cached_tokens": 0,
+                    "cached_calls": 0,
+                    "cached_seconds": 0.0,
+                    "uncached_seconds": 0.0,
+                },
+            )
+            s["calls"] += 1
+            s["prompt_tokens"] += int(prompt_tokens or 0)
+            s["cached_tokens"] += int(cached_tokens or 0)
+            if cached_tokens:
+                s["cached_calls"] += 1
+                s["cached_seconds"] += seconds
+            else:
+                s["uncached_seconds"] += seconds
+
+
+def estimate_tokens(text: str) -> int:
+    # 한국어 위주 기준 대략 2글자 = 1토큰
+    return (len(text) + 1) // 2
+
+
+def snapshot() -> dict:
+    with _lock:
+        out = {}
+        for tid, s in _stats.items():
+            uncached_calls = s["calls"] - s["cached_calls"]
+            out[tid] = {
+                "fingerprint": s["fingerprint"],
+                "calls": s["calls"],
+                "prompt_tokens": s["prompt_tokens"],
+                "cached_tokens": s["cached_tokens"],
+                "hit_rate": round(s["cached_tokens"] / s["prompt_tokens"], 3) if s["prompt_tokens"] else 0.0,
+                "cached_calls": s["cached_calls"],
+                "avg_s_cached": round(s["cached_seconds"] / s["cached_calls"], 3) if s["cached_calls"] else None,
+                "avg_s_uncached": round(s["uncached_seconds"] / uncached_calls, 3) if uncached_calls else None,
+            }
+        return out
+
+
+tracing.register_section("prompt_cache", snapshot)
+
+
+def get(template_id: str) -> Optional[PromptTemplate]:
+    with _lock:
+        return _registry.get(template_id)
+
+
+def show():
+    # 스크립트로 실행하면 이 파일은 __main__ → 템플릿은 import된 prompt_templates 모듈 쪽에 등록된다
+    import prompt_templates
+    import LP_News_GPT_Auto  # noqa: F401  (import 시 템플릿 등록)
+    import wowtale_GPT_auto
+
+    wowtale_GPT_auto.extraction_prompt()
+
+    print(f"{'template':<28} {'fingerprint':<12} {'static chars':>12} {'~tokens':>8}")
+    with prompt_templates._lock:
+        templates = sorted(prompt_templates._registry.values(), key=lambda t: t.id)
+    for t in templates:
+        tokens = estimate_tokens(t.system)
+        note = "" if tokens >= MIN_CACHEABLE_TOKENS else f"  (< {MIN_CACHEABLE_TOKENS}: 캐시 안 될 수 있음)"
+        print(f"{t.id:<28} {t.fingerprint:<12} {len(t.system):>12} {tokens:>8}{note}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="프롬프트 템플릿 도구")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("show", help="등록된 템플릿과 정적 prefix 정보")
+    args = parser.parse_args()
+
+    show()
+    sys.exit(0)
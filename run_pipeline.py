@@ -0,0 +1,152 @@
+"""
+6단계 파이프라인을 한 프로세스에서 실행하는 러너.
+
+  wowtale_scrape → wowtale_gpt → wowtale_notion
+  lp_scrape      → lp_gpt      → lp_notion
+
+- 두 체인은 데이터를 공유하지 않으므로 stage_scheduler가 동시에 실행한다.
+  한 단계가 실패/timeout이면 그 단계에 의존하는 단계만 건너뛰고 다른 체인은 계속 진행.
+
+- bs4/openai/requests import, HTTP 커넥션 풀, OpenAI 클라이언트를 단계끼리 공유 (pipeline_context)
+- wowtale은 수집 단계의 새 URL 리스트를 메모리로 요약 단계에 넘긴다.
+  LP 요약과 두 Notion 동기화는 일부러 CSV 전체를 다시 읽는다:
+    - lp_gpt: lp_news_links.csv 자체가 요약 큐라서 이번 수집분뿐 아니라
+      예산 초과로 미룬 URL까지 함께 처리해야 한다 (backfill 큐에서도 SUMMARY_BACKFILL_PER_RUN건).
+    - *_notion: ledger와 비교해 바뀐 행만 보내고 지난 실패분 재전송/중복 정리도 하므로
+      이번 실행에서 새로 생긴 행만으로는 부족하다.
+  이 재읽기는 csv_partitions 캐시 덕분에 앞 단계가 방금 쓴 파일을 다시 파싱하지 않는다.
+- 각 스크립트는 기존처럼 단독 실행도 가능하다 (python wowtale_auto.py 등).
+- 실행이 끝나면 단계별 시간 + HTTP/파싱/LLM/CSV/Notion span 통계(p50/p90/p99)를
+  JSON 리포트(기본 run_report.json)로 남긴다 (tracing.py).
+
+사용법:
+  python run_pipeline.py
+  python run_pipeline.py --stages lp_scrape,lp_gpt,lp_notion
+  python run_pipeline.py --skip wowtale_notion,lp_notion
+  python run_pipeline.py --watch      # 상시 실행 모드 (watch_pipeline.py)
+  python run_pipeline.py --report reports/run.json
+  PROFILE_STAGE=lp_gpt python run_pipeline.py   # 한 단계만 cProfile (tracing.py 참고)
+"""
+import os
+import sys
+import argparse
+from typing import Dict, List
+
+import LP_News_Auto
+import LP_News_GPT_Auto
+import sync_lp_news_to_notion
+import sync_wowtale_to_notion
+import wowtale_auto
+import wowtale_GPT_auto
+import tracing
+from stage_scheduler import Stage, critical_path, run_dag
+from summary_scheduler import BACKFILL_PER_RUN
+
+RUN_REPORT = os.environ.get("RUN_REPORT") or "run_report.json"
+
+
+def stage_wowtale_scrape(state: dict):
+    state["wowtale_urls"] = wowtale_auto.run(max_pages=4)
+
+
+def stage_wowtale_gpt(state: dict):
+    urls = state.get("wowtale_urls")
+    latest_rows = [{"url": u} for u in urls] if urls is not None else None
+    # 배치 실행이므로 수집 결과를 넘겨도 미룬 기사 / backfill 큐(SUMMARY_BACKFILL_PER_RUN건)까지 이어서 처리
+    wowtale_GPT_auto.main(latest_rows=latest_rows, backfill_limit=BACKFILL_PER_RUN, backlog=True)
+
+
+def stage_wowtale_notion(state: dict):
+    # 새 행만이 아니라 CSV 전체를 ledger와 비교해야 하므로 요약 단계 결과 대신 CSV를 읽음
+    sync_wowtale_to_notion.run()
+
+
+def stage_lp_scrape(state: dict):
+    LP_News_Auto.run(max_pages=3)
+
+
+def stage_lp_gpt(state: dict):
+    # 큐는 lp_news_links.csv 전체 (미룬 URL 포함) + backfill 큐 일부 → 수집 단계 결과를 넘기지 않음
+    LP_News_GPT_Auto.main()
+
+
+def stage_lp_notion(state: dict):
+    sync_lp_news_to_notion.run()
+
+
+# 단계 정의: (함수, 의존 단계, timeout 초)
+STAGES: Dict[str, Stage] = {
+    s.name: s
+    for s in [
+        Stage("wowtale_scrape", stage_wowtale_scrape, [], timeout=5 * 60),
+        Stage("wowtale_gpt", stage_wowtale_gpt, ["wowtale_scrape"], timeout=30 * 60),
+        Stage("wowtale_notion", stage_wowtale_notion, ["wowtale_gpt"], timeout=15 * 60),
+        Stage("lp_scrape", stage_lp_scrape, [], timeout=5 * 60),
+        Stage("lp_gpt", stage_lp_gpt, ["lp_scrape"], timeout=30 * 60),
+        Stage("lp_notion", stage_lp_notion, ["lp_gpt"], timeout=15 * 60),
+    ]
+}
+
+
+def run(stages: List[str], max_workers: int = 4, report_path: str = RUN_REPORT) -> dict:
+    """
+    선택한 단계만으로 그래프를 만들어 실행.
+    선택에서 빠진 단계에 대한 의존은 끊는다 (예: --skip wowtale_scrape면 wowtale_gpt는 기존 CSV로 실행).
+    반환값: 단계끼리 주고받은 state dict (+ "_results": 단계별 StageResult)
+    report_path가 있으면 실행 리포트 JSON 저장.
+    """
+    selected = set(stages)
+    graph = [
+        Stage(s.name, s.func, [d for d in s.deps if d in selected], s.timeout)
+        for s in STAGES.values()
+        if s.name in selected
+    ]
+    state: dict = {}
+    results = run_dag(graph, state, max_workers=max_workers)
+    state["_results"] = results
+
+    if report_path:
+        path, path_time = critical_path(graph, results)
+        tracing.write_report(
+            report_path,
+            extra={
+                "pipeline": {
+                    name: {"status": r.status, "seconds": round(r.elapsed, 3), "error": r.error}
+                    for name, r in results.items()
+                },
+                "critical_path": {"stages": path, "seconds": round(path_time, 3)},
+            },
+        )
+    return state
+
+
+def _split(value: str) -> List[str]:
+    names = [v.strip() for v in (value or "").split(",") if v.strip()]
+    unknown = [n for n in names if n not in STAGES]
+    if unknown:
+        raise SystemExit(f"알 수 없는 단계: {', '.join(unknown)} (가능: {', '.join(STAGES)})")
+    return names
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="wowtale + LP News 파이프라인 단일 프로세스 실행")
+    parser.add_argument("--stages", help="실행할 단계 (쉼표 구분, 기본: 전체)")
+    parser.add_argument("--skip", help="건너뛸 단계 (쉼표 구분)")
+    parser.add_argument("--max-workers", type=int, default=4, help="동시에 실행할 단계 수 (1이면 순차 실행)")
+    parser.add_argument("--watch", action="store_true", help="소스별 적응형 폴링으로 상시 실행")
+    parser.add_argument("--report", default=RUN_REPORT, help="실행 리포트 JSON 경로 (빈 문자열이면 저장 안 함)")
+    args = parser.parse_args()
+
+    if args.watch:
+        import watch_pipeline
+
+        watch_pipeline.watch(report_path=args.report)
+        sys.exit(0)
+
+    selected = _split(args.stages) if args.stages else list(STAGES)
+    skipped = set(_split(args.skip)) if args.skip else set()
+    state = run([s for s in selected if s not in skipped], max_workers=args.max_workers, report_path=args.report)
+
+    # 실패한 단계가 있으면 CI에서 보이도록 종료 코드 1 (성공한 브랜치 결과는 이미 CSV에 반영됨)
+    if any(r.status != "ok" for r in state["_results"].values()):
+        sys.exit(1)
@@ -0,0 +1,277 @@
+"""
+요약 / 주요 사업부문 / 기사 본문 전문 검색 인덱스 (SQLite FTS5, trigram 토크나이저).
+
+"딥테크", "세컨더리" 같은 주제로 과거 기사를 찾을 때 CSV를 grep 하던 것을 로컬 인덱스로 바꾼다.
+한국어는 띄어쓰기/조사 때문에 단어 단위 토크나이저가 잘 안 맞아서 글자 3-gram(trigram)으로 색인한다
+("세컨더리펀드에" 안의 "세컨더리"도 찾힘). SQLite 3.34+ 내장 기능이라 추가 의존성 없음.
+
+색인 대상 (문서 하나 = 요약 CSV 한 행, (데이터셋, Deal ID)로 식별)
+  - lp_news : 기사 제목 / 요약 / LP·운용사·펀드명 / 본문
+  - wowtale : 투자 받는 회사 / 주요 사업부문·비고 / 투자사 / 본문
+본문은 요약 CSV에 저장하지 않으므로 요약 단계에서 받아 둔 본문을 remember_body(url, ...)로 넘겨 두고,
+append_summary / append_summaries가 행을 쓸 때 index_rows로 같이 색인한다 (매 실행 증분).
+인덱스가 생기기 전 행은 `sync`로 CSV 컬럼만 색인한다 (본문 없음).
+파일이 본문 크기의 수 배라 git에는 올리지 않고 워크플로에서 Actions 캐시로 이어 쓴다.
+
+  python search_index.py sync                      # 아직 색인 안 된 CSV 행 추가
+  python search_index.py query 딥테크 세컨더리      # 두 단어 모두 포함, 관련도 순
+  python search_index.py query 세컨더리 --dataset lp_news --limit 5
+  python search_index.py query '"AI 반도체" OR 로보틱스' --raw   # FTS5 문법 그대로
+  python search_index.py stats
+
+검색어는 공백으로 나눈 각 단어를 모두 포함하는 문서를 bm25 순으로 돌려준다 (제목 > 요약/이름 > 본문 가중치).
+trigram은 3글자 미만 단어를 색인으로 못 찾으므로 "펀드" 같은 두 글자 검색어는 LIKE 조건으로 거른다
+(다른 3글자 이상 단어가 있으면 그 결과 안에서만, 두 글자 단어뿐이면 전체 스캔).
+
+환경 변수
+  - SEARCH_DB         : 인덱스 파일 경로 (기본 search_index.db)
+  - SEARCH_BODY_CHARS : 본문 색인 최대 글자 수 (기본 10000, 0이면 본문 색인 안 함)
+"""
+import os
+import json
+import time
+import sqlite3
+import argparse
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import csv_partitions
+import tracing
+
+SEARCH_DB = os.environ.get("SEARCH_DB") or "search_index.db"
+BODY_CHARS = int(os.environ.get("SEARCH_BODY_CHARS") or 10000)
+
+# 데이터셋 → 요약 CSV 컬럼 매핑 (FTS 컬럼: title / summary / names / body)
+DATASETS = {
+    "lp_news": {
+        "csv": "lp_news_summaries.csv",
+        "encoding": "utf-8-sig",
+        "title": ["기사 제목"],
+        "summary": ["요약"],
+        "names": ["LP", "운용사", "펀드명"],
+        "date": "기사 작성일",
+        "url": "url",
+    },
+    "wowtale": {
+        "csv": "wowtale_deals.csv",
+        "encoding": "utf-8",
+        "title": ["투자 받는 회사 (Target / Startup)"],
+        "summary": ["주요 사업부문", "비고"],
+        "names": ["투자사 (Investor)"],
+        "date": "기사 날짜",
+        "url": "기사 링크",
+    },
+}
+# bm25 가중치 (title, summary, names, body)
+WEIGHTS = (4.0, 2.0, 2.0, 1.0)
+MIN_TRIGRAM = 3
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    dataset TEXT NOT NULL,
+    deal_id INTEGER NOT NULL,
+    date TEXT,
+    url TEXT,
+    has_body INTEGER DEFAULT 0,
+    UNIQUE (dataset, deal_id)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(title, summary, names, body, tokenize='trigram');
+"""
+
+_lock = threading.Lock()
+_write_lock = threading.Lock()  # wowtale / LP 체인이 동시에 쓰므로 쓰기는 한 번에 하나
+_bodies: Dict[str, dict] = {}
+stats = {"indexed": 0, "with_body": 0, "queries": 0, "query_s": 0.0}
+
+
+def connect(path: Optional[str] = None) -> sqlite3.Connection:
+    conn = sqlite3.connect(path or SEARCH_DB)
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def remember_body(url: str, body: str, title: str = ""):
+    """요약 단계에서 받은 본문을 행이 CSV에 쓰일 때까지 보관 (index_rows에서 꺼내 씀)."""
+    if url and BODY_CHARS > 0:
+        with _lock:
+            _bodies[url] = {"body": (body or "")[:BODY_CHARS], "title": title or ""}
+
+
+def _join(row: dict, columns: List[str]) -> str:
+    return "\n".join(str(row.get(c) or "") for c in columns if row.get(c))
+
+
+def _upsert(conn: sqlite3.Connection, dataset: str, row: dict, body: str = "", title: str = "") -> bool:
+    spec = DATASETS[dataset]
+    try:
+        deal_id = int(row.get("Deal ID"))
+    except (TypeError, ValueError):
+        return False
+    # 기사 제목이 CSV에 없는 wowtale은 요약 단계에서 받은 제목을 앞에 붙인다
+    title = "\n".join(t for t in (title, _join(row, spec["title"])) if t)
+    cur = conn.execute("SELECT id FROM docs WHERE dataset = ? AND deal_id = ?", (dataset, deal_id))
+    found = cur.fetchone()
+    if found is not None:
+        if not body:
+            # 본문 없이 다시 색인하는 경우(예: 행 수정) 기존 본문 유지
+            body = conn.execute("SELECT body FROM docs_fts WHERE rowid = ?", (found[0],)).fetchone()[0] or ""
+        conn.execute("DELETE FROM docs_fts WHERE rowid = ?", (found[0],))
+        conn.execute("DELETE FROM docs WHERE id = ?", (found[0],))
+    cur = conn.execute(
+        "INSERT INTO docs (dataset, deal_id, date, url, has_body) VALUES (?, ?, ?, ?, ?)",
+        (dataset, deal_id, row.get(spec["date"]) or "", row.get(spec["url"]) or "", int(bool(body))),
+    )
+    conn.execute(
+        "INSERT INTO docs_fts (rowid, title, summary, names, body) VALUES (?, ?, ?, ?, ?)",
+        (cur.lastrowid, title, _join(row, spec["summary"]), _join(row, spec["names"]), body),
+    )
+    with _lock:
+        stats["indexed"] += 1
+        stats["with_body"] += int(bool(body))
+    return True
+
+
+def index_rows(dataset: str, rows: Iterable[dict]):
+    """요약 CSV에 방금 쓴 행들을 색인 (append_summary / append_summaries에서 호출)."""
+    spec = DATASETS[dataset]
+    with _lock:
+        pending = [(row, _bodies.pop(row.get(spec["url"]) or "", {})) for row in rows]
+    with tracing.span("search_index.write", dataset=dataset, rows=len(pending)):
+        with _write_lock:
+            conn = connect()
+            try:
+                with conn:
+                    for row, extra in pending:
+                        _upsert(conn, dataset, row, body=extra.get("body", ""), title=extra.get("title", ""))
+            finally:
+                conn.close()
+
+
+def sync(datasets: Optional[List[str]] = None) -> Dict[str, int]:
+    """요약 CSV에서 아직 색인 안 된 행 추가 (이미 있는 행/본문은 그대로)."""
+    added = {}
+    with _write_lock:
+        conn = connect()
+        try:
+            for dataset in datasets or list(DATASETS):
+                spec = DATASETS[dataset]
+                if not csv_partitions.exists(spec["csv"]):
+                    continue
+                known = {r[0] for r in conn.execute("SELECT deal_id FROM docs WHERE dataset = ?", (dataset,))}
+                count = 0
+                with conn:
+                    for row in csv_partitions.iter_rows(spec["csv"], encoding=spec["encoding"]):
+                        deal_id = csv_partitions._parse_id(row.get("Deal ID"))
+                        if deal_id is not None and deal_id not in known and _upsert(conn, dataset, row):
+                            known.add(deal_id)
+                            count += 1
+                added[dataset] = count
+        finally:
+            conn.close()
+    return added
+
+
+# ------------------------
+# 검색
+# ------------------------
+
+def _fts_query(text: str) -> str:
+    """'딥테크 세컨더리' → '"딥테크" "세컨더리"' (각 단어를 구문으로, 모두 포함)."""
+    return " ".join('"' + term.replace('"', '""') + '"' for term in text.split())
+
+
+def search(text: str, dataset: Optional[str] = None, limit: int = 20, raw: bool = False,
+           conn: Optional[sqlite3.Connection] = None) -> List[dict]:
+    """검색어 → [{dataset, deal_id, date, url, title, snippet, score}] (관련도 순)."""
+    own = conn is None
+    conn = conn or connect()
+    started = time.perf_counter()
+    try:
+        where, params = [], []
+        terms = [text] if raw else text.split()
+        short = [t for t in terms if not raw and len(t) < MIN_TRIGRAM]
+        indexed = [t for t in terms if t not in short]
+        if indexed:
+            where.append("docs_fts MATCH ?")
+            params.append(text if raw else _fts_query(" ".join(indexed)))
+            score = "bm25(docs_fts, %s, %s, %s, %s)" % WEIGHTS
+        else:
+            score = "0.0"
+        # 3글자 미만 단어는 trigram 색인으로 못 찾음 → LIKE로 거른다 (단독이면 전체 스캔, 순위 없음)
+        for term in short:
+            where.append("(docs_fts.title LIKE ? OR summary LIKE ? OR names LIKE ? OR body LIKE ?)")
+            params += [f"%{term}%"] * 4
+        if dataset:
+            where.append("docs.dataset = ?")
+            params.append(dataset)
+        sql = (
+            f"SELECT docs.dataset, docs.deal_id, docs.date, docs.url, docs_fts.title, "
+            f"snippet(docs_fts, -1, '[', ']', '…', 40), {score} AS score "
+            f"FROM docs_fts JOIN docs ON docs.id = docs_fts.rowid "
+            f"WHERE {' AND '.join(where)} ORDER BY score, docs.date DESC LIMIT ?"
+        )
+        rows = conn.execute(sql, params + [limit]).fetchall()
+    finally:
+        if own:
+            conn.close()
+    with _lock:
+        stats["queries"] += 1
+        stats["query_s"] += time.perf_counter() - started
+    keys = ["dataset", "deal_id", "date", "url", "title", "snippet", "score"]
+    return [dict(zip(keys, r), title=(r[4] or "").split("\n")[0], score=round(r[6], 3)) for r in rows]
+
+
+def snapshot() -> dict:
+    with _lock:
+        out = dict(stats)
+    out["avg_query_ms"] = round(out["query_s"] / out["queries"] * 1000, 2) if out["queries"] else None
+    return out
+
+
+tracing.register_section("search_index", snapshot)
+
+
+def _print_stats():
+    conn = connect()
+    try:
+        for dataset, docs, bodies in conn.execute(
+            "SELECT dataset, COUNT(*), SUM(has_body) FROM docs GROUP BY dataset ORDER BY dataset"
+        ):
+            print(f"{dataset:<8} 문서 {docs:>6}건 (본문 포함 {bodies or 0}건)")
+    finally:
+        conn.close()
+    size = os.path.getsize(SEARCH_DB) if os.path.exists(SEARCH_DB) else 0
+    print(f"{SEARCH_DB}: {size / 1024 / 1024:.1f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="요약/기사 본문 전문 검색")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("sync", help="아직 색인 안 된 요약 CSV 행 추가")
+    p_query = sub.add_parser("query", help="검색 (관련도 순)")
+    p_query.add_argument("text", nargs="+")
+    p_query.add_argument("--dataset", choices=list(DATASETS))
+    p_query.add_argument("--limit", type=int, default=20)
+    p_query.add_argument("--raw", action="store_true", help="FTS5 MATCH 문법 그대로 사용")
+    p_query.add_argument("--json", action="store_true", help="JSON Lines로 출력")
+    sub.add_parser("stats", help="색인 문서 수 / 파일 크기")
+    args = parser.parse_args()
+
+    if args.cmd == "sync":
+        print(f"[INFO] 색인 추가: {sync()}")
+    elif args.cmd == "query":
+        text = " ".join(args.text)
+        started = time.perf_counter()
+        results = search(text, dataset=args.dataset, limit=args.limit, raw=args.raw)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for r in results:
+            if args.json:
+                print(json.dumps(r, ensure_ascii=False))
+            else:
+                print(f"{r['score']:>8} {r['dataset']:<8} #{r['deal_id']:<5} {r['date']:<10} {r['title']}")
+                print(f"         {r['snippet']}")
+        if not args.json:
+            print(f"[INFO] {len(results)}건 ({elapsed_ms:.1f} ms)")
+    else:
+        _print_stats()
@@ -0,0 +1,217 @@
+"""
+의존성 그래프(DAG) 기반 단계 스케줄러.
+
+- 의존 단계가 모두 성공한 단계부터 스레드로 실행 → 서로 독립인 브랜치(wowtale / LP News)는 동시에 돈다
+- 단계별 timeout: 시간을 넘기면 실패로 보고 그 단계에 의존하는 단계만 건너뜀
+  (파이썬 스레드는 강제 종료가 안 되므로 넘긴 단계에는 중단 요청만 보낸다.
+   요약 루프는 budget.stop_reason() 옆에서 cancel_reason()을 보고 남은 기사를 다음 실행으로 미룬 뒤 끝난다.
+   run_dag는 돌아가기 전에 그런 스레드를 STAGE_CANCEL_GRACE초까지 기다려 CSV 쓰기 도중에 프로세스가 끝나지 않게 한다)
+- 실패/timeout은 의존하는 단계만 skip, 다른 브랜치는 계속 진행
+- 끝나면 단계별 시간, 전체 wall time, 단계 시간 합계, critical path(가장 긴 의존 경로)를 리포트
+
+환경 변수
+  - STAGE_CANCEL_GRACE : timeout 난 단계가 안전하게 멈출 때까지 기다릴 최대 초 (기본 120)
+"""
+import os
+import time
+import queue
+import threading
+import traceback
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+import tracing
+
+CANCEL_GRACE = float(os.environ.get("STAGE_CANCEL_GRACE") or 120)
+
+# 단계 스레드마다 자기 중단 요청 Event를 들고 있음 (run_dag 밖에서 단독 실행하면 없음)
+_local = threading.local()
+
+
+def cancel_reason() -> str:
+    """지금 스레드에서 도는 단계가 timeout으로 중단 요청을 받았으면 이유 문자열, 아니면 빈 문자열."""
+    event = getattr(_local, "cancel", None)
+    if event is not None and event.is_set():
+        return "단계 timeout으로 중단 요청"
+    return ""
+
+
+@dataclass
+class Stage:
+    name: str
+    func: Callable[[dict], None]
+    deps: List[str] = field(default_factory=list)
+    timeout: Optional[float] = None  # 초, None이면 무제한
+
+
+@dataclass
+class StageResult:
+    name: str
+    status: str = "pending"  # ok / failed / timeout / skipped
+    started: Optional[float] = None
+    finished: Optional[float] = None
+    error: str = ""
+
+    @property
+    def elapsed(self) -> float:
+        if self.started is None or self.finished is None:
+            return 0.0
+        return self.finished - self.started
+
+
+def _validate(stages: List[Stage]):
+    names = {s.name for s in stages}
+    for s in stages:
+        for d in s.deps:
+            if d not in names:
+                raise ValueError(f"[{s.name}] 알 수 없는 의존 단계: {d}")
+
+    # 순환 검사 (Kahn)
+    indegree = {s.name: len(s.deps) for s in stages}
+    children: Dict[str, List[str]] = {s.name: [] for s in stages}
+    for s in stages:
+        for d in s.deps:
+            children[d].append(s.name)
+    ready = [n for n, k in indegree.items() if k == 0]
+    seen = 0
+    while ready:
+        n = ready.pop()
+        seen += 1
+        for c in children[n]:
+            indegree[c] -= 1
+            if indegree[c] == 0:
+                ready.append(c)
+    if seen != len(stages):
+        raise ValueError("단계 의존성에 순환이 있습니다.")
+
+
+def run_dag(stages: List[Stage], state: dict, max_workers: int = 4) -> Dict[str, StageResult]:
+    _validate(stages)
+    by_name = {s.name: s for s in stages}
+    results = {s.name: StageResult(s.name) for s in stages}
+    done_q: "queue.Queue[tuple]" = queue.Queue()
+    running: Dict[str, float] = {}  # name → deadline (monotonic) 또는 inf
+
+    cancels: Dict[str, threading.Event] = {}
+    threads: Dict[str, threading.Thread] = {}
+
+    def worker(stage: Stage, cancel: threading.Event):
+        _local.cancel = cancel
+        try:
+            with tracing.stage(stage.name):
+                stage.func(state)
+            done_q.put((stage.name, "ok", ""))
+        except Exception as e:
+            traceback.print_exc()
+            done_q.put((stage.name, "failed", f"{type(e).__name__}: {e}"))
+
+    def finish(name: str, status: str, error: str = ""):
+        r = results[name]
+        r.status = status
+        r.finished = time.perf_counter()
+        r.error = error
+        running.pop(name, None)
+        if status == "ok":
+            print(f"[INFO] [{name}] 완료 ({r.elapsed:.1f}s)")
+        else:
+            print(f"[ERROR] [{name}] {status} ({r.elapsed:.1f}s) {error}")
+
+    def skip_blocked():
+        # 의존 단계가 실패/timeout/skip이면 그 단계도 skip (연쇄)
+        changed = True
+        while changed:
+            changed = False
+            for s in stages:
+                r = results[s.name]
+                if r.status != "pending":
+                    continue
+                bad = [d for d in s.deps if results[d].status in ("failed", "timeout", "skipped")]
+                if bad:
+                    r.status = "skipped"
+                    r.error = f"의존 단계 실패: {', '.join(bad)}"
+                    print(f"[SKIP] [{s.name}] {r.error}")
+                    changed = True
+
+    wall_start = time.perf_counter()
+    while True:
+        skip_blocked()
+
+        # 실행 가능한 단계 시작
+        for s in stages:
+            r = results[s.name]
+            if r.status != "pending" or len(running) >= max_workers:
+                continue
+            if all(results[d].status == "ok" for d in s.deps):
+                r.status = "running"
+                r.started = time.perf_counter()
+                running[s.name] = time.monotonic() + s.timeout if s.timeout else float("inf")
+                print(f"\n########## [{s.name}] 시작 ##########")
+                cancels[s.name] = threading.Event()
+                threads[s.name] = threading.Thread(
+                    target=worker, args=(s, cancels[s.name]), name=f"stage-{s.name}", daemon=True
+                )
+                threads[s.name].start()
+
+        if not running:
+            break
+
+        # 가장 가까운 deadline까지 완료 이벤트 대기
+        next_deadline = min(running.values())
+        wait_s = None if next_deadline == float("inf") else max(0.0, next_deadline - time.monotonic())
+        try:
+            name, status, error = done_q.get(timeout=wait_s)
+            if name in running:
+                finish(name, status, error)
+        except queue.Empty:
+            now = time.monotonic()
+            for name, deadline in list(running.items()):
+                if deadline <= now:
+                    cancels[name].set()
+                    finish(name, "timeout", f"{by_name[name].timeout:.0f}s 초과")
+
+    _wait_cancelled(stages, results, threads)
+    wall = time.perf_counter() - wall_start
+    _print_report(stages, results, wall)
+    return results
+
+
+def _wait_cancelled(stages: List[Stage], results: Dict[str, StageResult], threads: Dict[str, threading.Thread]):
+    """timeout 난 단계 스레드가 현재 기사 처리/CSV 쓰기를 마치고 빠져나올 때까지 CANCEL_GRACE초 안에서 기다림."""
+    deadline = time.monotonic() + CANCEL_GRACE
+    for s in stages:
+        thread = threads.get(s.name)
+        if results[s.name].status != "timeout" or thread is None or not thread.is_alive():
+            continue
+        print(f"[INFO] [{s.name}] 중단 요청 → 안전하게 멈출 때까지 대기 (최대 {CANCEL_GRACE:.0f}s)")
+        thread.join(max(0.0, deadline - time.monotonic()))
+        if thread.is_alive():
+            print(f"[WARN] [{s.name}] {CANCEL_GRACE:.0f}s 안에 멈추지 않음 → 프로세스 종료 시 중단됨")
+
+
+def critical_path(stages: List[Stage], results: Dict[str, StageResult]) -> (List[str], float):
+    """실행된 단계 시간 기준 가장 긴 의존 경로."""
+    best: Dict[str, tuple] = {}
+
+    def visit(name: str) -> tuple:
+        if name in best:
+            return best[name]
+        stage = next(s for s in stages if s.name == name)
+        prev = max((visit(d) for d in stage.deps), key=lambda t: t[1], default=([], 0.0))
+        best[name] = (prev[0] + [name], prev[1] + results[name].elapsed)
+        return best[name]
+
+    paths = [visit(s.name) for s in stages]
+    return max(paths, key=lambda t: t[1], default=([], 0.0))
+
+
+def _print_report(stages: List[Stage], results: Dict[str, StageResult], wall: float):
+    total = sum(r.elapsed for r in results.values())
+    path, path_time = critical_path(stages, results)
+
+    print("\n=== 파이프라인 완료 ===")
+    for s in stages:
+        r = results[s.name]
+        print(f"  {s.name:<16} {r.status:<8} {r.elapsed:7.1f}s {r.error}")
+    print(f"  wall time        {wall:7.1f}s")
+    print(f"  단계 시간 합계   {total:7.1f}s")
+    print(f"  critical path    {path_time:7.1f}s ({' → '.join(path)})")
@@ -0,0 +1,275 @@
+"""
+요약(GPT) 작업의 시간/비용 예산 스케줄러.
+
+크롤링에서 밀린 기사가 한꺼번에 쏟아져도(예: max_pages 상향) 한 번 실행에 다 처리하려다
+job timeout이나 하루 토큰 예산을 넘기지 않도록:
+
+- 처리 순서: 지난 실행에서 미룬 기사(저장된 순서 그대로) → 새 기사
+  새 기사는 제목 키워드 매칭 수가 많은 순, 같으면 최신 기사 순
+  (날짜는 행의 날짜 컬럼 → URL의 thebell key= / wowtale /YYYY/MM/DD/ 순으로 추정)
+- 기사 1건 시작 전에 남은 시간과 남은 토큰/비용이 "지금까지 기사 1건 평균"보다 적으면 깔끔하게 멈춤
+- 남은 기사는 summary_queue.json에 순서대로 저장 → 다음 실행이 그 자리부터 이어서 처리
+- 하루(KST) 누적 토큰/비용도 같은 파일에 저장 → 여러 번 실행해도 하루 예산을 같이 쓴다
+  (run_pipeline.py에서 wowtale / LP News 요약이 동시에 돌면 둘이 같은 예산을 공유)
+
+환경 변수
+  - SUMMARY_DEADLINE_SECONDS : 한 번 실행에서 요약에 쓸 최대 시간 (기본 1500 = 25분, gpt 단계 timeout 30분 안쪽)
+  - SUMMARY_DAILY_TOKENS     : 하루 최대 토큰 수 (기본 0 = 무제한)
+  - SUMMARY_DAILY_COST_USD   : 하루 최대 비용 USD (기본 0 = 무제한)
+  - SUMMARY_BACKFILL_PER_RUN : 한 번 실행에서 backfill 큐(backfill_crawler.py)에서 가져올 최대 기사 수 (기본 50)
+                               기사를 직접 넘긴 호출(watch_pipeline 등)은 backfill도, 미룬 큐도 건드리지 않는다
+"""
+import os
+import re
+import json
+import time
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional
+
+QUEUE_PATH = "summary_queue.json"
+QUEUE_VERSION = 1
+
+DEADLINE_SECONDS = float(os.environ.get("SUMMARY_DEADLINE_SECONDS") or 1500)
+DAILY_TOKENS = int(os.environ.get("SUMMARY_DAILY_TOKENS") or 0)
+DAILY_COST_USD = float(os.environ.get("SUMMARY_DAILY_COST_USD") or 0)
+BACKFILL_PER_RUN = int(os.environ.get("SUMMARY_BACKFILL_PER_RUN") or 50)
+
+# USD / 1M tokens (input, output)
+MODEL_PRICES = {
+    "gpt-4.1-mini": (0.40, 1.60),
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4.1": (2.00, 8.00),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+KST = timezone(timedelta(hours=9))
+
+_lock = threading.Lock()
+_daily: Optional[dict] = None  # {"date", "tokens", "cost_usd"} 프로세스 전체 공유
+
+
+def _today() -> str:
+    return datetime.now(KST).strftime("%Y-%m-%d")
+
+
+def _load(path: str) -> dict:
+    if not os.path.exists(path):
+        return {"version": QUEUE_VERSION, "usage": {}, "queues": {}, "avg": {}}
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    data.setdefault("usage", {})
+    data.setdefault("queues", {})
+    data.setdefault("avg", {})
+    return data
+
+
+def _save(path: str, data: dict):
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def _daily_usage(path: str) -> dict:
+    """오늘 누적 사용량 (lock 안에서 호출)."""
+    global _daily
+    today = _today()
+    if _daily is None or _daily["date"] != today:
+        usage = _load(path).get("usage") or {}
+        if usage.get("date") == today:
+            _daily = {"date": today, "tokens": int(usage.get("tokens") or 0), "cost_usd": float(usage.get("cost_usd") or 0)}
+        else:
+            _daily = {"date": today, "tokens": 0, "cost_usd": 0.0}
+    return _daily
+
+
+def estimate_cost(model: str, prompt_tokens: int, completion_tokens: int) -> float:
+    price_in, price_out = MODEL_PRICES.get(model, MODEL_PRICES["gpt-4.1-mini"])
+    return (prompt_tokens * price_in + completion_tokens * price_out) / 1_000_000
+
+
+# ------------------------
+# 처리 순서
+# ------------------------
+
+_ROW_DATE_RE = re.compile(r"(20\d{2})[.\-/년\s]+(\d{1,2})[.\-/월\s]+(\d{1,2})")
+_THEBELL_KEY_RE = re.compile(r"[?&]key=(20\d{6})")
+_WOWTALE_PATH_RE = re.compile(r"wowtale\.net/(20\d{2})/(\d{2})/(\d{2})/")
+
+DATE_FIELDS = ["기사 작성일", "기사 날짜", "article_date", "date"]
+TITLE_FIELDS = ["title", "기사 제목"]
+
+
+def recency_key(row: dict, url: str) -> str:
+    """YYYYMMDD (모르면 빈 문자열)."""
+    for field in DATE_FIELDS:
+        m = _ROW_DATE_RE.search(row.get(field) or "")
+        if m:
+            return f"{m.group(1)}{int(m.group(2)):02d}{int(m.group(3)):02d}"
+    m = _THEBELL_KEY_RE.search(url)
+    if m:
+        return m.group(1)
+    m = _WOWTALE_PATH_RE.search(url)
+    if m:
+        return "".join(m.groups())
+    return ""
+
+
+def keyword_score(row: dict, keywords: List[str]) -> int:
+    title = next((row.get(f) for f in TITLE_FIELDS if row.get(f)), "") or ""
+    return sum(1 for kw in keywords if kw in title)
+
+
+def order_backlog(
+    name: str,
+    rows: List[dict],
+    url_of: Callable[[dict], str],
+    keywords: Optional[List[str]] = None,
+    processed: Optional[set] = None,
+    path: str = QUEUE_PATH,
+    include_saved: bool = True,
+) -> List[dict]:
+    """
+    이번 실행의 처리 순서.
+    rows는 아직 처리 안 된 기사만 (입력 순서가 뒤일수록 최근에 수집된 것으로 본다).
+    지난 실행에서 미룬 기사는 rows에 없어도 저장된 행으로 다시 넣는다 (목록 페이지에서 밀려난 경우 대비).
+    processed: 그 사이 다른 실행에서 처리된 URL (저장된 큐에서 제외)
+    include_saved=False: 미룬 기사는 건드리지 않고 rows만 정렬 (finish(keep_saved=True)와 짝)
+    """
+    keywords = keywords or []
+    processed = processed or set()
+    saved: List[dict] = []
+    if include_saved:
+        with _lock:
+            saved = _load(path)["queues"].get(name) or []
+
+    by_url: Dict[str, dict] = {}
+    for r in rows:
+        u = url_of(r)
+        if u and u not in by_url:
+            by_url[u] = r
+
+    ordered: List[dict] = []
+    seen = set()
+    for r in saved:
+        u = url_of(r)
+        if not u or u in seen or u in processed:
+            continue
+        ordered.append(by_url.get(u, r))
+        seen.add(u)
+
+    fresh = [(i, r) for i, r in enumerate(rows) if url_of(r) and url_of(r) not in seen]
+    fresh.sort(key=lambda t: (keyword_score(t[1], keywords), recency_key(t[1], url_of(t[1])), t[0]), reverse=True)
+    for _, r in fresh:
+        u = url_of(r)
+        if u in seen:
+            continue
+        ordered.append(r)
+        seen.add(u)
+
+    if seen and saved:
+        print(f"[INFO] [{name}] 지난 실행에서 미룬 기사부터 처리 (저장된 큐 {len(saved)}건)")
+    return ordered
+
+
+# ------------------------
+# 예산
+# ------------------------
+
+class SummaryBudget:
+    """한 번 실행(한 요약기)의 시간 예산 + 하루 토큰/비용 예산."""
+
+    def __init__(
+        self,
+        name: str,
+        deadline_seconds: float = DEADLINE_SECONDS,
+        daily_tokens: int = DAILY_TOKENS,
+        daily_cost_usd: float = DAILY_COST_USD,
+        path: str = QUEUE_PATH,
+    ):
+        self.name = name
+        self.path = path
+        self.deadline = time.monotonic() + deadline_seconds if deadline_seconds > 0 else None
+        self.daily_tokens = daily_tokens
+        self.daily_cost_usd = daily_cost_usd
+        self.tokens = 0
+        self.cost_usd = 0.0
+        self.items = 0
+        self.item_seconds = 0.0
+        with _lock:
+            avg = _load(path)["avg"].get(name) or {}
+            _daily_usage(path)
+        # 이번 실행에서 아직 처리한 기사가 없을 때 쓰는 1건 평균 (지난 실행 기록)
+        self.prior_tokens = float(avg.get("tokens") or 0)
+        self.prior_seconds = float(avg.get("seconds") or 0)
+
+    def charge(self, model: str, prompt_tokens: int, completion_tokens: int):
+        """LLM 응답 usage 반영 (pipeline_context.chat_completion에서 호출)."""
+        tokens = int(prompt_tokens or 0) + int(completion_tokens or 0)
+        cost = estimate_cost(model, int(prompt_tokens or 0), int(completion_tokens or 0))
+        with _lock:
+            self.tokens += tokens
+            self.cost_usd += cost
+            daily = _daily_usage(self.path)
+            daily["tokens"] += tokens
+            daily["cost_usd"] += cost
+
+    def item_done(self, seconds: float):
+        self.items += 1
+        self.item_seconds += seconds
+
+    def _avg_tokens(self) -> float:
+        return self.tokens / self.items if self.items else self.prior_tokens
+
+    def _avg_seconds(self) -> float:
+        return self.item_seconds / self.items if self.items else self.prior_seconds
+
+    def stop_reason(self) -> str:
+        """다음 기사를 시작하면 안 되는 이유 (계속해도 되면 빈 문자열)."""
+        if self.deadline is not None:
+            remaining = self.deadline - time.monotonic()
+            if remaining <= self._avg_seconds():
+                return f"시간 예산 소진 (남은 {max(remaining, 0):.0f}s, 기사당 평균 {self._avg_seconds():.0f}s)"
+
+        with _lock:
+            daily = dict(_daily_usage(self.path))
+        avg_tokens = self._avg_tokens()
+        if self.daily_tokens and daily["tokens"] + avg_tokens > self.daily_tokens:
+            return f"하루 토큰 예산 소진 ({daily['tokens']:,}/{self.daily_tokens:,})"
+        if self.daily_cost_usd:
+            avg_cost = self.cost_usd / self.items if self.items else estimate_cost("gpt-4.1-mini", int(avg_tokens), 0)
+            if daily["cost_usd"] + avg_cost > self.daily_cost_usd:
+                return f"하루 비용 예산 소진 (${daily['cost_usd']:.3f}/${self.daily_cost_usd:.2f})"
+        return ""
+
+    def finish(self, deferred: List[dict], keep_saved: bool = False):
+        """
+        남은 기사 순서, 오늘 사용량, 기사당 평균을 저장.
+        keep_saved=True면 저장된 큐를 덮어쓰지 않고 deferred를 뒤에 붙인다 (order_backlog(include_saved=False)와 짝).
+        """
+        with _lock:
+            data = _load(self.path)
+            data["version"] = QUEUE_VERSION
+            if keep_saved:
+                saved = data["queues"].get(self.name) or []
+                urls = {r.get("url") for r in saved}
+                deferred = saved + [r for r in deferred if r.get("url") not in urls]
+            if deferred:
+                data["queues"][self.name] = deferred
+            else:
+                data["queues"].pop(self.name, None)
+            daily = _daily_usage(self.path)
+            data["usage"] = {"date": daily["date"], "tokens": daily["tokens"], "cost_usd": round(daily["cost_usd"], 6)}
+            if self.items:
+                data["avg"][self.name] = {
+                    "tokens": round(self.tokens / self.items, 1),
+                    "seconds": round(self.item_seconds / self.items, 2),
+                }
+            _save(self.path, data)
+
+        print(
+            f"[INFO] [{self.name}] 요약 {self.items}건, 토큰 {self.tokens:,}, 약 ${self.cost_usd:.4f}"
+            + (f", 다음 실행으로 미룸 {len(deferred)}건" if deferred else "")
+        )
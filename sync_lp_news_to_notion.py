@@ -1,8 +1,11 @@
 import os
-import csv
 import requests
 from datetime import datetime
-from time import sleep
+
+import csv_partitions
+from notion_snapshot import NotionIndex
+from notion_sync_ledger import SyncLedger, properties_hash
+from notion_writer import NotionRequestError, NotionWriter
 
 """
 lp_news_summaries.csv → Notion 데이터베이스 동기화 스크립트
@@ -29,18 +32,25 @@ lp_news_summaries.csv → Notion 데이터베이스 동기화 스크립트
   - NOTION_LP_NEWS_DB    : 동기화 대상 데이터베이스 ID
 """
 
-NOTION_TOKEN = os.environ.get("NOTION_API_KEY") or os.environ["NOTION_TOKEN"]
-NOTION_DATABASE_ID = os.environ["NOTION_LP_NEWS_DB"]
+# run_pipeline.py가 import만 해도 죽지 않도록 여기서는 .get, 실제 검사는 run()에서
+NOTION_TOKEN = os.environ.get("NOTION_API_KEY") or os.environ.get("NOTION_TOKEN", "")
+NOTION_DATABASE_ID = os.environ.get("NOTION_LP_NEWS_DB", "")
 
 # Optional duplicate cleanup
 ARCHIVE_DUPLICATES = (os.environ.get("NOTION_ARCHIVE_DUPLICATES", "").strip().lower() in {"1", "true", "yes", "y"})
 DRY_RUN = (os.environ.get("NOTION_DRY_RUN", "").strip().lower() in {"1", "true", "yes", "y"})
+# ledger를 무시하고 모든 행을 다시 PATCH (Notion 쪽 스키마를 바꿨을 때 등)
+FULL_SYNC = (os.environ.get("NOTION_FULL_SYNC", "").strip().lower() in {"1", "true", "yes", "y"})
 
 NOTION_API_BASE = "https://api.notion.com/v1"
 NOTION_VERSION = "2022-06-28"
 
 # 깃에 올라갈 CSV 파일 이름/경로 (필요하면 여기만 바꿔서 사용)
 CSV_PATH = "lp_news_summaries.csv"
+# 행별 properties 해시 + page_id (증분 동기화용, 깃에 같이 커밋)
+LEDGER_PATH = "lp_news_notion_ledger.json"
+# 재시도 후에도 실패한 요청 (다음 실행에서 먼저 재시도, 깃에 같이 커밋)
+DEAD_LETTER_PATH = "lp_news_notion_dead_letter.jsonl"
 
 
 # ------------------------
@@ -281,113 +291,11 @@ def build_properties_from_row(row: dict) -> dict:
 # Notion API helpers
 # ------------------------
 
-def find_page_by_deal_id(deal_id: str):
-    """
-    Deal ID가 같은 페이지가 Notion DB에 이미 있는지 조회.
-    - Notion DB에서 'Deal ID' 프로퍼티는 rich_text 타입이어야 함.
-    """
-    if not deal_id:
-        return None
-
-    url = f"{NOTION_API_BASE}/databases/{NOTION_DATABASE_ID}/query"
-    payload = {
-        "filter": {
-            "property": "Deal ID",
-            "rich_text": {
-                "equals": deal_id
-            },
-        },
-        "page_size": 1,
-    }
-
-    resp = requests.post(url, headers=notion_headers(), json=payload)
-    resp.raise_for_status()
-    data = resp.json()
-
-    results = data.get("results", [])
-    if not results:
-        return None
-    return results[0]  # 첫 번째 결과 반환
-
-
-def list_pages_by_url(url_value: str):
-    """Return all pages in the DB whose `url` property equals url_value.
-
-    Notion DB must have a `url` property of type url.
-    """
-    if not url_value:
-        return []
-
-    query_url = f"{NOTION_API_BASE}/databases/{NOTION_DATABASE_ID}/query"
-    payload = {
-        "filter": {
-            "property": "url",
-            "url": {"equals": url_value},
-        },
-        "page_size": 100,
-    }
-
-    results = []
-    next_cursor = None
-    while True:
-        if next_cursor:
-            payload["start_cursor"] = next_cursor
-        elif "start_cursor" in payload:
-            payload.pop("start_cursor", None)
-
-        resp = requests.post(query_url, headers=notion_headers(), json=payload)
-        resp.raise_for_status()
-        data = resp.json()
-
-        batch = data.get("results", [])
-        if batch:
-            results.extend(batch)
-
-        if not data.get("has_more"):
-            break
-        next_cursor = data.get("next_cursor")
-        if not next_cursor:
-            break
-
-    return results
-
+def archive_page_in_notion(page_id: str, writer=None):
+    """Archive a Notion page (soft-delete) by setting archived=true.
 
-def find_page_by_url(url_value: str):
-    """Backward-compatible helper.
-
-    Returns (first_page_or_None, count).
+    With a NotionWriter the request is queued on the rate-limited pool instead of sent inline.
     """
-    pages = list_pages_by_url(url_value)
-    if not pages:
-        return None, 0
-    return pages[0], len(pages)
-
-
-def create_page_in_notion(row: dict):
-    properties = build_properties_from_row(row)
-    payload = {
-        "parent": {"database_id": NOTION_DATABASE_ID},
-        "properties": properties,
-    }
-    url = f"{NOTION_API_BASE}/pages"
-    resp = requests.post(url, headers=notion_headers(), json=payload)
-    resp.raise_for_status()
-    return resp.json()
-
-
-def update_page_in_notion(page_id: str, row: dict):
-    properties = build_properties_from_row(row)
-    payload = {
-        "properties": properties,
-    }
-    url = f"{NOTION_API_BASE}/pages/{page_id}"
-    resp = requests.patch(url, headers=notion_headers(), json=payload)
-    resp.raise_for_status()
-    return resp.json()
-
-
-def archive_page_in_notion(page_id: str):
-    """Archive a Notion page (soft-delete) by setting archived=true."""
     if not page_id:
         return None
 
@@ -397,17 +305,21 @@ def archive_page_in_notion(page_id: str):
 
     url = f"{NOTION_API_BASE}/pages/{page_id}"
     payload = {"archived": True}
+    if writer is not None:
+        return writer.submit("PATCH", url, payload, meta={"action": "archive", "page_id": page_id})
     resp = requests.patch(url, headers=notion_headers(), json=payload)
     resp.raise_for_status()
     return resp.json()
 
 
-def archive_duplicate_pages_by_url(url_value: str, keep_page_id: str):
-    """If multiple pages share the same url, archive all except keep_page_id."""
+def archive_duplicate_pages_by_url(url_value: str, keep_page_id: str, pages: list, writer=None):
+    """If multiple pages share the same url, archive all except keep_page_id.
+
+    `pages` are the pages for url_value from the snapshot index (NotionIndex.pages_by_url).
+    """
     if not ARCHIVE_DUPLICATES:
         return 0
 
-    pages = list_pages_by_url(url_value)
     if len(pages) <= 1:
         return 0
 
@@ -416,7 +328,7 @@ def archive_duplicate_pages_by_url(url_value: str, keep_page_id: str):
         pid = p.get("id")
         if not pid or pid == keep_page_id:
             continue
-        archive_page_in_notion(pid)
+        archive_page_in_notion(pid, writer=writer)
         archived += 1
 
     return archived
@@ -426,19 +338,59 @@ def archive_duplicate_pages_by_url(url_value: str, keep_page_id: str):
 # 메인 동기화 로직
 # ------------------------
 
-def sync_csv_to_notion(csv_path: str):
+def ledger_key(row: dict, deal_id: str) -> str:
+    """ledger 행 키: Source ID > url > Deal ID"""
+    source_id = safe_get(row, "Source ID")
+    if source_id:
+        return source_id
+    url_value = safe_get(row, "url")
+    if url_value:
+        return "url:" + url_value
+    return "deal:" + deal_id
+
+
+def sync_csv_to_notion(csv_path: str, ledger_path: str = LEDGER_PATH, dead_letter_path: str = DEAD_LETTER_PATH):
     """
     CSV 전체를 훑으면서:
-      - Deal ID가 이미 있는 페이지는 UPDATE
+      - ledger의 해시와 같고 페이지도 살아 있으면 API 호출 없이 UNCHANGED
+      - url / Source ID / Deal ID가 이미 있는 페이지는 UPDATE
       - 없으면 새로 CREATE
+    존재 여부는 시작 시 한 번 읽어둔 DB 스냅샷 인덱스로 판단한다 (행 단위 query 없음).
+    CREATE/UPDATE는 rate limit에 맞춘 NotionWriter 풀로 동시에 보낸다.
     """
-    with open(csv_path, newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        total = 0
-        created = 0
-        updated = 0
-
-        for row in reader:
+    ledger = SyncLedger(ledger_path)
+    writer = NotionWriter(notion_headers(), dead_letter_path=dead_letter_path)
+    counts = {"create": 0, "update": 0}
+
+    def on_done(result: dict, meta: dict):
+        action = meta.get("action")
+        if action == "create":
+            # 같은 실행 안에서 같은 url이 또 나오면 UPDATE로 가도록 인덱스에 반영
+            index.add(result)
+        if action in counts:
+            counts[action] += 1
+        if meta.get("ledger_key") and result and result.get("id"):
+            ledger.record(meta["ledger_key"], meta["props_hash"], result["id"])
+
+    try:
+        index = NotionIndex.load(NOTION_DATABASE_ID, notion_headers(), writer=writer)
+    except NotionRequestError as e:
+        print(f"[ERROR] Notion DB 스냅샷 로딩 실패 (status={e.status or 'N/A'})")
+        if e.body:
+            print(f"[DEBUG] Response snippet: {e.body}")
+        writer.close()
+        raise
+
+    total = 0
+    unchanged = 0
+    pending_creates = set()
+
+    try:
+        # 지난 실행에서 실패한 요청부터 다시 보냄
+        writer.retry_dead_letters(on_done)
+
+        # 파티션 레이아웃이면 모든 파티션을 순서대로 읽음
+        for row in csv_partitions.iter_rows(csv_path):
             total += 1
             deal_id = (
                 safe_get(row, "Deal ID")
@@ -447,74 +399,97 @@ def sync_csv_to_notion(csv_path: str):
                 or safe_get(row, "deal_id")
             )
             url_value = safe_get(row, "url")
+            source_id = safe_get(row, "Source ID")
 
             if not url_value and not deal_id:
                 print(f"[SKIP] url/Deal ID 모두 없음 (row {total})")
                 continue
 
+            key = ledger_key(row, deal_id)
+            properties = build_properties_from_row(row)
+            props_hash = properties_hash(properties)
+            entry = ledger.get(key)
+            if not FULL_SYNC and ledger.is_unchanged(key, props_hash) and index.has_page(entry["page_id"]):
+                unchanged += 1
+                continue
+
+            # 이번 실행에서 CREATE를 보낸 같은 키가 또 나오면, 그 CREATE가 끝나서 인덱스에 들어올 때까지 대기
+            if key in pending_creates:
+                writer.drain()
+                pending_creates.clear()
+
             existing_page = None
             dup_count = 0
 
             # 1) URL 기준 업서트(중복 방지 최우선)
             if url_value:
-                try:
-                    existing_page, dup_count = find_page_by_url(url_value)
-                    if dup_count > 1:
-                        print(f"[WARN] 동일 url 페이지가 {dup_count}개 존재: url={url_value} (첫 번째만 업데이트)")
-                        if ARCHIVE_DUPLICATES and existing_page is not None:
-                            kept_id = existing_page.get("id")
-                            archived_n = archive_duplicate_pages_by_url(url_value, keep_page_id=kept_id)
-                            if archived_n:
-                                print(f"[CLEANUP] url={url_value} 중복 {archived_n}개 archived (keep={kept_id})")
-                except requests.exceptions.HTTPError as e:
-                    status = e.response.status_code if e.response is not None else "N/A"
-                    body_snippet = ""
-                    if e.response is not None and e.response.text:
-                        body_snippet = e.response.text[:300]
-                    print(f"[ERROR] Notion query failed for url={url_value} (status={status})")
-                    if body_snippet:
-                        print(f"[DEBUG] Response snippet: {body_snippet}")
-                    continue
-
-            # 2) URL로 못 찾으면 Deal ID로 fallback
+                existing_page, dup_count = index.find_by_url(url_value)
+                if dup_count > 1:
+                    print(f"[WARN] 동일 url 페이지가 {dup_count}개 존재: url={url_value} (첫 번째만 업데이트)")
+                    if ARCHIVE_DUPLICATES and existing_page is not None:
+                        kept_id = existing_page.get("id")
+                        archived_n = archive_duplicate_pages_by_url(
+                            url_value, keep_page_id=kept_id, pages=index.pages_by_url(url_value), writer=writer
+                        )
+                        if archived_n:
+                            print(f"[CLEANUP] url={url_value} 중복 {archived_n}개 archived (keep={kept_id})")
+
+            # 2) URL로 못 찾으면 Source ID → Deal ID 순으로 fallback
+            if existing_page is None and source_id:
+                existing_page = index.find_by_source_id(source_id)
             if existing_page is None and deal_id:
-                try:
-                    existing_page = find_page_by_deal_id(deal_id)
-                except requests.exceptions.HTTPError as e:
-                    status = e.response.status_code if e.response is not None else "N/A"
-                    body_snippet = ""
-                    if e.response is not None and e.response.text:
-                        body_snippet = e.response.text[:300]
-                    print(f"[ERROR] Notion query failed for Deal ID={deal_id} (status={status})")
-                    if body_snippet:
-                        print(f"[DEBUG] Response snippet: {body_snippet}")
-                    continue
+                existing_page = index.find_by_deal_id(deal_id)
 
+            meta = {"ledger_key": key, "props_hash": props_hash}
+            key_msg = f"url={url_value}" if url_value else f"Deal ID={deal_id}"
             if existing_page:
                 page_id = existing_page["id"]
-                key_msg = f"url={url_value}" if url_value else f"Deal ID={deal_id}"
                 print(f"[UPDATE] {key_msg} (page_id={page_id})")
-                update_page_in_notion(page_id, row)
-                updated += 1
+                writer.submit(
+                    "PATCH",
+                    f"{NOTION_API_BASE}/pages/{page_id}",
+                    {"properties": properties},
+                    meta=dict(meta, action="update"),
+                    on_done=on_done,
+                )
             else:
-                key_msg = f"url={url_value}" if url_value else f"Deal ID={deal_id}"
                 print(f"[CREATE] {key_msg}")
-                create_page_in_notion(row)
-                created += 1
-
-            # rate limit 대비 약간의 딜레이
-            sleep(0.3)
-
-        print(f"\n총 {total}개 행 처리 완료 (생성 {created}개, 업데이트 {updated}개)")
+                writer.submit(
+                    "POST",
+                    f"{NOTION_API_BASE}/pages",
+                    {"parent": {"database_id": NOTION_DATABASE_ID}, "properties": properties},
+                    meta=dict(meta, action="create"),
+                    on_done=on_done,
+                )
+                pending_creates.add(key)
+    finally:
+        # 남은 요청 대기 + dead-letter 저장 후, 성공한 행까지 ledger 반영
+        writer.close()
+        ledger.save()
+
+    print(
+        f"\n총 {total}개 행 처리 완료 "
+        f"(생성 {counts['create']}개, 업데이트 {counts['update']}개, 변경 없음 {unchanged}개, "
+        f"실패 {writer.stats['failed']}개)"
+    )
 
 
-if __name__ == "__main__":
-    if not os.path.exists(CSV_PATH):
-        raise FileNotFoundError(f"CSV 파일을 찾을 수 없습니다: {CSV_PATH}")
+def run(csv_path: str = CSV_PATH):
+    """동기화 단계 (run_pipeline.py에서도 호출)."""
+    if not NOTION_TOKEN:
+        raise KeyError("NOTION_API_KEY 또는 NOTION_TOKEN 환경 변수가 필요합니다.")
+    if not NOTION_DATABASE_ID:
+        raise KeyError("NOTION_LP_NEWS_DB 환경 변수가 필요합니다.")
+    if not csv_partitions.exists(csv_path):
+        raise FileNotFoundError(f"CSV 파일을 찾을 수 없습니다: {csv_path}")
 
-    print(f"CSV → Notion 동기화 시작: {CSV_PATH}")
+    print(f"CSV → Notion 동기화 시작: {csv_path}")
     print(f"Database ID: {NOTION_DATABASE_ID}")
     print(f"Archive duplicates enabled: {ARCHIVE_DUPLICATES} (set NOTION_ARCHIVE_DUPLICATES=true)")
     print(f"Dry-run mode: {DRY_RUN} (set NOTION_DRY_RUN=true)")
-    sync_csv_to_notion(CSV_PATH)
+    sync_csv_to_notion(csv_path)
     print("동기화 완료.")
+
+
+if __name__ == "__main__":
+    run(CSV_PATH)
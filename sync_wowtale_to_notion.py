@@ -1,16 +1,19 @@
 import os
-import csv
-import requests
 from datetime import datetime
-from time import sleep
 
-NOTION_TOKEN = os.environ["NOTION_TOKEN"]
-NOTION_DATABASE_ID = os.environ["NOTION_DATABASE_ID"]
+import csv_partitions
+from notion_snapshot import NotionIndex
+from notion_writer import NotionWriter
+
+# run_pipeline.py가 import만 해도 죽지 않도록 여기서는 .get, 실제 검사는 run()에서
+NOTION_TOKEN = os.environ.get("NOTION_TOKEN", "")
+NOTION_DATABASE_ID = os.environ.get("NOTION_DATABASE_ID", "")
 
 NOTION_API_BASE = "https://api.notion.com/v1"
 NOTION_VERSION = "2022-06-28"
 
 CSV_PATH = "wowtale_deals.csv"  # 깃에 올라갈 CSV 파일 이름/경로
+DEAD_LETTER_PATH = "wowtale_notion_dead_letter.jsonl"  # 재시도 후에도 실패한 요청 (다음 실행에서 재시도)
 
 
 def parse_date(date_str: str):
@@ -169,108 +172,94 @@ def notion_headers():
     }
 
 
-def find_page_by_deal_id(deal_id_num: int):
-    """
-    Deal ID(number)로 노션 DB에서 기존 페이지가 있는지 조회.
-    있으면 page_id 리턴, 없으면 None.
-    """
-    url = f"{NOTION_API_BASE}/databases/{NOTION_DATABASE_ID}/query"
-    payload = {
-        "filter": {
-            "property": "Deal ID",
-            "number": {
-                "equals": deal_id_num
-            }
-        },
-        "page_size": 1,
-    }
-
-    resp = requests.post(url, headers=notion_headers(), json=payload)
-    if resp.status_code >= 400:
-        print(f"[WARN] query 실패 (Deal ID={deal_id_num}): {resp.status_code} {resp.text}")
-        return None
-
-    results = resp.json().get("results", [])
-    if not results:
-        return None
-
-    return results[0]["id"]
-
-
-def create_page_in_notion(row: dict):
-    """
-    새 페이지 생성.
-    """
-    url = f"{NOTION_API_BASE}/pages"
-    data = {
-        "parent": {"database_id": NOTION_DATABASE_ID},
-        "properties": build_notion_properties(row),
-    }
-
-    resp = requests.post(url, headers=notion_headers(), json=data)
-    if resp.status_code >= 400:
-        print(f"[ERROR][CREATE] {resp.status_code} - {resp.text}")
-    else:
-        print(f"[OK][CREATE] {safe_get(row, '투자 받는 회사 (Target / Startup)')}")
-
-
-def update_page_in_notion(page_id: str, row: dict):
-    """
-    기존 페이지의 속성만 업데이트.
-    (다른 속성이나 코멘트, relation 등은 그대로 유지됨)
-    """
-    url = f"{NOTION_API_BASE}/pages/{page_id}"
-    data = {
-        "properties": build_notion_properties(row),
-    }
-
-    resp = requests.patch(url, headers=notion_headers(), json=data)
-    if resp.status_code >= 400:
-        print(f"[ERROR][UPDATE] {resp.status_code} - {resp.text}")
-    else:
-        print(f"[OK][UPDATE] {safe_get(row, '투자 받는 회사 (Target / Startup)')}")
-
-
-def sync_csv_to_notion(csv_path: str):
+def sync_csv_to_notion(csv_path: str, dead_letter_path: str = DEAD_LETTER_PATH):
     """
     CSV 전체를 읽어서 Notion DB로 upsert.
-    - Deal ID가 있는 row:
-      - 해당 Deal ID가 이미 있으면 UPDATE
-      - 없으면 CREATE
-    - Deal ID가 비어 있으면: 무조건 CREATE
+    - 시작 시 DB 전체를 한 번 읽어 Deal ID / 기사 링크 인덱스를 만든다 (행 단위 query 없음)
+    - Deal ID 또는 기사 링크가 이미 있으면: 건너뜀
+    - 없으면: CREATE (rate limit에 맞춘 NotionWriter 풀로 동시에 전송, 실패 시 dead-letter)
     """
-    with open(csv_path, newline="", encoding="utf-8-sig") as f:
-        reader = csv.DictReader(f)
-        for i, row in enumerate(reader, start=1):
-            print(f"\n=== Row {i} ===")
-
+    writer = NotionWriter(notion_headers(), dead_letter_path=dead_letter_path)
+    index = NotionIndex.load(
+        NOTION_DATABASE_ID,
+        notion_headers(),
+        writer=writer,
+        url_prop="기사 링크",
+        source_id_prop=None,
+        deal_id_prop="Deal ID",
+    )
+
+    def on_done(result: dict, meta: dict):
+        index.add(result)
+        print(f"[OK][CREATE] {meta.get('name', '')}")
+
+    pending = set()
+    total = 0
+    skipped = 0
+    submitted = 0
+    try:
+        # 지난 실행에서 실패한 요청부터 다시 보냄
+        writer.retry_dead_letters(on_done)
+
+        # 파티션 레이아웃이면 모든 파티션을 순서대로 읽음
+        for i, row in enumerate(csv_partitions.iter_rows(csv_path), start=1):
+            total += 1
             deal_id_str = safe_get(row, "Deal ID")
-            page_id = None
+            url_value = safe_get(row, "기사 링크")
+            page = None
             deal_id_num = None
 
+            # 이번 실행에서 CREATE를 보낸 딜이 또 나오면 그 CREATE가 인덱스에 들어올 때까지 대기
+            if (deal_id_str and deal_id_str in pending) or (url_value and url_value in pending):
+                writer.drain()
+                pending.clear()
+
             if deal_id_str:
                 try:
                     deal_id_num = int(float(deal_id_str))
-                    page_id = find_page_by_deal_id(deal_id_num)
+                    page = index.find_by_deal_id(deal_id_num)
                 except ValueError:
                     print(f"[WARN] Deal ID 정수 변환 실패: {deal_id_str}")
 
-            if page_id:
-                # 이미 있는 딜 → 건너뜀
-                print(f"[SKIP][EXISTS] Deal ID={deal_id_num} 이미 있어서 건너뜀")
-            else:
-                # 없는 딜 → 새로 생성
-                create_page_in_notion(row)
-
-            # 노션 API rate limit 조금 여유 있게
-            sleep(0.3)
+            if page is None and url_value:
+                page, _ = index.find_by_url(url_value)
+
+            if page:
+                # 이미 있는 딜 → 건너뜀 (API 호출 없음)
+                skipped += 1
+                continue
+
+            # 없는 딜 → 새로 생성
+            print(f"\n=== Row {i} === [CREATE] Deal ID={deal_id_num}")
+            writer.submit(
+                "POST",
+                f"{NOTION_API_BASE}/pages",
+                {"parent": {"database_id": NOTION_DATABASE_ID}, "properties": build_notion_properties(row)},
+                meta={"name": safe_get(row, "투자 받는 회사 (Target / Startup)"), "deal_id": deal_id_str},
+                on_done=on_done,
+            )
+            pending.update(v for v in (deal_id_str, url_value) if v)
+            submitted += 1
+    finally:
+        writer.close()
+
+    print(f"\n총 {total}개 행 처리 완료 (생성 요청 {submitted}개, 기존 {skipped}개, 실패 {writer.stats['failed']}개)")
+
+
+def run(csv_path: str = CSV_PATH):
+    """동기화 단계 (run_pipeline.py에서도 호출)."""
+    if not NOTION_TOKEN:
+        raise KeyError("NOTION_TOKEN 환경 변수가 필요합니다.")
+    if not NOTION_DATABASE_ID:
+        raise KeyError("NOTION_DATABASE_ID 환경 변수가 필요합니다.")
+    if not csv_partitions.exists(csv_path):
+        raise FileNotFoundError(f"CSV 파일을 찾을 수 없습니다: {csv_path}")
+
+    print(f"CSV → Notion 동기화 시작: {csv_path}")
+    print(f"Database ID: {NOTION_DATABASE_ID}")
+    sync_csv_to_notion(csv_path)
+    print("동기화 완료.")
 
 
 if __name__ == "__main__":
-    if not os.path.exists(CSV_PATH):
-        raise FileNotFoundError(f"CSV 파일을 찾을 수 없습니다: {CSV_PATH}")
-
-    print(f"CSV → Notion 동기화 시작: {CSV_PATH}")
-    print(f"Database ID: {NOTION_DATABASE_ID}")
-    sync_csv_to_notion(CSV_PATH)
-    print("동기화 완료.")
+    run(CSV_PATH)
@@ -0,0 +1,169 @@
+"""
+제목/요약문 기반 triage (LP 뉴스 요약 전 단계).
+
+LP_News_Auto가 링크 CSV에 남긴 목록 페이지의 제목(title)과 요약문(snippet)만 보고,
+펀드레이징 기사가 아닌 게 확실한 링크는 본문 다운로드와 전체 추출을 건너뛴다.
+건너뛴 기사는 마스터 로그에 status=triage_skipped로 남는다 (is_fundraising은 판정 안 했으므로 빈 값).
+
+  - rules : 양성 패턴(출자사업, 위탁운용사 선정, 결성, 클로징 등)이 하나도 없고
+            제목에 [인사] / [부고] / [실적] 같은 말머리 태그가 있을 때만 skip
+            (skip은 마스터 로그에 남아 다시 보지 않으므로, "투자 유치" / "상장" 같은 본문 단어는 skip 근거로 안 씀)
+  - llm   : rules로 정해지지 않은 링크를 BATCH건씩 묶어
+            싼 모델(model_router.CLASSIFIER_MODEL)에
+            한 번에 물어보고, 음성 확신도가 SKIP_ABOVE 이상이면 skip
+제목이 없는 링크(예전 deal_number,url 두 컬럼 시절 행)는 항상 그대로 진행한다.
+
+환경 변수
+  - TRIAGE_MODE       : off(기본) / rules / llm
+  - TRIAGE_BATCH      : llm 모드에서 한 번에 묻는 링크 수 (기본 30)
+  - TRIAGE_SKIP_ABOVE : llm 모드에서 skip으로 믿을 최소 확신도 (기본 0.9)
+"""
+import os
+import re
+import json
+import threading
+from typing import Callable, Dict, List, Optional
+
+import tracing
+
+MODE = (os.environ.get("TRIAGE_MODE") or "off").strip().lower()
+BATCH = int(os.environ.get("TRIAGE_BATCH") or 30)
+SKIP_ABOVE = float(os.environ.get("TRIAGE_SKIP_ABOVE") or 0.9)
+
+# 하나라도 있으면 본문까지 본다
+POSITIVE_PATTERNS = [
+    "출자사업", "위탁운용사", "운용사 선정", "GP 선정", "자펀드", "결성", "클로징",
+    "펀드레이징", "모펀드", "블라인드펀드", "프로젝트펀드", "세컨더리펀드", "출자 확정", "출자자 모집",
+]
+# 양성 패턴 없이 제목의 말머리 태그가 이것이면 skip (규칙으로 확정하는 유일한 경우)
+NEGATIVE_TAGS = ["인사", "부고", "동정", "실적", "IPO", "엑시트", "Exit"]
+_TAG_RE = re.compile(r"\[\s*(" + "|".join(re.escape(t) for t in NEGATIVE_TAGS) + r")\b[^\]]*\]", re.IGNORECASE)
+
+PROMPT = """
+너는 VC/PE 기사 분류기다. 아래 기사 목록의 제목과 요약문만 보고,
+각 기사에 '신규 펀드레이징 또는 출자사업'(출자사업 공고·GP 선정, 펀드/자펀드 결성, 클로징)에 대한 구체 정보가 있을지 판별한다.
+개별 기업 투자 집행, 성과·엑시트, 인사·조직, 정책·전략 동향 기사는 false.
+제목만으로 애매하면 true (본문에서 다시 판별한다).
+
+JSON 한 개만 출력: {"results": [{"i": 번호, "flag": true 또는 false, "confidence": 0~1 사이 숫자}, ...]}
+"""
+
+_lock = threading.Lock()
+stats = {"checked": 0, "no_title": 0, "kept": 0, "skipped_rules": 0, "skipped_llm": 0, "llm_calls": 0, "llm_errors": 0}
+
+
+def rule_decision(title: str, snippet: str = "") -> Optional[str]:
+    """'keep' / 'skip' / None(규칙으로는 모호 → llm 모드면 LLM, rules 모드면 진행)."""
+    text = f"{title} {snippet}"
+    if any(p in text for p in POSITIVE_PATTERNS):
+        return "keep"
+    if _TAG_RE.search(title):
+        return "skip"
+    return None
+
+
+def _matched_tag(title: str) -> str:
+    """skip 사유 / 로그용: 걸린 말머리 태그."""
+    m = _TAG_RE.search(title)
+    return m.group(0) if m else ""
+
+
+def _llm_batch(rows: List[dict], budget=None) -> Dict[int, tuple]:
+    """rows 순서 번호 → (flag, confidence). 실패하면 빈 dict (전부 진행)."""
+    from model_router import CLASSIFIER_MODEL
+    from pipeline_context import chat_completion
+
+    lines = []
+    for i, row in enumerate(rows):
+        snippet = (row.get("snippet") or "")[:200]
+        lines.append(f"{i}. {row.get('title') or ''}" + (f" / {snippet}" if snippet else ""))
+    try:
+        resp = chat_completion(
+            budget=budget,
+            model=CLASSIFIER_MODEL,
+            messages=[
+                {"role": "system", "content": PROMPT},
+                {"role": "user", "content": "\n".join(lines)},
+            ],
+            response_format={"type": "json_object"},
+            temperature=0,
+        )
+        data = json.loads(resp.choices[0].message.content)
+    except Exception as e:
+        print(f"[WARN] triage LLM 호출 실패 → {len(rows)}건 모두 본문 확인: {e}")
+        with _lock:
+            stats["llm_errors"] += 1
+        return {}
+
+    out: Dict[int, tuple] = {}
+    for r in data.get("results") or []:
+        try:
+            i = int(r.get("i"))
+            flag = r.get("flag")
+            if isinstance(flag, str):
+                flag = flag.strip().lower() in ("true", "1", "yes", "y")
+            out[i] = (bool(flag), float(r.get("confidence") or 0))
+        except (TypeError, ValueError, AttributeError):
+            continue
+    with _lock:
+        stats["llm_calls"] += 1
+    return out
+
+
+def triage(rows: List[dict], url_of: Callable[[dict], str], budget=None, mode: str = None) -> Dict[str, str]:
+    """
+    링크 행들 → {url: skip 사유}. 사유가 없는(빠진) 행은 평소처럼 본문 추출로 진행.
+    """
+    mode = mode or MODE
+    if mode not in ("rules", "llm") or not rows:
+        return {}
+
+    skips: Dict[str, str] = {}
+    undecided: List[dict] = []
+    with tracing.span("triage.batch", mode=mode, rows=len(rows)) as attrs:
+        for row in rows:
+            title = (row.get("title") or "").strip()
+            with _lock:
+                stats["checked"] += 1
+                if not title:
+                    stats["no_title"] += 1
+            if not title:
+                continue
+            decision = rule_decision(title, row.get("snippet") or "")
+            if decision == "skip":
+                skips[url_of(row)] = f"rule:{_matched_tag(title)}"
+            elif decision is None and mode == "llm":
+                undecided.append(row)
+        rule_skips = len(skips)
+
+        if undecided:
+            results = _llm_batch(undecided, budget=budget)
+            for i, row in enumerate(undecided):
+                flag, confidence = results.get(i, (True, 0.0))
+                if not flag and confidence >= SKIP_ABOVE:
+                    skips[url_of(row)] = f"llm:{confidence:.2f}"
+        attrs["skipped"] = len(skips)
+
+    with _lock:
+        stats["skipped_rules"] += rule_skips
+        stats["skipped_llm"] += len(skips) - rule_skips
+        stats["kept"] += len(rows) - len(skips)
+    return skips
+
+
+def snapshot() -> dict:
+    with _lock:
+        return dict(stats, mode=MODE)
+
+
+def summary():
+    s = snapshot()
+    if not s["checked"]:
+        return
+    print(
+        f"[INFO] triage({s['mode']}) {s['checked']}건 중 본문 없이 건너뜀 "
+        f"{s['skipped_rules'] + s['skipped_llm']}건 (규칙 {s['skipped_rules']} / LLM {s['skipped_llm']})"
+    )
+
+
+tracing.register_section("title_triage", snapshot)
@@ -0,0 +1,235 @@
+"""
+경량 트레이싱 + 실행 리포트.
+
+- span(name, **attrs): HTTP 요청 / HTML 파싱 / LLM 호출 / CSV 쓰기 / Notion 요청 등 구간 시간 기록
+      with tracing.span("http.request", url=url, host=host) as attrs:
+          res = ...
+          attrs["status"] = res.status_code
+- stage(name): 현재 스레드의 단계 이름을 설정 → 그 안의 span에 stage가 붙는다
+- write_report(path): 단계별 시간, span 이름별 count/total/p50/p90/p99/max, 호스트별 합계,
+  가장 느린 span 목록을 JSON으로 저장
+- register_section(name, fn): 다른 모듈 상태를 리포트에 추가 (예: host_limiter의 호스트별 동시 요청 한도)
+
+프로파일링 훅 (단계 하나만):
+  PROFILE_STAGE=lp_gpt python run_pipeline.py                    → profile_lp_gpt.prof (cProfile)
+  PROFILE_STAGE=lp_gpt PROFILER=pyinstrument python run_pipeline.py → profile_lp_gpt.html
+
+환경 변수
+  - TRACE_REPORT  : 단독 스크립트 실행 때도 종료 시 이 경로로 리포트 저장
+  - PROFILE_STAGE : 프로파일링할 단계 이름
+  - PROFILER      : cprofile(기본) / pyinstrument
+"""
+import os
+import json
+import time
+import atexit
+import threading
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+MAX_KEPT_SPANS = 5000  # watch 모드 등 장시간 실행 때 원본 span 보관 상한 (통계는 전부 집계)
+
+PROFILE_STAGE = os.environ.get("PROFILE_STAGE", "").strip()
+PROFILER = (os.environ.get("PROFILER") or "cprofile").strip().lower()
+
+_local = threading.local()
+_lock = threading.Lock()
+_started_at = datetime.now()
+_spans: List[dict] = []
+_durations: Dict[str, List[float]] = defaultdict(list)
+_errors: Dict[str, int] = defaultdict(int)
+_stage_span_durations: Dict[str, Dict[str, List[float]]] = defaultdict(lambda: defaultdict(list))
+_hosts: Dict[str, dict] = defaultdict(lambda: {"count": 0, "seconds": 0.0, "bytes": 0, "errors": 0})
+_stages: Dict[str, dict] = {}
+_sections: Dict[str, Callable[[], dict]] = {}
+
+
+def current_stage() -> str:
+    return getattr(_local, "stage", "") or ""
+
+
+def set_stage(name: str):
+    """다른 스레드(Notion writer 워커 등)에서 호출한 쪽의 단계 이름을 이어받을 때 사용."""
+    _local.stage = name or ""
+
+
+@contextmanager
+def span(name: str, **attrs):
+    rec = {"name": name, "stage": current_stage(), "attrs": dict(attrs)}
+    started = time.perf_counter()
+    rec["start"] = time.time()
+    try:
+        yield rec["attrs"]
+    except Exception as e:
+        rec["error"] = f"{type(e).__name__}: {e}"[:200]
+        raise
+    finally:
+        rec["duration"] = time.perf_counter() - started
+        _record(rec)
+
+
+def _record(rec: dict):
+    name = rec["name"]
+    dur = rec["duration"]
+    attrs = rec["attrs"]
+    with _lock:
+        _durations[name].append(dur)
+        if rec.get("error"):
+            _errors[name] += 1
+        if rec["stage"]:
+            _stage_span_durations[rec["stage"]][name].append(dur)
+        host = attrs.get("host")
+        if host:
+            h = _hosts[host]
+            h["count"] += 1
+            h["seconds"] += dur
+            h["bytes"] += int(attrs.get("bytes") or 0)
+            status = attrs.get("status")
+            if rec.get("error") or (isinstance(status, int) and status >= 400):
+                h["errors"] += 1
+        if len(_spans) < MAX_KEPT_SPANS:
+            _spans.append(rec)
+
+
+@contextmanager
+def stage(name: str):
+    """단계 구간. PROFILE_STAGE와 이름이 같으면 프로파일러도 켠다."""
+    prev = current_stage()
+    set_stage(name)
+    profiler = _start_profiler() if PROFILE_STAGE and PROFILE_STAGE == name else None
+    started = time.perf_counter()
+    status = "ok"
+    try:
+        yield
+    except Exception:
+        status = "failed"
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        if profiler is not None:
+            _stop_profiler(profiler, name)
+        with _lock:
+            _stages[name] = {"seconds": round(elapsed, 3), "status": status}
+        set_stage(prev)
+
+
+# ------------------------
+# 프로파일러
+# ------------------------
+
+def _start_profiler():
+    if PROFILER == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+        except ImportError:
+            print("[WARN] pyinstrument가 설치돼 있지 않아 cProfile로 대신 프로파일링합니다.")
+        else:
+            p = Profiler()
+            p.start()
+            return ("pyinstrument", p)
+
+    import cProfile
+
+    p = cProfile.Profile()
+    p.enable()
+    return ("cprofile", p)
+
+
+def _stop_profiler(profiler, stage_name: str):
+    kind, p = profiler
+    if kind == "pyinstrument":
+        p.stop()
+        path = f"profile_{stage_name}.html"
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(p.output_html())
+    else:
+        p.disable()
+        path = f"profile_{stage_name}.prof"
+        p.dump_stats(path)
+    print(f"[INFO] [{stage_name}] 프로파일 저장 → {path}")
+
+
+# ------------------------
+# 리포트
+# ------------------------
+
+def register_section(name: str, fn: Callable[[], dict]):
+    """리포트를 만들 때 fn()의 결과를 report[name]으로 넣는다."""
+    _sections[name] = fn
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+def _summary(values: List[float]) -> dict:
+    vs = sorted(values)
+    return {
+        "count": len(vs),
+        "total": round(sum(vs), 3),
+        "p50": round(_percentile(vs, 0.50), 3),
+        "p90": round(_percentile(vs, 0.90), 3),
+        "p99": round(_percentile(vs, 0.99), 3),
+        "max": round(vs[-1], 3) if vs else 0.0,
+    }
+
+
+def build_report(extra: Optional[dict] = None) -> dict:
+    with _lock:
+        spans = {name: dict(_summary(vs), errors=_errors.get(name, 0)) for name, vs in _durations.items()}
+        by_stage = {
+            st: {name: _summary(vs) for name, vs in names.items()} for st, names in _stage_span_durations.items()
+        }
+        hosts = {h: dict(v, seconds=round(v["seconds"], 3)) for h, v in _hosts.items()}
+        slowest = sorted(_spans, key=lambda r: r["duration"], reverse=True)[:20]
+        stages = dict(_stages)
+
+    report = {
+        "started_at": _started_at.isoformat(timespec="seconds"),
+        "finished_at": datetime.now().isoformat(timespec="seconds"),
+        "stages": stages,
+        "spans": spans,
+        "by_stage": by_stage,
+        "hosts": hosts,
+        "slowest": [
+            {
+                "name": r["name"],
+                "stage": r["stage"],
+                "seconds": round(r["duration"], 3),
+                "attrs": r["attrs"],
+                "error": r.get("error", ""),
+            }
+            for r in slowest
+        ],
+    }
+    for name, fn in list(_sections.items()):
+        report[name] = fn()
+    if extra:
+        report.update(extra)
+    return report
+
+
+def write_report(path: str, extra: Optional[dict] = None) -> dict:
+    report = build_report(extra)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2, default=str)
+    print(f"[INFO] 실행 리포트 저장 → {path}")
+    return report
+
+
+def _write_env_report():
+    # extraction_pool 워커 프로세스도 이 모듈을 import하므로 부모 프로세스에서만 저장
+    import multiprocessing
+
+    if multiprocessing.parent_process() is None:
+        write_report(_report_env)
+
+
+_report_env = os.environ.get("TRACE_REPORT", "").strip()
+if _report_env:
+    atexit.register(_write_env_report)
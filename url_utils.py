@@ -0,0 +1,72 @@
+"""
+URL 정규화 / Source ID 헬퍼.
+
+LP News 요약기, Notion 동기화, 중복 정리(reconcile)에서 같은 기사를 같은 키로 보기 위해 공용으로 사용.
+"""
+import hashlib
+from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
+
+
+# -----------------------------
+# URL de-duplication helpers
+# -----------------------------
+
+def normalize_url(u: str) -> str:
+    """Normalize URLs so the same article isn't re-processed due to minor URL variations.
+
+    - Force https
+    - Remove leading www.
+    - Remove trailing slash
+    - Drop common tracking params
+    - Sort query params
+    """
+    if not u:
+        return ""
+
+    u = u.strip()
+    p = urlparse(u)
+
+    scheme = "https"
+    netloc = (p.netloc or "").lower()
+    if netloc.startswith("www."):
+        netloc = netloc[4:]
+
+    path = (p.path or "").rstrip("/")
+
+    q = parse_qs(p.query or "")
+    drop_keys = {
+        "utm_source",
+        "utm_medium",
+        "utm_campaign",
+        "utm_term",
+        "utm_content",
+        "fbclid",
+        "gclid",
+    }
+    q = {k: v for k, v in q.items() if k not in drop_keys}
+
+    # sort query params for stable equality
+    query = urlencode([(k, q[k][0]) for k in sorted(q.keys())], doseq=False)
+
+    return urlunparse((scheme, netloc, path, "", query, ""))
+
+
+def make_source_id(u: str) -> str:
+    """Create a stable per-article id used for upsert/de-dup.
+
+    Prefer domain-specific IDs when available (e.g., thebell 'key='), otherwise hash the normalized URL.
+    """
+    nu = normalize_url(u)
+    if not nu:
+        return ""
+
+    p = urlparse(nu)
+
+    # thebell: use key= query param if present
+    if "thebell.co.kr" in (p.netloc or ""):
+        q = parse_qs(p.query or "")
+        if "key" in q and q["key"]:
+            return f"thebell:{q['key'][0]}"
+
+    # fallback: normalized URL hash
+    return "urlhash:" + hashlib.sha1(nu.encode("utf-8")).hexdigest()
@@ -0,0 +1,193 @@
+"""
+상시 실행(watch) 모드.
+
+3시간 cron 대신 프로세스를 띄워 두고, 소스별 목록 첫 페이지를 각자의 주기로 폴링한다.
+새 기사가 보이면 바로 요약 → Notion 동기화까지 흘려보낸다.
+
+폴링 주기 (소스별로 따로 조정):
+  - 관측된 게시 속도(새 기사 수/분, EWMA)로 "한 번 폴링에 새 기사 ~0.5건"이 되도록 간격 계산
+  - 한국 시간 평일 업무시간(09~19시)은 그대로, 저녁/주말은 2~3배, 새벽(0~7시)은 4배 느리게
+  - 오류가 나면 연속 오류 횟수만큼 지수적으로 늘림
+  - MIN/MAX 범위로 clamp
+
+HTTP 커넥션 풀, OpenAI 클라이언트, 이미 본 URL 셋, CSV 행 캐시는 폴링 사이에 유지된다.
+
+사용법:
+  python watch_pipeline.py
+  python run_pipeline.py --watch
+
+환경 변수
+  - WATCH_MIN_INTERVAL  : 최소 폴링 간격 초 (기본 120)
+  - WATCH_MAX_INTERVAL  : 최대 폴링 간격 초 (기본 3600)
+  - (요약/동기화에 필요한 OPENAI_API_KEY, NOTION_* 는 run_pipeline.py와 동일)
+"""
+import os
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Callable, List, Optional, Set
+
+import LP_News_Auto
+import LP_News_GPT_Auto
+import sync_lp_news_to_notion
+import sync_wowtale_to_notion
+import wowtale_auto
+import wowtale_GPT_auto
+import tracing
+
+KST = timezone(timedelta(hours=9))
+
+MIN_INTERVAL = float(os.environ.get("WATCH_MIN_INTERVAL") or 120)
+MAX_INTERVAL = float(os.environ.get("WATCH_MAX_INTERVAL") or 3600)
+BASE_INTERVAL = 600.0          # 게시 속도를 아직 모를 때
+TARGET_NEW_PER_POLL = 0.5      # 폴링 1번에 기대하는 새 기사 수
+RATE_ALPHA = 0.3               # 게시 속도 EWMA 가중치
+
+
+def time_of_day_factor(now: Optional[datetime] = None) -> float:
+    """한국 시간 기준 폴링 간격 배수."""
+    now = (now or datetime.now(timezone.utc)).astimezone(KST)
+    if now.hour < 7:
+        return 4.0
+    if now.weekday() >= 5:
+        return 3.0
+    if 9 <= now.hour < 19:
+        return 1.0
+    return 2.0
+
+
+def _url(item) -> str:
+    return item["url"] if isinstance(item, dict) else item
+
+
+class SourcePoller:
+    """소스 하나(목록 첫 페이지)의 폴링 상태."""
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[], list],
+        handle: Callable[[list], None],
+        seen: Set[str],
+    ):
+        self.name = name
+        self.fetch = fetch
+        self.handle = handle
+        self.seen = seen
+        self.rate: Optional[float] = None  # 새 기사 수 / 분
+        self.last_poll: Optional[float] = None
+        self.next_due = 0.0
+        self.errors = 0
+
+    def next_interval(self) -> float:
+        if self.rate is None:
+            interval = BASE_INTERVAL
+        else:
+            interval = TARGET_NEW_PER_POLL / max(self.rate, 1e-4) * 60
+        interval *= time_of_day_factor()
+        interval *= 2 ** min(self.errors, 5)
+        return max(MIN_INTERVAL, min(MAX_INTERVAL, interval))
+
+    def _observe(self, new_count: int, now: float):
+        if self.last_poll is not None:
+            minutes = max((now - self.last_poll) / 60, 1e-3)
+            observed = new_count / minutes
+            self.rate = observed if self.rate is None else RATE_ALPHA * observed + (1 - RATE_ALPHA) * self.rate
+        self.last_poll = now
+
+    def poll(self):
+        now = time.monotonic()
+        try:
+            with tracing.stage(f"watch_{self.name}"):
+                self._poll_once(now)
+            self.errors = 0
+        except Exception as e:
+            self.errors += 1
+            print(f"[WARN] [{self.name}] 폴링 실패 ({self.errors}회 연속): {e}")
+
+        interval = self.next_interval()
+        self.next_due = time.monotonic() + interval
+        rate = f"{self.rate * 60:.2f}건/h" if self.rate is not None else "-"
+        print(f"[WATCH] [{self.name}] 다음 폴링 {interval / 60:.1f}분 후 (게시 속도 {rate})")
+
+    def _poll_once(self, now: float):
+        # fetch 결과는 URL 문자열 또는 {"url", "title", "snippet"} (LP 뉴스 목록)
+        items = self.fetch()
+        new_items = [it for it in items if _url(it) not in self.seen]
+        self._observe(len(new_items), now)
+        if new_items:
+            print(f"[WATCH] [{self.name}] 새 기사 {len(new_items)}건")
+            self.handle(new_items)
+            self.seen.update(_url(it) for it in new_items)
+
+
+# ------------------------
+# 소스별 처리
+# ------------------------
+
+def _sync_safely(run: Callable[[], None], label: str):
+    try:
+        run()
+    except KeyError as e:
+        # Notion 환경 변수가 없으면 요약까지만 하고 동기화는 건너뜀
+        print(f"[WARN] [{label}] Notion 동기화 건너뜀: {e}")
+
+
+def handle_wowtale(new_urls: List[str]):
+    added = wowtale_GPT_auto.main(latest_rows=[{"url": u} for u in new_urls])
+    if added:
+        _sync_safely(sync_wowtale_to_notion.run, "wowtale")
+
+
+def handle_lp_news(new_items: List[dict]):
+    existing_urls, max_deal = LP_News_Auto.load_existing_urls_and_max_deal(
+        LP_News_Auto.LINKS_CSV, LP_News_Auto.SUMMARIES_CSV, LP_News_Auto.MASTER_CSV
+    )
+    queued = [it for it in new_items if it["url"] not in existing_urls]
+    if not queued:
+        return
+    LP_News_Auto.append_links_to_csv(queued, LP_News_Auto.LINKS_CSV, start_deal_number=max_deal + 1)
+
+    # 이번에 큐에 넣은 기사만 요약 (미룬 URL / backfill 큐는 배치 실행 몫 → 폴링 루프를 오래 막지 않음)
+    summary_rows, _ = LP_News_GPT_Auto.main(links=queued)
+    if summary_rows:
+        _sync_safely(sync_lp_news_to_notion.run, "lp_news")
+
+
+def build_pollers() -> List[SourcePoller]:
+    lp_seen, _ = LP_News_Auto.load_existing_urls_and_max_deal(
+        LP_News_Auto.LINKS_CSV, LP_News_Auto.SUMMARIES_CSV, LP_News_Auto.MASTER_CSV
+    )
+    wowtale_seen = wowtale_GPT_auto.load_processed_urls()
+    return [
+        SourcePoller("wowtale", lambda: wowtale_auto.get_investment_article_urls(max_pages=1), handle_wowtale, wowtale_seen),
+        SourcePoller("thebell", lambda: LP_News_Auto.get_thebell_fund_items(max_pages=1), handle_lp_news, lp_seen),
+        SourcePoller("newstopkorea", LP_News_Auto.get_newstopkorea_fund_items, handle_lp_news, lp_seen),
+    ]
+
+
+def watch(max_polls: Optional[int] = None, report_path: str = "run_report.json"):
+    """
+    폴링 루프. max_polls가 있으면 그 횟수만큼 폴링하고 종료 (점검용).
+    종료할 때 누적 span 통계를 report_path에 저장.
+    """
+    pollers = build_pollers()
+    print(f"=== watch 모드 시작: {', '.join(p.name for p in pollers)} ===")
+
+    polls = 0
+    try:
+        while max_polls is None or polls < max_polls:
+            poller = min(pollers, key=lambda p: p.next_due)
+            wait_s = poller.next_due - time.monotonic()
+            if wait_s > 0:
+                time.sleep(wait_s)
+            poller.poll()
+            polls += 1
+    except KeyboardInterrupt:
+        print("\n[INFO] watch 모드 종료")
+    finally:
+        if report_path:
+            tracing.write_report(report_path)
+
+
+if __name__ == "__main__":
+    watch()
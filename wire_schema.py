@@ -0,0 +1,649 @@
+"""
+LLM 출력용 압축 스키마(wire format)와 CSV 컬럼 모양으로의 복원.
+
+모델이 "펀드규모", "조성상태", "Consumer Internet & Fintech" 같은 긴 키/값을 매번 출력하면
+출력 토큰과 latency가 그만큼 늘어난다. compact 형식에서는
+  - 키는 짧은 ASCII (f, lp, gp, fn, ... / d, t, inv, amt, ...)
+  - 섹터 / 펀드유형 / 라운드는 코드 (BIO, ICT / VC, SEC / SEED, A, MA ...)
+  - 여러 값은 쉼표로 이은 문자열 대신 배열
+  - 빈 필드는 생략
+으로 받고, expand_lp / expand_wowtale이 기존 코드가 쓰던 키(is_fundraising, LP, 운용사 ... /
+is_deal, target, investors ...)로 되돌린다. 모르는 키, 틀린 타입, 목록에 없는 섹터/펀드유형 코드는
+WireFormatError (라운드는 코드가 아니면 기사 표기 그대로 둔다).
+verbose 형식(기존 키)의 응답은 그대로 통과하므로 LLM_WIRE_FORMAT=verbose로 전/후 비교가 가능하다.
+
+출력 토큰 측정:
+  - 실행 중: 호출마다 completion_tokens를 형식별로 모아 실행 리포트의 wire_format 섹션에 기록
+  - 오프라인: python wire_schema.py measure  (같은 내용의 예시 응답을 두 형식으로 토큰화해서 비교,
+    tiktoken이 있으면 실제 토크나이저, 없으면 글자 수 기준 추정)
+
+응답 처리 순서 (decode):
+  1) json.loads, 실패하면 로컬 복구(repair_json: 코드펜스/앞뒤 잡담 제거, trailing comma, 스마트 따옴표,
+     True/False/None) 후 다시 파싱
+  2) 필드별 정규화(normalize_*): "true" 문자열 → bool, 쉼표 문자열 → 배열, 섹터/펀드유형 이름 → 코드,
+     목록에 없는 코드 → ETC, "null"/"없음" → null, 모르는 키는 버림 (고친 내용은 issues로 집계)
+  3) expand_*의 엄격 검증
+  그래도 실패하면 호출 쪽(with_retry)이 LLM_PARSE_RETRIES번 다시 부르고, 끝내 실패한 원문은
+  llm_failures.jsonl에 남겨 (유료 응답을 버리지 않음) 다음 실행이 같은 기사를 계속 재시도하지 않게 한다.
+LLM_STRUCTURED_OUTPUT=on(기본)이면 response_format으로 JSON schema(strict)를 넘겨 모델 출력 자체를 스키마에 맞춘다.
+
+환경 변수
+  - LLM_WIRE_FORMAT       : compact(기본) / verbose
+  - LLM_STRUCTURED_OUTPUT : on(기본) / off (off면 json_object 또는 프롬프트 지시만)
+  - LLM_PARSE_RETRIES     : 복구/정규화로도 못 읽은 응답의 재호출 횟수 (기본 1)
+"""
+import os
+import re
+import json
+import argparse
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import tracing
+
+FORMAT = (os.environ.get("LLM_WIRE_FORMAT") or "compact").strip().lower()
+STRUCTURED = (os.environ.get("LLM_STRUCTURED_OUTPUT") or "on").strip().lower() != "off"
+PARSE_RETRIES = int(os.environ.get("LLM_PARSE_RETRIES") or 1)
+FAILURES_PATH = "llm_failures.jsonl"
+
+SECTORS = {
+    "BIO": "Biotech & Healthcare",
+    "ICM": "Interactive Contents & Media",
+    "CIF": "Consumer Internet & Fintech",
+    "ICT": "ICT & Digitalization",
+    "SEM": "Semiconductor & Industrial",
+    "ETC": "ETC",
+}
+
+FUND_TYPES = {
+    "VC": "벤처",
+    "GR": "그로스",
+    "SEC": "세컨더리",
+    "BO": "바이아웃",
+    "PRJ": "프로젝트",
+    "BLD": "블라인드",
+    "MEZ": "메자닌",
+    "PD": "사모대출",
+    "INF": "인프라",
+    "RE": "부동산",
+    "ETC": "기타",
+}
+
+ROUNDS = {
+    "SEED": "Seed",
+    "PRE_A": "Pre-A",
+    "A": "Series A",
+    "B": "Series B",
+    "C": "Series C",
+    "D": "Series D",
+    "E": "Series E",
+    "PRE_IPO": "Pre-IPO",
+    "BRIDGE": "브릿지",
+    "STRAT": "전략적 투자",
+    "MA": "인수",
+    "MERGER": "합병",
+    "NA": "미공개",
+}
+
+FLAG_KEYS = {
+    "compact": {"lp_news": "f", "wowtale": "d"},
+    "verbose": {"lp_news": "is_fundraising", "wowtale": "is_deal"},
+}
+
+
+class WireFormatError(ValueError):
+    pass
+
+
+class ExtractionFailed(WireFormatError):
+    """재시도까지 실패한 응답 (raw: 마지막 응답 원문)."""
+
+    def __init__(self, message: str, raw: str = ""):
+        super().__init__(message)
+        self.raw = raw
+
+
+def _codes(table: Dict[str, str]) -> str:
+    return ", ".join(f"{code}={label}" for code, label in table.items())
+
+
+# ------------------------
+# 프롬프트에 넣는 compact 스키마 설명
+# ------------------------
+
+LP_COMPACT_SCHEMA = f"""스키마 (키는 아래 약어 그대로, 값이 없는 필드는 null 또는 생략, f를 반드시 첫 필드로 출력):
+{{
+  "f": "boolean | is_fundraising. 신규 펀드 결성/자펀드 결성/출자사업(선정, 공고, 클로징 등) 기사이면 true, 그 외 false",
+  "lp": ["출자자(LP) 이름"],
+  "gp": ["운용사(GP) 이름"],
+  "fn": "펀드명",
+  "sz": "기사에 나온 펀드 또는 자펀드 규모 표현 (예: '약 1,000억 원')",
+  "ft": ["펀드유형 코드: {_codes(FUND_TYPES)}"],
+  "sec": ["투자섹터 코드: {_codes(SECTORS)}. 애매하면 ETC만"],
+  "st": "조성상태 한 단어 (신규결성, 1차 클로징, 멀티클로징, 모집중, 위탁운용사 선정 등)",
+  "sm": "(f=true인 경우에만) 펀드레이징/출자사업 관련 핵심 2~3문장 요약"
+}}
+f=false이면 {{"f": false}} 만 출력한다.
+"""
+
+
+def wowtale_compact_fields() -> str:
+    """
+    wowtale 프롬프트의 필드 설명 + 예시 (compact).
+    날짜/출처(dt/src)는 항상 설명해 두고 실제로 물을지는 user 메시지에서 정한다 (system prefix가 한 종류로 고정).
+    """
+    return f"""필드 (키는 아래 약어 그대로, 값이 없는 필드는 null 또는 생략, d를 반드시 첫 필드로 출력):
+- d: 이 기사가 실제 투자/인수(M&A) 딜을 다루는 기사이면 true, 아니면 false
+- t: 투자 받는 회사 또는 인수 대상 회사명
+- inv: 참여 투자사 배열 (예: ["카카오벤처스", "알토스벤처스"])
+- amt: 기사에 나온 투자 금액을 통화/단위를 포함해 그대로 (예: "50억 원", "10M USD", 없으면 "미공개")
+- rd: 라운드 코드 {_codes(ROUNDS)} (목록에 없으면 기사 표기 그대로)
+- sec: 섹터 코드 하나 {_codes(SECTORS)}
+- biz: 회사의 주요 사업 한 줄 요약 (한국어)
+- dt: 기사에 표기된 날짜 "YYYY.MM.DD" (없으면 "확인 불가")
+- src: 기사 출처(매체명) (없으면 "확인 불가")
+- nt: 특이사항이 있을 때만 한 줄
+
+dt, src는 사용자 메시지의 [추가 요청]에 있을 때만 채우고, 아니면 null로 두세요.
+d=false이면 {{"d": false}} 만 출력하세요.
+
+JSON 예시:
+{{"d":true,"t":"예시회사","inv":["카카오벤처스","알토스벤처스"],"amt":"50억 원","rd":"A","sec":"ICT","biz":"소상공인을 위한 클라우드 기반 결제·정산 SaaS를 제공","dt":null,"src":null,"nt":"정부 펀드 참여"}}
+"""
+
+
+def flag_key(kind: str, fmt: Optional[str] = None) -> str:
+    return FLAG_KEYS[fmt or FORMAT][kind]
+
+
+# ------------------------
+# 복원 + 검증
+# ------------------------
+
+def _flag(value, key: str) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, str) and value.strip().lower() in ("true", "false"):
+        return value.strip().lower() == "true"
+    raise WireFormatError(f"{key}: boolean이 아님 ({value!r})")
+
+
+def _text(data: dict, key: str) -> Optional[str]:
+    value = data.get(key)
+    if value is None or isinstance(value, str):
+        return value
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    raise WireFormatError(f"{key}: 문자열이 아님 ({value!r})")
+
+
+def _list(data: dict, key: str) -> List[str]:
+    value = data.get(key)
+    if value is None:
+        return []
+    if not isinstance(value, list) or not all(isinstance(v, str) for v in value):
+        raise WireFormatError(f"{key}: 문자열 배열이 아님 ({value!r})")
+    return [v.strip() for v in value if v.strip()]
+
+
+def _decode(codes: List[str], table: Dict[str, str], key: str) -> List[str]:
+    out = []
+    for code in codes:
+        label = table.get(code.upper())
+        if label is None:
+            raise WireFormatError(f"{key}: 알 수 없는 코드 {code!r}")
+        out.append(label)
+    return out
+
+
+def _check_keys(data, allowed: set, kind: str):
+    if not isinstance(data, dict):
+        raise WireFormatError(f"{kind}: JSON 객체가 아님")
+    unknown = set(data) - allowed
+    if unknown:
+        raise WireFormatError(f"{kind}: 모르는 키 {sorted(unknown)}")
+
+
+LP_KEYS = {"f", "lp", "gp", "fn", "sz", "ft", "sec", "st", "sm"}
+WOWTALE_KEYS = {"d", "t", "inv", "amt", "rd", "sec", "biz", "nt", "dt", "src"}
+
+
+def expand_lp(data: dict) -> dict:
+    """compact LP 응답 → 기존 키 (is_fundraising, LP, 운용사, 펀드명, 펀드규모, 펀드유형, 투자섹터, 조성상태, 요약)."""
+    if isinstance(data, dict) and "is_fundraising" in data:
+        return data
+    _check_keys(data, LP_KEYS, "lp_news")
+    if "f" not in data:
+        raise WireFormatError("lp_news: f 필드 없음")
+    return {
+        "is_fundraising": _flag(data["f"], "f"),
+        "LP": _list(data, "lp"),
+        "운용사": _list(data, "gp"),
+        "펀드명": _text(data, "fn"),
+        "펀드규모": _text(data, "sz"),
+        "펀드유형": _decode(_list(data, "ft"), FUND_TYPES, "ft"),
+        "투자섹터": _decode(_list(data, "sec"), SECTORS, "sec"),
+        "조성상태": _text(data, "st"),
+        "요약": _text(data, "sm"),
+    }
+
+
+def expand_wowtale(data: dict) -> dict:
+    """compact wowtale 응답 → 기존 키 (is_deal, target, investors, amount, round, sector, business_summary, notes, article_*)."""
+    if isinstance(data, dict) and "is_deal" in data:
+        return data
+    _check_keys(data, WOWTALE_KEYS, "wowtale")
+    if "d" not in data:
+        raise WireFormatError("wowtale: d 필드 없음")
+
+    sector = _text(data, "sec") or ""
+    if sector:
+        sector = _decode([sector], SECTORS, "sec")[0]
+    round_ = (_text(data, "rd") or "").strip()
+    round_ = ROUNDS.get(round_.upper(), round_)
+
+    out = {
+        "deal_id": None,
+        "is_deal": _flag(data["d"], "d"),
+        "target": _text(data, "t") or "",
+        "investors": ", ".join(_list(data, "inv")),
+        "amount": _text(data, "amt") or "미공개",
+        "round": round_ or "미공개",
+        "sector": sector,
+        "business_summary": _text(data, "biz") or "",
+        "notes": _text(data, "nt") or "",
+    }
+    if data.get("dt"):
+        out["article_date"] = _text(data, "dt")
+    if data.get("src"):
+        out["article_source"] = _text(data, "src")
+    return out
+
+
+# ------------------------
+# JSON schema (structured outputs, strict)
+# ------------------------
+
+def _nullable(type_: str) -> dict:
+    return {"type": [type_, "null"]}
+
+
+def _strict_object(properties: Dict[str, dict]) -> dict:
+    # strict 모드는 모든 키가 required여야 함 → 값이 없으면 null
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
+
+
+def json_schema(kind: str, fmt: Optional[str] = None) -> dict:
+    """
+    response_format용 JSON schema. 플래그가 첫 속성 (스트리밍 조기 중단).
+    wowtale 날짜/출처는 묻든 안 묻든 같은 schema(nullable)로 둔다 (schema도 캐시되는 prefix에 포함).
+    """
+    fmt = fmt or FORMAT
+    strings = {"type": "array", "items": {"type": "string"}}
+    if kind == "lp_news" and fmt == "compact":
+        props = {
+            "f": {"type": "boolean"},
+            "lp": strings,
+            "gp": strings,
+            "fn": _nullable("string"),
+            "sz": _nullable("string"),
+            "ft": {"type": "array", "items": {"type": "string", "enum": list(FUND_TYPES)}},
+            "sec": {"type": "array", "items": {"type": "string", "enum": list(SECTORS)}},
+            "st": _nullable("string"),
+            "sm": _nullable("string"),
+        }
+    elif kind == "lp_news":
+        props = {
+            "is_fundraising": {"type": "boolean"},
+            "LP": strings,
+            "운용사": strings,
+            "펀드명": _nullable("string"),
+            "펀드규모": _nullable("string"),
+            "펀드유형": strings,
+            "투자섹터": {"type": "array", "items": {"type": "string", "enum": list(SECTORS.values())}},
+            "조성상태": _nullable("string"),
+            "요약": _nullable("string"),
+        }
+    elif fmt == "compact":
+        props = {
+            "d": {"type": "boolean"},
+            "t": _nullable("string"),
+            "inv": strings,
+            "amt": _nullable("string"),
+            "rd": _nullable("string"),
+            "sec": {"type": ["string", "null"], "enum": list(SECTORS) + [None]},
+            "biz": _nullable("string"),
+            "dt": _nullable("string"),
+            "src": _nullable("string"),
+            "nt": _nullable("string"),
+        }
+    else:
+        props = {
+            "is_deal": {"type": "boolean"},
+            "deal_id": {"type": "null"},
+            "target": {"type": "string"},
+            "investors": {"type": "string"},
+            "amount": {"type": "string"},
+            "round": {"type": "string"},
+            "sector": {"type": "string", "enum": list(SECTORS.values())},
+            "business_summary": {"type": "string"},
+            "article_date": _nullable("string"),
+            "article_source": _nullable("string"),
+            "notes": {"type": "string"},
+        }
+    return {"type": "json_schema", "json_schema": {"name": f"{kind}_{fmt}", "strict": True, "schema": _strict_object(props)}}
+
+
+def response_format(kind: str) -> Optional[dict]:
+    """호출에 넘길 response_format (LLM_STRUCTURED_OUTPUT=off면 None → 호출 쪽 기본값)."""
+    if not STRUCTURED:
+        return None
+    return json_schema(kind)
+
+
+# ------------------------
+# 로컬 복구 + 정규화
+# ------------------------
+
+_FENCE_RE = re.compile(r"^\s*```[a-zA-Z]*\s*|\s*```\s*$")
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+_PY_LITERALS = {"True": "true", "False": "false", "None": "null"}
+_PY_LITERAL_RE = re.compile(r'(?<=[:\[,\s])(True|False|None)(?=\s*[,}\]])')
+
+_stats = {"parsed": 0, "repaired": 0, "normalized_fields": 0, "retries": 0, "failed": 0}
+
+
+def repair_json(text: str) -> str:
+    """흔한 형식 오류를 고친 JSON 문자열 (고칠 게 없으면 그대로)."""
+    text = (text or "").strip()
+    text = _FENCE_RE.sub("", text).strip()
+    # 앞뒤 설명 문장 제거: 첫 { 부터 마지막 } 까지
+    start, end = text.find("{"), text.rfind("}")
+    if start != -1 and end > start:
+        text = text[start:end + 1]
+    text = text.replace("\u201c", '"').replace("\u201d", '"')
+    text = _TRAILING_COMMA_RE.sub(r"\1", text)
+    text = _PY_LITERAL_RE.sub(lambda m: _PY_LITERALS[m.group(1)], text)
+    return text
+
+
+def loads(text: str) -> dict:
+    try:
+        data = json.loads(text)
+    except (TypeError, ValueError):
+        try:
+            data = json.loads(repair_json(text))
+        except ValueError as e:
+            raise WireFormatError(f"JSON 파싱 실패: {e}")
+        with _lock:
+            _stats["repaired"] += 1
+    if not isinstance(data, dict):
+        raise WireFormatError("JSON 객체가 아님")
+    return data
+
+
+_NULL_TEXTS = {"", "null", "none", "n/a", "없음", "해당 없음"}
+_SECTOR_LOOKUP = {**{k.lower(): k for k in SECTORS}, **{v.lower(): k for k, v in SECTORS.items()}}
+_FUND_TYPE_LOOKUP = {**{k.lower(): k for k in FUND_TYPES}, **{v.lower(): k for k, v in FUND_TYPES.items()}}
+
+
+def _norm_flag(value):
+    if isinstance(value, str):
+        v = value.strip().lower()
+        if v in ("true", "1", "yes", "y"):
+            return True
+        if v in ("false", "0", "no", "n", ""):
+            return False
+    if value is None:
+        return False
+    return value
+
+
+def _norm_text(value):
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return str(value)
+    if isinstance(value, str) and value.strip().lower() in _NULL_TEXTS:
+        return None
+    return value.strip() if isinstance(value, str) else value
+
+
+def _norm_list(value):
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [v.strip() for v in value.split(",") if v.strip()]
+    if isinstance(value, list):
+        return [str(v).strip() for v in value if v is not None and str(v).strip()]
+    return value
+
+
+def _norm_code(value: str, lookup: Dict[str, str]) -> str:
+    return lookup.get(value.strip().lower(), "ETC")
+
+
+def _normalize(data: dict, spec: Dict[str, str], issues: List[str]) -> dict:
+    """spec: 키 → flag / text / list / sector / sectors / fund_types. spec에 없는 키는 버린다."""
+    out = {}
+    for key, value in data.items():
+        kind = spec.get(key)
+        if kind is None:
+            issues.append(f"{key}: 모르는 키 버림")
+            continue
+        if kind == "flag":
+            new = _norm_flag(value)
+        elif kind == "text":
+            new = _norm_text(value)
+        elif kind == "list":
+            new = _norm_list(value)
+        elif kind == "sector":
+            new = _norm_text(value)
+            new = _norm_code(new, _SECTOR_LOOKUP) if isinstance(new, str) else new
+        else:
+            lookup = _SECTOR_LOOKUP if kind == "sectors" else _FUND_TYPE_LOOKUP
+            new = [_norm_code(v, lookup) for v in _norm_list(value)] if value is not None else []
+            new = list(dict.fromkeys(new))
+        if new != value:
+            issues.append(f"{key}: {value!r} → {new!r}")
+        out[key] = new
+    return out
+
+
+LP_SPEC = {"f": "flag", "lp": "list", "gp": "list", "fn": "text", "sz": "text",
+           "ft": "fund_types", "sec": "sectors", "st": "text", "sm": "text"}
+WOWTALE_SPEC = {"d": "flag", "t": "text", "inv": "list", "amt": "text", "rd": "text",
+                "sec": "sector", "biz": "text", "nt": "text", "dt": "text", "src": "text"}
+
+
+def normalize_lp(data: dict, issues: List[str]) -> dict:
+    if "is_fundraising" in data:
+        return dict(data, is_fundraising=_norm_flag(data["is_fundraising"]))
+    return _normalize(data, LP_SPEC, issues)
+
+
+def normalize_wowtale(data: dict, issues: List[str]) -> dict:
+    if "is_deal" in data:
+        return dict(data, is_deal=_norm_flag(data["is_deal"]))
+    return _normalize(data, WOWTALE_SPEC, issues)
+
+
+def decode(kind: str, text: str) -> dict:
+    """모델 응답 문자열 → 기존 키 dict (복구 → 정규화 → 엄격 검증/복원)."""
+    data = loads(text)
+    issues: List[str] = []
+    if kind == "lp_news":
+        out = expand_lp(normalize_lp(data, issues))
+    else:
+        out = expand_wowtale(normalize_wowtale(data, issues))
+    with _lock:
+        _stats["parsed"] += 1
+        _stats["normalized_fields"] += len(issues)
+    if issues:
+        print(f"[WARN] {kind} 응답 필드 정규화: {'; '.join(issues[:5])}")
+    return out
+
+
+def record_failure(kind: str, key: str, error: str, raw: str, path: str = FAILURES_PATH):
+    entry = {
+        "kind": kind,
+        "key": key,
+        "error": error,
+        "raw": raw,
+        "at": datetime.now().isoformat(timespec="seconds"),
+    }
+    with _lock:
+        _stats["failed"] += 1
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+
+def with_retry(kind: str, key: str, call: Callable[[], str], retries: Optional[int] = None) -> dict:
+    """
+    call()로 응답을 받아 decode. 복구/정규화로도 못 읽으면 retries번 다시 부르고,
+    끝내 실패하면 원문을 llm_failures.jsonl에 남기고 ExtractionFailed.
+    """
+    retries = PARSE_RETRIES if retries is None else retries
+    raw, error = "", ""
+    for attempt in range(retries + 1):
+        raw = call()
+        try:
+            return decode(kind, raw)
+        except WireFormatError as e:
+            error = str(e)
+            print(f"[WARN] {kind} 응답 해석 실패 ({attempt + 1}/{retries + 1}): {e}")
+            if attempt < retries:
+                with _lock:
+                    _stats["retries"] += 1
+    record_failure(kind, key, error, raw)
+    raise ExtractionFailed(error, raw=raw)
+
+
+# ------------------------
+# 출력 토큰 측정
+# ------------------------
+
+_lock = threading.Lock()
+_usage: Dict[str, dict] = {}
+
+
+def observe(kind: str, completion_tokens: int, fmt: Optional[str] = None):
+    key = f"{kind}:{fmt or FORMAT}"
+    with _lock:
+        u = _usage.setdefault(key, {"calls": 0, "completion_tokens": 0})
+        u["calls"] += 1
+        u["completion_tokens"] += int(completion_tokens or 0)
+
+
+def snapshot() -> dict:
+    with _lock:
+        usage = {
+            key: dict(u, avg_completion_tokens=round(u["completion_tokens"] / u["calls"], 1) if u["calls"] else 0.0)
+            for key, u in _usage.items()
+        }
+        return dict(usage, decode=dict(_stats), structured=STRUCTURED)
+
+
+tracing.register_section("wire_format", snapshot)
+
+
+def _count_tokens(text: str) -> (int, str):
+    try:
+        import tiktoken
+    except ImportError:
+        # 한국어 위주 JSON 기준 대략 2글자 = 1토큰
+        return (len(text) + 1) // 2, "estimate(chars/2)"
+    enc = tiktoken.get_encoding("o200k_base")
+    return len(enc.encode(text)), "tiktoken:o200k_base"
+
+
+# 같은 내용의 응답을 두 형식으로 (측정용 예시)
+SAMPLES = {
+    "lp_news": (
+        {
+            "is_fundraising": True,
+            "LP": ["한국벤처투자", "한국성장금융"],
+            "운용사": ["에이티넘인베스트먼트", "스틱인베스트먼트"],
+            "펀드명": "2025년 하반기 글로벌펀드",
+            "펀드규모": "약 7,214억 원",
+            "펀드유형": ["벤처", "블라인드"],
+            "투자섹터": ["ICT & Digitalization", "Biotech & Healthcare"],
+            "조성상태": "위탁운용사 선정",
+            "요약": "모태펀드가 2025년 하반기 글로벌펀드 출자사업에서 6개 GP를 선정했다. 모태펀드 768억 원을 출자해 자펀드 7,214억 원을 조성할 예정이다.",
+        },
+        {
+            "f": True,
+            "lp": ["한국벤처투자", "한국성장금융"],
+            "gp": ["에이티넘인베스트먼트", "스틱인베스트먼트"],
+            "fn": "2025년 하반기 글로벌펀드",
+            "sz": "약 7,214억 원",
+            "ft": ["VC", "BLD"],
+            "sec": ["ICT", "BIO"],
+            "st": "위탁운용사 선정",
+            "sm": "모태펀드가 2025년 하반기 글로벌펀드 출자사업에서 6개 GP를 선정했다. 모태펀드 768억 원을 출자해 자펀드 7,214억 원을 조성할 예정이다.",
+        },
+    ),
+    "lp_news(negative)": (
+        {"is_fundraising": False, "LP": [], "운용사": [], "펀드명": None, "펀드규모": None,
+         "펀드유형": [], "투자섹터": [], "조성상태": None, "요약": None},
+        {"f": False},
+    ),
+    "wowtale": (
+        {
+            "deal_id": None,
+            "is_deal": True,
+            "target": "예시회사",
+            "investors": "카카오벤처스, 알토스벤처스",
+            "amount": "50억 원",
+            "round": "Series A",
+            "sector": "Consumer Internet & Fintech",
+            "business_summary": "소상공인을 위한 클라우드 기반 결제·정산 SaaS를 제공",
+            "notes": "",
+        },
+        {
+            "d": True,
+            "t": "예시회사",
+            "inv": ["카카오벤처스", "알토스벤처스"],
+            "amt": "50억 원",
+            "rd": "A",
+            "sec": "CIF",
+            "biz": "소상공인을 위한 클라우드 기반 결제·정산 SaaS를 제공",
+        },
+    ),
+    "wowtale(negative)": (
+        {"deal_id": None, "is_deal": False, "target": "", "investors": "", "amount": "미공개",
+         "round": "미공개", "sector": "ETC", "business_summary": "", "notes": ""},
+        {"d": False},
+    ),
+}
+
+
+def measure():
+    """예시 응답을 verbose / compact로 토큰화해서 비교 (compact는 복원 결과도 확인)."""
+    print(f"{'sample':<20} {'verbose':>8} {'compact':>8} {'saved':>6}")
+    method = ""
+    for name, (verbose, compact) in SAMPLES.items():
+        kind = name.split("(")[0]
+        expanded = expand_lp(compact) if kind == "lp_news" else expand_wowtale(compact)
+        flag = "is_fundraising" if kind == "lp_news" else "is_deal"
+        assert expanded[flag] == verbose[flag]
+        v, method = _count_tokens(json.dumps(verbose, ensure_ascii=False))
+        c, _ = _count_tokens(json.dumps(compact, ensure_ascii=False, separators=(",", ":")))
+        print(f"{name:<20} {v:>8} {c:>8} {1 - c / v:>6.0%}")
+    print(f"\n(토큰 수: {method})")
+    usage = snapshot()
+    if usage:
+        print(f"이번 프로세스 실측: {usage}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="LLM 압축 출력 스키마 도구")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    sub.add_parser("measure", help="예시 응답의 verbose / compact 출력 토큰 비교")
+    args = parser.parse_args()
+
+    measure()
@@ -1,16 +1,46 @@
 # wowtale_gpt_auto.py
-import os
 import csv
 import json
-import requests
-from bs4 import BeautifulSoup
-from openai import OpenAI
-
-# OpenAI 클라이언트 (환경변수에 OPENAI_API_KEY 필요)
-client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
-
-LATEST_CSV = "wowtale_latest.csv"
+import time
+from datetime import datetime
+
+import amount_normalizer
+import article_extractor
+import article_metadata
+import csv_partitions
+import deal_query
+import entity_index
+import extraction_pool
+import llm_stream
+import model_router
+import prompt_templates
+import search_index
+import stage_scheduler
+import wire_schema
+import wowtale_auto
+from pipeline_context import chat_completion, fetch, parse_html
+from summary_scheduler import BACKFILL_PER_RUN, SummaryBudget, order_backlog
+
+LATEST_CSV = wowtale_auto.LATEST_CSV
 SUMMARY_CSV = "wowtale_deals.csv"  # 엑셀 예시 형태의 요약 테이블
+SKIPPED_CSV = "wowtale_skipped.csv"  # 투자/인수 기사가 아니라고 판정된 URL (다시 요약하지 않도록)
+
+SUMMARY_FIELDNAMES = [
+    "Deal ID",
+    "투자 받는 회사 (Target / Startup)",
+    "투자사 (Investor)",
+    "투자 금액",
+    "라운드",
+    "사업 섹터",
+    "주요 사업부문",
+    "기사 날짜",
+    "기사 출처",
+    "비고",
+    "기사 링크",
+] + amount_normalizer.column_names("투자 금액")  # 투자 금액 숫자 컬럼 (amount_normalizer)
+
+# 밀린 기사가 많을 때 먼저 처리할 제목 키워드 (summary_scheduler)
+PRIORITY_KEYWORDS = ["투자 유치", "시리즈", "인수"]
 
 
 # ----------------------------------------------------
@@ -25,45 +55,56 @@ def load_latest_rows():
     return rows
 
 
+def load_backfill_rows():
+    """backfill_crawler.py가 쌓은 과거 기사 링크 ([{"url": ...}, ...], 파일 없으면 빈 리스트)."""
+    return csv_partitions.read_rows(wowtale_auto.BACKFILL_CSV, encoding="utf-8")
+
+
 # ----------------------------------------------------
-# 2) 이미 처리된 기사 URL 로드 (요약 CSV의 "기사 링크" 기준)
+# 2) 이미 처리된 기사 URL 로드 (요약 CSV의 "기사 링크" + 스킵 기록 기준)
 # ----------------------------------------------------
-def load_processed_urls():
-    if not os.path.exists(SUMMARY_CSV):
-        return set()
+def load_processed_urls(recent_months=csv_partitions.DEDUP_MONTHS):
     urls = set()
-    with open(SUMMARY_CSV, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        link_field = "기사 링크"
-        for row in reader:
-            url = row.get(link_field)
-            if url:
-                urls.add(url)
+    link_field = "기사 링크"
+    # 파티션 레이아웃이면 CSV_DEDUP_MONTHS 만큼의 최근 파티션만 읽음 (recent_months=None이면 전체)
+    for row in csv_partitions.iter_rows(SUMMARY_CSV, recent_months=recent_months, encoding="utf-8"):
+        url = row.get(link_field)
+        if url:
+            urls.add(url)
+    for row in csv_partitions.iter_rows(SKIPPED_CSV, recent_months=recent_months, encoding="utf-8"):
+        if row.get("url"):
+            urls.add(row["url"])
     return urls
 
 
+def append_skipped(url: str, reason: str = "not_deal"):
+    """다시 요약하지 않을 기사 기록 (reason: not_deal / parse_failed)."""
+    fieldnames = ["url", "checked_at", "reason"]
+    csv_partitions.ensure_columns(SKIPPED_CSV, fieldnames, encoding="utf-8")
+    csv_partitions.append_rows(
+        SKIPPED_CSV,
+        [{"url": url, "checked_at": datetime.now().isoformat(timespec="seconds"), "reason": reason}],
+        fieldnames,
+        encoding="utf-8",
+    )
+
+
 # ----------------------------------------------------
 # 3) 이미 존재하는 요약 개수 (Deal ID 시작 번호 계산용)
 # ----------------------------------------------------
 def load_existing_count():
-    if not os.path.exists(SUMMARY_CSV):
-        return 0
-    with open(SUMMARY_CSV, newline="", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        return sum(1 for _ in reader)
+    # 파티션 레이아웃이면 manifest의 행 수 합계만 읽음
+    return csv_partitions.row_count(SUMMARY_CSV, encoding="utf-8")
 
 
 # ----------------------------------------------------
 # 4) 기사 본문 크롤링
 # ----------------------------------------------------
 def fetch_article_text(url: str) -> str:
-    """주어진 기사 URL에서 본문 텍스트를 최대한 많이 가져오는 함수.
+    return fetch_article(url)[0]
 
-    - 와우테일 워드프레스 구조를 고려해서 여러 CSS 셀렉터를 시도한 뒤,
-      가장 텍스트가 긴 노드를 본문으로 간주한다.
-    - 그래도 안 잡히면 main/body 전체 텍스트를 fallback으로 사용한다.
-    - 토큰 폭발을 막기 위해 8,000자에서 잘라낸다.
-    """
+
+def download_article(url: str):
     headers = {
         "User-Agent": (
             "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
@@ -72,37 +113,49 @@ def fetch_article_text(url: str) -> str:
         )
     }
 
-    res = requests.get(url, headers=headers, timeout=10)
+    res = fetch(url, headers=headers, timeout=10)
     res.raise_for_status()
-    soup = BeautifulSoup(res.text, "html.parser")
-
-    # 와우테일 본문에 자주 쓰일 만한 후보 셀렉터들을 순서대로 시도
-    candidates = [
-        "article .tdb-block-inner",      # Newspaper/tdb 계열 본문 래퍼
-        "article .td-post-content",      # 구형/다른 스킨에서의 본문
-        "article .entry-content",        # 워드프레스 기본
-        "article",                       # 그래도 안 잡히면 article 전체
-        ".td-post-content",              # article 태그가 없을 때
-        ".entry-content",                # fallback 1
-    ]
-
-    best_node = None
-    best_selector = None
-    best_len = 0
-
-    # 각 셀렉터에서 나온 모든 노드를 검사하여, 텍스트 길이가 가장 긴 노드를 선택
-    for sel in candidates:
-        nodes = soup.select(sel)
-        for idx, node in enumerate(nodes):
-            text_candidate = node.get_text("\n", strip=True)
-            l = len(text_candidate)
-            if l > best_len:
-                best_len = l
-                best_node = node
-                best_selector = f"{sel}[{idx}]"
+    return res
+
+
+def fetch_article(url: str, prefetcher=None):
+    """주어진 기사 URL에서 (본문 텍스트, 메타데이터)를 가져오는 함수.
+
+    prefetcher(extraction_pool.ArticlePrefetcher)가 있으면 미리 받아 워커 프로세스에서 파싱해 둔 결과를 쓴다.
+    """
+    if prefetcher is not None:
+        record = prefetcher.get(url)
+    else:
+        record = parse_article(download_article(url).text, url)
+    text = record["body"]
+
+    # 디버그용: 길이 + 사용한 셀렉터 + 앞부분 200자 출력
+    preview = text[:200].replace("\n", " ")
+    print(f"[DEBUG] Fetched article from {url} selector={record['selector']} length={len(text)}")
+    print(f"[DEBUG] Preview: {preview}")
+
+    return text, record["meta"]
+
+
+def parse_article(html, url: str) -> dict:
+    """HTML → {"title", "body", "meta", "selector"} (extraction_pool 워커에서도 그대로 호출).
+
+    - 와우테일 워드프레스 구조를 고려해서 여러 CSS 셀렉터를 시도한 뒤,
+      가장 텍스트가 긴 노드를 본문으로 간주한다. 찾은 셀렉터는 도메인별로 기억해 두고
+      다음 기사부터 바로 쓴다 (article_extractor).
+    - 그래도 안 잡히면 main/body 전체 텍스트를 fallback으로 사용한다.
+    - 토큰 폭발을 막기 위해 8,000자에서 잘라낸다.
+    - 제목/작성일/출처는 메타 태그·JSON-LD·URL에서 결정적으로 읽는다 (article_metadata).
+    """
+    soup = parse_html(html, url)
+    meta = article_metadata.extract_metadata(soup, url)
+
+    # 도메인별로 학습한 본문 셀렉터를 먼저 쓰고, 없거나 의심스러우면 후보 셀렉터 전체 탐색
+    # (후보 중 텍스트가 가장 긴 노드, 규칙은 article_extractor.SITE_RULES)
+    text, best_selector = article_extractor.extract_main_text(soup, url)
 
     # 그래도 못 찾으면 main/body 전체 텍스트 사용
-    if best_node is None:
+    if text is None:
         fallback = soup.select_one("main") or soup.body
         if fallback:
             text = fallback.get_text("\n", strip=True)
@@ -110,43 +163,22 @@ def fetch_article_text(url: str) -> str:
         else:
             text = soup.get_text("\n", strip=True)
             best_selector = "full document (soup.get_text)"
-    else:
-        text = best_node.get_text("\n", strip=True)
 
     # 토큰 폭발 방지용으로 적당히 자르기
-    text = text[:8000]
-
-    # 디버그용: 길이 + 사용한 셀렉터 + 앞부분 200자 출력
-    preview = text[:200].replace("\n", " ")
-    print(f"[DEBUG] Fetched article from {url} selector={best_selector} length={len(text)}")
-    print(f"[DEBUG] Preview: {preview}")
-
-    return text
+    return {"title": meta["title"], "body": text[:8000], "meta": meta, "selector": best_selector}
 
 
 # ----------------------------------------------------
 # 5) GPT로 요약 & 투자 정보 추출
-#   - 출력: JSON 문자열
+#   - 출력: 기존 키(is_deal, target, investors ...) dict
 # ----------------------------------------------------
-def summarize_with_gpt(row):
-    url = row["url"]
-    title = row.get("title", "")
-    article_text = fetch_article_text(url)
-
-    prompt = f"""
-당신은 벤처캐피털 리서치 애널리스트입니다.
-아래는 스타트업/기업의 투자·펀딩·인수(M&A) 관련 기사입니다.
-이 기사에서 핵심이 되는 투자/인수 "한 건"에 대한 정보를 추출해 주세요.
-
-※ 만약 기사에 투자·펀딩·인수(M&A) 관련 내용이 전혀 없다면,
-어떤 정보도 임의로 추정하지 말고, is_deal 값을 false로 설정한 JSON 한 줄만 출력하세요.
-
-[출력 형식]
-반드시 아래 필드를 포함하는 JSON 한 줄만 출력하세요. 그 외 설명, 텍스트는 절대 출력하지 마세요.
+# 기존(verbose) 출력 형식. LLM_WIRE_FORMAT=compact(기본)이면 wire_schema.wowtale_compact_fields를 쓴다.
+VERBOSE_OUTPUT_SPEC = """반드시 아래 필드를 포함하는 JSON 한 줄만 출력하세요. 그 외 설명, 텍스트는 절대 출력하지 마세요.
+is_deal을 반드시 첫 필드로 출력하세요.
 
 필드:
-- deal_id: 항상 null로 두세요 (파이썬에서 자동으로 채웁니다)
 - is_deal: 이 기사가 실제 투자/인수(M&A) 딜을 다루는 기사이면 true, 아니면 false
+- deal_id: 항상 null로 두세요 (파이썬에서 자동으로 채웁니다)
 - target: 투자 받는 회사 또는 인수 대상 회사명 (문자열, is_deal=false인 경우 빈 문자열)
 - investors: 참여 투자사를 쉼표(,)로 구분한 하나의 문자열 (예: "카카오벤처스, 알토스벤처스", is_deal=false인 경우 빈 문자열)
 - amount: 기사에 나온 투자 금액을 통화/단위를 포함해 그대로 적기 (예: "50억 원", "10M USD", "3 billion yen", 없으면 "미공개")
@@ -163,79 +195,148 @@ def summarize_with_gpt(row):
 - article_source: 기사 출처(매체명) (없으면 "확인 불가")
 - notes: 특이사항이 있을 때만 한 줄로 간단히 (없으면 빈 문자열)
 
+article_date, article_source는 사용자 메시지의 [추가 요청]에 있을 때만 채우고, 아니면 null로 두세요.
+
 JSON 예시는 아래와 같습니다.
 
-{{
-  "deal_id": null,
+{
   "is_deal": true,
+  "deal_id": null,
   "target": "예시회사",
   "investors": "카카오벤처스, 알토스벤처스",
   "amount": "50억 원",
   "round": "Series A",
   "sector": "ICT & Digitalization",
   "business_summary": "소상공인을 위한 클라우드 기반 결제·정산 SaaS를 제공",
-  "article_date": "2025.12.02",
-  "article_source": "와우테일",
+  "article_date": null,
+  "article_source": null,
   "notes": "정부 펀드 참여"
-}}
+}
+"""
+
+
+# 프롬프트 캐시 배치 (prompt_templates): 지시문 + 출력 형식은 system에 고정, 기사 제목/본문은 user 맨 뒤.
+# 작성일/출처를 물을지는 user 메시지의 [추가 요청] 줄로만 정하므로 정적 부분(+ JSON schema)은 형식별로 한 종류.
+# 다만 지금 정적 부분은 약 600토큰이라 OpenAI 자동 캐시 최소 길이(1024토큰)에 못 미쳐 아직 캐시되지 않는다
+# (python prompt_templates.py show). 지시문/예시를 늘려 1024를 넘기면 그때부터 적중. 문구를 고치면 PROMPT_VERSION을 올린다.
+PROMPT_VERSION = "3"
+INSTRUCTIONS = """당신은 벤처캐피털 리서치 애널리스트입니다.
+사용자가 스타트업/기업의 투자·펀딩·인수(M&A) 관련 기사를 줍니다.
+이 기사에서 핵심이 되는 투자/인수 "한 건"에 대한 정보를 추출해 주세요.
 
-[기사 정보]
+※ 만약 기사에 투자·펀딩·인수(M&A) 관련 내용이 전혀 없다면,
+어떤 정보도 임의로 추정하지 말고, 딜 여부 필드만 false로 설정한 JSON 한 줄만 출력하세요.
+
+[출력 형식]
+"""
+ARTICLE_TEMPLATE = """{meta_request}[기사 정보]
 기사 제목: {title}
 기사 본문:
-{article_text}
-"""
+{article_text}"""
+
+_prompts = {}
 
-    resp = client.chat.completions.create(
-        model="gpt-4.1-mini",
-        messages=[
-            {"role": "system", "content": "당신은 벤처캐피털 애널리스트입니다."},
-            {"role": "user", "content": prompt},
-        ],
+
+def extraction_prompt() -> prompt_templates.PromptTemplate:
+    """
+    출력 형식(LLM_WIRE_FORMAT)별로 한 번만 만드는 템플릿. 작성일/출처 여부와 무관하게 같은 prefix.
+    정적 prefix가 아직 1024토큰 미만이라 provider 캐시는 적중하지 않는다 (위 PROMPT_VERSION 주석 참고).
+    """
+    if wire_schema.FORMAT not in _prompts:
+        if wire_schema.FORMAT == "compact":
+            output_spec = "반드시 아래 필드의 JSON 한 줄만 출력하세요. 그 외 설명, 텍스트는 절대 출력하지 마세요.\n" + (
+                wire_schema.wowtale_compact_fields()
+            )
+        else:
+            output_spec = VERBOSE_OUTPUT_SPEC
+        _prompts[wire_schema.FORMAT] = prompt_templates.PromptTemplate(
+            "wowtale",
+            f"{PROMPT_VERSION}-{wire_schema.FORMAT}",
+            system=INSTRUCTIONS + output_spec,
+            user=ARTICLE_TEMPLATE,
+        )
+    return _prompts[wire_schema.FORMAT]
+
+
+def meta_request(ask_date: bool, ask_source: bool) -> str:
+    """HTML에서 못 읽은 작성일/출처만 채워 달라는 user 메시지 앞줄 (둘 다 읽었으면 빈 문자열)."""
+    compact = wire_schema.FORMAT == "compact"
+    fields = []
+    if ask_date:
+        fields.append("기사 작성일(dt)" if compact else "기사 작성일(article_date)")
+    if ask_source:
+        fields.append("기사 출처(src)" if compact else "기사 출처(article_source)")
+    return f"[추가 요청] {', '.join(fields)}도 채워 주세요.\n\n" if fields else ""
+
+
+def summarize_with_gpt(row, budget=None, prefetcher=None):
+    url = row["url"]
+    article_text, meta = fetch_article(url, prefetcher=prefetcher)
+    title = row.get("title") or meta["title"]
+    row.setdefault("title", title)
+
+    # LLM_ROUTING=tiered: 싼 모델이 딜 기사가 확실히 아니라고 하면 전체 추출 생략
+    negative = model_router.screen("wowtale", title, article_text, budget=budget)
+    if negative is not None:
+        return negative
+
+    # HTML에서 확실히 읽은 작성일/출처는 base_row에 넣고 GPT에는 묻지 않는다 (해당 필드는 null → 출력 토큰 절약)
+    ask_date = not article_metadata.has_reliable_date(meta)
+    ask_source = not article_metadata.has_reliable_source(meta)
+    if not ask_date:
+        row["date"] = article_metadata.dotted(meta["published"])
+    if not ask_source:
+        row["source"] = meta["source"]
+
+    # 본문은 main()에서 딜 기사로 확정된 뒤에만 전문 검색 색인(search_index)에 넘긴다
+    row["body"] = article_text
+
+    prompt = extraction_prompt()
+    request = dict(
+        model=model_router.EXTRACTION_MODEL,
+        messages=prompt.render(
+            meta_request=meta_request(ask_date, ask_source), title=title, article_text=article_text
+        ),
         temperature=0,
+        # LLM_STRUCTURED_OUTPUT: JSON schema(strict)로 출력 형식 강제
+        response_format=wire_schema.response_format("wowtale") or {"type": "json_object"},
     )
+    flag = wire_schema.flag_key("wowtale")
+
+    def call() -> str:
+        if llm_stream.ENABLED:
+            # LLM_STREAM: 첫 필드(is_deal / compact의 d)가 false로 나오면 나머지 생성은 취소
+            content, aborted = llm_stream.stream_completion(flag, budget=budget, prompt=prompt, **request)
+            return json.dumps({flag: False}) if aborted else content
+        # OpenAI 클라이언트 (환경변수에 OPENAI_API_KEY 필요, 처음 호출 때 생성)
+        resp = chat_completion(budget=budget, prompt=prompt, **request)
+        wire_schema.observe("wowtale", getattr(resp.usage, "completion_tokens", 0) if resp.usage else 0)
+        return resp.choices[0].message.content
 
-    content = resp.choices[0].message.content.strip()
-    return content  # JSON 문자열이라고 가정
+    # 코드펜스/trailing comma 등은 로컬에서 고치고, 그래도 못 읽으면 재호출 → 실패 기록 (wire_schema)
+    return wire_schema.with_retry("wowtale", url, call)
 
 
 # ----------------------------------------------------
 # 6) 요약 CSV 헤더 보장 (엑셀 예시 형식)
 # ----------------------------------------------------
 def ensure_summary_header():
-    if os.path.exists(SUMMARY_CSV):
-        return
-    with open(SUMMARY_CSV, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=[
-                "Deal ID",
-                "투자 받는 회사 (Target / Startup)",
-                "투자사 (Investor)",
-                "투자 금액",
-                "라운드",
-                "사업 섹터",
-                "주요 사업부문",
-                "기사 날짜",
-                "기사 출처",
-                "비고",
-                "기사 링크",
-            ],
-        )
-        writer.writeheader()
+    csv_partitions.ensure_header(SUMMARY_CSV, SUMMARY_FIELDNAMES, encoding="utf-8")
+    csv_partitions.ensure_columns(SUMMARY_CSV, SUMMARY_FIELDNAMES, encoding="utf-8")
 
 
 # ----------------------------------------------------
 # 7) 요약 CSV에 한 줄 추가
 # ----------------------------------------------------
-def append_summary(json_str: str, deal_id: int, base_row: dict):
-    data = json.loads(json_str)
+def append_summary(data: dict, deal_id: int, base_row: dict) -> dict:
+    """data: summarize_with_gpt 결과 (기존 키로 복원/검증된 dict)."""
 
-    # GPT가 준 값 우선 사용, 없으면 latest CSV 값으로 보완
+    # HTML 메타데이터에서 읽은 값(base_row의 date/source) 우선, 없으면 GPT가 준 값
     gpt_article_date = data.get("article_date") or ""
     gpt_article_source = data.get("article_source") or ""
 
-    article_date = gpt_article_date or base_row.get("date", "")
-    article_source = gpt_article_source or base_row.get("source", "와우테일")
+    article_date = base_row.get("date") or gpt_article_date
+    article_source = base_row.get("source") or gpt_article_source or "와우테일"
     article_url = base_row.get("url", "")
 
     row_dict = {
@@ -251,60 +352,122 @@ def append_summary(json_str: str, deal_id: int, base_row: dict):
         "비고": data.get("notes", ""),
         "기사 링크": article_url,
     }
+    row_dict.update(amount_normalizer.columns(row_dict["투자 금액"], "투자 금액"))
 
-    with open(SUMMARY_CSV, "a", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(
-            f,
-            fieldnames=[
-                "Deal ID",
-                "투자 받는 회사 (Target / Startup)",
-                "투자사 (Investor)",
-                "투자 금액",
-                "라운드",
-                "사업 섹터",
-                "주요 사업부문",
-                "기사 날짜",
-                "기사 출처",
-                "비고",
-                "기사 링크",
-            ],
-        )
-        writer.writerow(row_dict)
+    csv_partitions.append_rows(SUMMARY_CSV, [row_dict], SUMMARY_FIELDNAMES, encoding="utf-8")
+    return row_dict
 
 
 # ----------------------------------------------------
 # 8) 메인 로직: 새 기사만 골라서 GPT 돌리고 요약 CSV에 append
 # ----------------------------------------------------
 
-def main():
+def index_summaries(rows: list):
+    """
+    이번 실행에서 요약 CSV에 추가한 행을 한 번에 색인 (행마다 하면 인덱스 파일을 매번 다시 씀).
+    - 투자사 이름 → Deal ID 역인덱스 (entity_index.json)
+    - 주요 사업부문 / 본문 전문 검색 색인 (search_index.db)
+    - 섹터/라운드/날짜/금액/투자사 조회 인덱스 (deal_index.db)
+    """
+    if not rows:
+        return
+    entity_index.index_rows("wowtale", rows, {"investor": "투자사 (Investor)"})
+    search_index.index_rows("wowtale", rows)
+    deal_query.index_rows("wowtale", rows)
+
+
+def main(latest_rows=None, backfill_limit=None, backlog=None):
+    """
+    latest_rows: run_pipeline.py / watch_pipeline.py에서 수집 결과를 바로 넘길 때 사용 ([{"url": ...}, ...]).
+                 없으면 wowtale_latest.csv를 읽는다.
+    backfill_limit: backfill 큐에서 이번에 가져올 최대 기사 수
+                    (기본: latest_rows를 넘기면 0, 아니면 summary_scheduler.BACKFILL_PER_RUN)
+    backlog: 지난 실행에서 미룬 기사도 이어서 처리할지 (기본: latest_rows를 안 넘긴 경우만)
+    시간/토큰 예산(summary_scheduler)을 넘기기 전에 멈추고, 남은 기사는 순서대로 다음 실행으로 미룬다.
+    반환값: 이번 실행에서 요약 CSV에 추가한 행 리스트
+    """
     ensure_summary_header()
 
-    latest_rows = load_latest_rows()
+    explicit = latest_rows is not None
+    if backfill_limit is None:
+        backfill_limit = 0 if explicit else BACKFILL_PER_RUN
+    if backlog is None:
+        backlog = not explicit
+    if latest_rows is None:
+        latest_rows = load_latest_rows()
     processed_urls = load_processed_urls()
 
     new_rows = [r for r in latest_rows if r.get("url") and r["url"] not in processed_urls]
 
+    # backfill 링크는 오래된 기사라 최근 파티션이 아니라 전체 처리 기록과 비교, 한 번에 backfill_limit건까지만
+    backfill_rows = load_backfill_rows() if backfill_limit > 0 else []
+    if backfill_rows:
+        all_processed = load_processed_urls(recent_months=None)
+        pending = [r for r in backfill_rows if r.get("url") and r["url"] not in all_processed]
+        print(f"[INFO] backfill 링크 {len(backfill_rows)}건 중 미처리 {len(pending)}건 → 이번에 {min(len(pending), backfill_limit)}건")
+        processed_urls |= all_processed
+        new_rows += pending[:backfill_limit]
+
+    new_rows = order_backlog(
+        "wowtale",
+        new_rows,
+        lambda r: r.get("url") or "",
+        keywords=PRIORITY_KEYWORDS,
+        processed=processed_urls,
+        include_saved=backlog,
+    )
+
     print(f"[INFO] 새로 처리할 기사 {len(new_rows)}개")
 
     existing_count = load_existing_count()
     next_id = existing_count + 1
-
-    for row in new_rows:
+    added_rows = []
+    budget = SummaryBudget("wowtale")
+    deferred = []
+    # EXTRACT_WORKERS: 한 창(WINDOW건) 앞까지 본문 fetch + 파싱을 워커 프로세스에서 미리 진행
+    prefetcher = extraction_pool.prefetcher("wowtale", download_article)
+
+    for i, row in enumerate(new_rows):
+        # run_pipeline에서 단계 timeout이 나면 다음 기사로 넘어가지 않고 멈춤 (stage_scheduler)
+        reason = budget.stop_reason() or stage_scheduler.cancel_reason()
+        if reason:
+            deferred = new_rows[i:]
+            print(f"[INFO] {reason} → {len(deferred)}건은 다음 실행으로 미룸")
+            break
+
+        if prefetcher is not None and i % prefetcher.window == 0:
+            prefetcher.schedule(r["url"] for r in new_rows[i:i + 2 * prefetcher.window])
+
+        started = time.monotonic()
         try:
-            json_str = summarize_with_gpt(row)
-            data = json.loads(json_str)
+            data = summarize_with_gpt(row, budget=budget, prefetcher=prefetcher)
 
-            # 투자/인수 기사가 아닌 경우 스킵
+            # 투자/인수 기사가 아닌 경우 스킵 (다음 실행에서 다시 요약하지 않도록 기록)
             if data.get("is_deal") is False:
                 print(f"[SKIP] 투자/인수 기사 아님: {row.get('title', '')}")
-                continue
-
-            append_summary(json_str, deal_id=next_id, base_row=row)
-            print(f"[OK] {row.get('title', '')} 요약 완료 (Deal ID={next_id})")
-            next_id += 1
+                append_skipped(row["url"])
+            else:
+                search_index.remember_body(row["url"], row.get("body", ""), title=row.get("title", ""))
+                added_rows.append(append_summary(data, deal_id=next_id, base_row=row))
+                print(f"[OK] {row.get('title', '')} 요약 완료 (Deal ID={next_id})")
+                next_id += 1
+        except wire_schema.ExtractionFailed as e:
+            # 응답을 끝내 못 읽은 기사는 기록해 두고 다음 실행에서 다시 돈 쓰지 않음 (원문은 llm_failures.jsonl)
+            print(f"[ERROR] {row.get('url')} 응답 해석 실패: {e}")
+            append_skipped(row["url"], reason="parse_failed")
         except Exception as e:
             print(f"[ERROR] {row.get('url')} 처리 실패: {e}")
-
+        # 스킵/실패한 기사 본문까지 남은 backlog와 함께 들고 있지 않도록 바로 버림
+        row.pop("body", None)
+        budget.item_done(time.monotonic() - started)
+
+    if prefetcher is not None:
+        prefetcher.close()
+    index_summaries(added_rows)
+    budget.finish(deferred, keep_saved=not backlog)
+    llm_stream.summary()
+    extraction_pool.summary()
+    return added_rows
 
 
 if __name__ == "__main__":
@@ -1,35 +1,55 @@
-import requests
-from bs4 import BeautifulSoup
 from urllib.parse import urljoin
 import csv
 import os
 from datetime import datetime
 
+from pipeline_context import fetch, parse_html
+
 BASE_URL = "https://wowtale.net/latest-news/"
+LATEST_CSV = "wowtale_latest.csv"
+BACKFILL_CSV = "wowtale_backfill_links.csv"  # backfill_crawler.py가 쌓는 과거 기사 링크
+
+def list_page_url(page: int) -> str:
+    return BASE_URL if page == 1 else f"{BASE_URL}?_paged={page}"
+
+
+def parse_list_page(soup, page_url):
+    """
+    목록 페이지 1장 → ('투자 유치' 기사 URL 리스트, 페이지의 전체 기사 링크 수).
+    전체 기사 링크(wowtale.net/YYYY/...)가 0이면 목록 끝으로 본다 (backfill_crawler.py).
+    """
+    urls = []
+    article_links = 0
+    for a in soup.find_all("a", href=True):
+        full_url = urljoin(page_url, a["href"])
+        if "wowtale.net/20" in full_url:
+            article_links += 1
+        text = (a.get_text() or "").strip()
+        if "유치" in text: 
+            urls.append(full_url)
+    return urls, article_links
+
 
 def get_investment_article_urls(max_pages=4):
     urls = set()
 
     for page in range(1, max_pages + 1):
-        if page == 1:
-            url = BASE_URL
-        else:
-            url = f"{BASE_URL}?_paged={page}"
+        url = list_page_url(page)
 
         print(f"[INFO] 크롤링 중 - page {page}: {url}")
 
-        res = requests.get(url, headers={"User-Agent": "Mozilla/5.0"})
+        res = fetch(url, headers={"User-Agent": "Mozilla/5.0"})
         if res.status_code == 404:
             print(f"[INFO] page {page} 에서 404 → 여기서 중단")
             break
+        if res.status_code >= 400:
+            # 429/503은 fetch가 이미 재시도함 → 그래도 실패면 이번 실행은 여기까지
+            print(f"[WARN] page {page} HTTP {res.status_code} → 여기서 중단")
+            break
 
-        soup = BeautifulSoup(res.text, "html.parser")
-
-        for a in soup.find_all("a", href=True):
-            text = (a.get_text() or "").strip()
-            if "유치" in text: 
-                full_url = urljoin(url, a["href"])
-                urls.add(full_url)
+        soup = parse_html(res.text, url)
+        page_urls, _ = parse_list_page(soup, url)
+        urls.update(page_urls)
 
     return sorted(list(urls))
 
@@ -41,11 +61,15 @@ def save_to_csv(urls, filename):
         for i, u in enumerate(urls, start=1):
             writer.writerow([i, u])
 
-if __name__ == "__main__":
-    # 기본: 4페이지까지, 파일 이름은 고정으로 하나 (매번 덮어쓰기)
-    max_pages = 4
-    project_dir = os.path.dirname(os.path.abspath(__file__))
-    csv_path = os.path.join(project_dir, "wowtale_latest.csv")
+
+def run(max_pages: int = 4, csv_path: str = None):
+    """
+    수집 단계 (run_pipeline.py에서도 호출).
+    수집한 URL 리스트를 반환하고, 단독 실행 때와 같이 wowtale_latest.csv도 덮어쓴다.
+    """
+    if csv_path is None:
+        project_dir = os.path.dirname(os.path.abspath(__file__))
+        csv_path = os.path.join(project_dir, LATEST_CSV)
 
     print("=== Wowtale '투자 유치' 자동 수집기 (no prompt) ===")
     urls = get_investment_article_urls(max_pages=max_pages)
@@ -55,5 +79,9 @@ if __name__ == "__main__":
     else:
         save_to_csv(urls, csv_path)
         print(f"[INFO] 총 {len(urls)}개 URL 저장 완료 → {csv_path}")
+    return urls
 
 
+if __name__ == "__main__":
+    # 기본: 4페이지까지, 파일 이름은 고정으로 하나 (매번 덮어쓰기)
+    run(max_pages=4)